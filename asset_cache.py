@@ -0,0 +1,63 @@
+# asset_cache.py
+# Ölçeklenmiş görseller diskte ham piksel olarak saklanır; anahtar dosyanın içeriği (hash),
+# hedef çözünürlük ve ölçekleme yöntemidir. Sonraki açılışlarda PNG çözme ve smoothscale atlanır.
+import hashlib
+import os
+
+import pygame
+
+CACHE_VERSION = 1
+
+
+def _file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+class AssetCache:
+    def __init__(self, cache_dir=".asset_cache"):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_path(self, path, size, smooth, alpha):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        mode = ("smooth" if smooth else "fast") + ("-rgba" if alpha else "-rgb")
+        name = f"{stem}-{size[0]}x{size[1]}-{mode}-{_file_hash(path)}-v{CACHE_VERSION}.raw"
+        return os.path.join(self.cache_dir, name)
+
+    def load_scaled(self, path, size, smooth=True, alpha=False):
+        # Görüntü modu açık olmalı: dönen yüzey convert()/convert_alpha() edilmiştir
+        fmt = "RGBA" if alpha else "RGB"
+        cache_path = None
+        if self.cache_dir:
+            cache_path = self._cache_path(path, size, smooth, alpha)
+            try:
+                with open(cache_path, "rb") as f:
+                    data = f.read()
+                surf = pygame.image.frombytes(data, size, fmt)
+                self.hits += 1
+                return surf.convert_alpha() if alpha else surf.convert()
+            except (OSError, ValueError):
+                pass
+
+        self.misses += 1
+        image = pygame.image.load(path)
+        image = image.convert_alpha() if alpha else image.convert()
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        surf = scale(image, size)
+        if cache_path is not None:
+            self._store(cache_path, pygame.image.tobytes(surf, fmt))
+        return surf
+
+    def _store(self, cache_path, data):
+        # Yarım yazılmış dosya okunmasın diye geçici dosyaya yazıp yer değiştirilir;
+        # salt okunur diskte önbellek sessizce devre dışı kalır.
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
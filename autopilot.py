@@ -0,0 +1,211 @@
+# autopilot.py
+# Oyunu kendi başına oynayan ileriye bakan planlayıcı (uzun dayanıklılık testleri ve vitrin modu).
+# Her karede oyunun anlık görüntüsü gölge bir GameState'e yüklenir ve zıpla/bekle dizileri bu gölge
+# üzerinde ileri simüle edilir (rollout). Zaman bütçesi bitene kadar önceki karenin en iyi dizisi
+# ile onun rastgele değişkeleri denenir; en iyi dizinin ilk kararı, jestlerle aynı girdi yolundan
+# (tracker_pipeline oyuncu verisi biçiminde) oyuna verilir.
+import random
+import time
+
+from game_state import GameState, SimClock, PIPE_GAP
+from tracker_pipeline import EMPTY_HAND_DATA
+
+# Kare başına planlama süresi
+PLAN_BUDGET_MS = 2.0
+# Bir karar bu kadar adım sürer (zıplama yalnızca kararın ilk adımında); ufuk = karar sayısı x adım
+DECISION_TICKS = 4
+HORIZON_DECISIONS = 12
+# Bütçe ne olursa olsun denenen en az dizi: önceki en iyi, boşluk takibi, ilk kararda zıplama, hiç zıplamama
+MIN_ROLLOUTS = 4
+# Değişke üretirken her kararın tersine çevrilme olasılığı
+MUTATION_RATE = 0.15
+# Rollout değeri: önce hayatta kalınan adım, sonra skor, en son ufkun sonunda boşluğa uzaklık
+SCORE_WEIGHT = 1000
+THROUGHPUT_ALPHA = 0.1
+
+
+def _gap_center(game, behind=0):
+    # Kuşun önündeki (ya da en fazla behind px gerisindeki) ilk borunun boşluk ortası
+    bird_x = game.bird.x
+    for p in game.pipes:
+        if p.x + p.width >= bird_x - behind:
+            return p.gap_y + PIPE_GAP // 2
+    return game.WINDOW_HEIGHT // 2
+
+
+class Autopilot:
+    # budget_ms: kare başına planlama süresi; max_rollouts: kare başına en fazla rollout (verilirse ve
+    # budget_ms None ise planlama makine hızından bağımsız, tekrarlanabilir olur)
+    def __init__(self, game, budget_ms=PLAN_BUDGET_MS, max_rollouts=None, decision_ticks=DECISION_TICKS,
+                 horizon_decisions=HORIZON_DECISIONS, seed=0):
+        if budget_ms is None and max_rollouts is None:
+            raise ValueError("budget_ms ya da max_rollouts verilmeli")
+        self.game = game
+        self.budget_s = budget_ms / 1000 if budget_ms is not None else None
+        self.max_rollouts = max(MIN_ROLLOUTS, max_rollouts) if max_rollouts is not None else None
+        self.decision_ticks = decision_ticks
+        self.horizon = horizon_decisions
+        self.rng = random.Random(seed)
+        # Gölge oyun yalnızca rollout içindir: olay dinleyicisi yok, kendi saati var
+        self.shadow = GameState(game.bird_img, game.WINDOW_WIDTH, game.WINDOW_HEIGHT, clock=SimClock())
+        self._root = game.new_snapshot()
+        self._best = [False] * horizon_decisions
+        self._candidate = [False] * horizon_decisions
+        self._best_value = 0
+        # Bir kare 0, 1 ya da birkaç adım ilerletebilir. Her karar, başlangıç adımına ulaşan ya da onu
+        # geçen ilk karede bir kez verilir; rollout'ta da kararlar o karenin adımında uygulanır
+        # (kareler arası adım sayısı son karelerden tahmin edilir).
+        # _plan_tick: en iyi dizinin ilk kararının başlangıç adımı; _offset: ondan bu yana geçen adım;
+        # _issued_tick: verilmiş son kararın başlangıç adımı; _frame_ticks: kare başına adım.
+        self._plan_tick = None
+        self._offset = 0
+        self._issued_tick = None
+        self._last_tick = None
+        self._frame_ticks = 1
+        self._input = dict(EMPTY_HAND_DATA)
+
+        # Sayaçlar
+        self.rollouts = 0
+        self.plans = 0
+        self.plan_ms = 0.0
+        self.rollouts_per_s = 0.0
+        self.last_rollouts = 0
+
+    def _rollout(self, plan, follow=False):
+        # Gölgeyi kök görüntüye döndürür, diziyi oynatır ve değerini döner.
+        # follow: kararlar oynarken simulate.gap_follower kuralıyla verilir ve plan'a yazılır
+        shadow = self.shadow
+        shadow.restore(self._root)
+        bird = shadow.bird
+        start_score = shadow.score
+        ticks = 0
+        # İlk karar bu karede verilecekse zıplaması şimdi (geç de olsa) uygulanır; önceden verildiyse
+        # zıplaması kök görüntüdedir. Sonraki kararlar, başlangıçlarından sonraki ilk karenin adımında.
+        pending = self._issued_tick != self._plan_tick
+        frame = self._frame_ticks
+        end = len(plan) * self.decision_ticks - self._offset
+        for k in range(len(plan)):
+            start = k * self.decision_ticks - self._offset
+            at = -(-start // frame) * frame if start > 0 else 0
+            while ticks < at and ticks < end:
+                shadow.step()
+                if shadow.game_over:
+                    return ticks
+                ticks += 1
+            if follow:
+                plan[k] = bird.vel > 0 and bird.y > _gap_center(shadow, 50) + 20
+            if plan[k] and (k or pending):
+                bird.jump()
+        while ticks < end:
+            shadow.step()
+            if shadow.game_over:
+                return ticks
+            ticks += 1
+        distance = abs(bird.y - _gap_center(shadow))
+        return ticks + SCORE_WEIGHT * (shadow.score - start_score) - distance / shadow.WINDOW_HEIGHT
+
+    def _mutate(self, source, target):
+        rng = self.rng
+        for i in range(len(source)):
+            target[i] = (not source[i]) if rng.random() < MUTATION_RATE else source[i]
+
+    def plan(self):
+        # Bu karede zıplanmalı mı; oyun sürmüyorsa planlanmaz
+        game = self.game
+        if not game.game_started or game.game_over:
+            return False
+        start = time.perf_counter()
+        deadline = start + self.budget_s if self.budget_s is not None else None
+        game.save(self._root)
+
+        # Önceki en iyi dizi, başlamış kararların sonuncusuna kadar kaydırılır; yeni oyunda ya da uzun
+        # aradan sonra sıfırlanır
+        best = self._best
+        tick = game.tick_count
+        if self._last_tick is not None and tick > self._last_tick:
+            self._frame_ticks = min(tick - self._last_tick, self.decision_ticks)
+        self._last_tick = tick
+        horizon_ticks = self.horizon * self.decision_ticks
+        if self._plan_tick is None or tick < self._plan_tick or tick - self._plan_tick >= horizon_ticks:
+            for i in range(len(best)):
+                best[i] = False
+            self._plan_tick = tick
+            self._issued_tick = None
+        while tick - self._plan_tick >= self.decision_ticks:
+            best.pop(0)
+            best.append(False)
+            self._plan_tick += self.decision_ticks
+        self._offset = tick - self._plan_tick
+
+        best_value = self._rollout(best)
+        candidate = self._candidate
+        count = 1
+        # Boşluk takibi, ilk kararda zıplama ve hiç zıplamama her karede denenir; sonra bütçe bitene
+        # kadar en iyinin değişkeleri
+        while True:
+            if count < MIN_ROLLOUTS:
+                for i in range(len(candidate)):
+                    candidate[i] = False
+                candidate[0] = count == 2
+            else:
+                self._mutate(best, candidate)
+            value = self._rollout(candidate, follow=count == 1)
+            count += 1
+            if value > best_value:
+                best_value = value
+                best, candidate = candidate, best
+            if count >= MIN_ROLLOUTS and deadline is not None and time.perf_counter() >= deadline:
+                break
+            if count == self.max_rollouts:
+                break
+        self._best, self._candidate = best, candidate
+        self._best_value = best_value
+
+        elapsed = time.perf_counter() - start
+        self.rollouts += count
+        self.last_rollouts = count
+        self.plans += 1
+        self.plan_ms += THROUGHPUT_ALPHA * (elapsed * 1000 - self.plan_ms)
+        self.rollouts_per_s += THROUGHPUT_ALPHA * (count / elapsed - self.rollouts_per_s)
+        # İlk karar yalnızca bir kez, başlangıcına ulaşan ilk karede verilir
+        if self._issued_tick == self._plan_tick:
+            return False
+        self._issued_tick = self._plan_tick
+        return best[0]
+
+    def needs_shield(self):
+        # En iyi dizi bile ufuk içinde ölüyorsa kalkan istenir
+        return self.plans > 0 and self._best_value < self.horizon * self.decision_ticks
+
+    def player_input(self, view):
+        # Oyuncu verisi: başlat/yeniden başlat butonuna tıklama, zıplama için tutam, kalkan için yumruk.
+        # İmleç kuşun üstünde durur; zıplama hemen uygulanır (zaman damgası yok, geri sarma yok).
+        game = self.game
+        data = self._input
+        data["pinch_triggered"] = False
+        data["punch_detected"] = False
+        if not game.game_started or game.game_over:
+            self._plan_tick = None
+        if not game.game_started:
+            data["cursor_pos"] = view.start_button.center
+            data["pinch_triggered"] = True
+        elif game.game_over:
+            data["cursor_pos"] = view.restart_button.center
+            data["pinch_triggered"] = True
+        else:
+            bird = game.bird
+            data["cursor_pos"] = (view.offset[0] + int(bird.x), view.offset[1] + int(bird.y))
+            data["pinch_triggered"] = self.plan()
+            data["punch_detected"] = self.needs_shield()
+        data["pinch_strength"] = 1.0 if data["pinch_triggered"] else 0.0
+        return data
+
+    def stats(self):
+        return {
+            "rollouts": self.rollouts,
+            "plans": self.plans,
+            "last_rollouts": self.last_rollouts,
+            "plan_ms": round(self.plan_ms, 2),
+            "rollouts_per_s": int(self.rollouts_per_s),
+            "sim_ticks_per_s": int(self.rollouts_per_s * self.horizon * self.decision_ticks),
+        }
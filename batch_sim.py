@@ -0,0 +1,164 @@
+# batch_sim.py
+# Binlerce oyunu aynı anda ilerleten NumPy (struct-of-arrays) motoru.
+# Bot değerlendirmesi ve zorluk ayarı için; aynı tohumlarla GameState ile adım adım aynı sonucu verir.
+import math
+import random
+
+import numpy as np
+
+from game_state import (GRAVITY, JUMP_VELOCITY, PIPE_SPEED, PIPE_GAP, PIPE_WIDTH, PIPE_INTERVAL_MS,
+                        SHIELD_DURATION_MS, SHIELD_COOLDOWN_MS, SHIELD_CHARGES, BIRD_X, BOUNDARY_MARGIN,
+                        GROUND_HEIGHT, GAP_MIN_Y, GAP_BOTTOM_MARGIN, PIPE_SPAWN_OFFSET, PIPE_OFFSCREEN_X,
+                        FIXED_DT_MS)
+from collision import BirdCollider
+
+
+class BatchGame:
+    def __init__(self, n_envs, window_width, window_height, bird_mask, seeds=None):
+        self.n = n_envs
+        self.WINDOW_WIDTH = window_width
+        self.WINDOW_HEIGHT = window_height
+        if seeds is None:
+            seeds = range(n_envs)
+        # Boru boşlukları için ortam başına ayrı RNG (GameState.rng ile aynı çekiliş sırası)
+        self.rngs = [random.Random(s) for s in seeds]
+
+        collider = BirdCollider(bird_mask)
+        self.bird_w, self.bird_h = collider.width, collider.height
+        self.next_opaque, self.prev_opaque = collider.next_opaque, collider.prev_opaque
+        self._cols = np.arange(self.bird_w)
+        # Bir ortamda aynı anda ekranda olabilecek en fazla boru sayısı
+        lifetime_ticks = (window_width + PIPE_SPAWN_OFFSET + PIPE_WIDTH - PIPE_OFFSCREEN_X) / PIPE_SPEED
+        self.capacity = int(math.ceil(lifetime_ticks * FIXED_DT_MS / PIPE_INTERVAL_MS)) + 1
+
+        n, k = n_envs, self.capacity
+        self.tick_count = 0
+        self.sim_time_ms = 0.0
+        self.bird_y = np.zeros(n)
+        self.bird_vel = np.zeros(n)
+        self.shield_active = np.zeros(n, dtype=bool)
+        self.shield_end_time = np.zeros(n)
+        self.shield_charges = np.zeros(n, dtype=np.int64)
+        self.last_shield_time = np.zeros(n)
+        self.last_pipe_time = np.zeros(n)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.max_score = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.pipe_x = np.zeros((n, k), dtype=np.int64)
+        self.pipe_gap_y = np.zeros((n, k), dtype=np.int64)
+        self.pipe_passed = np.zeros((n, k), dtype=bool)
+        self.pipe_active = np.zeros((n, k), dtype=bool)
+
+        self.reset(np.ones(n, dtype=bool))
+
+    def reset(self, mask):
+        # GameState.start_new_game() karşılığı, yalnızca mask'teki ortamlar için
+        self.game_over[mask] = False
+        self.score[mask] = 0
+        self.pipe_active[mask] = False
+        self.bird_y[mask] = self.WINDOW_HEIGHT // 2
+        self.bird_vel[mask] = 0.0
+        self.last_pipe_time[mask] = self.sim_time_ms
+        self.shield_active[mask] = False
+        self.shield_end_time[mask] = 0
+        self.last_shield_time[mask] = -SHIELD_COOLDOWN_MS
+        self.shield_charges[mask] = SHIELD_CHARGES
+
+    def step(self, jump=None, shield=None, auto_reset=True):
+        # Tek çağrıda tüm ortamlar için bir simülasyon adımı (GameState.step ile aynı sıra).
+        # Biten oyunlar önce yeniden başlatılır; o adımda girdileri yok sayılır.
+        if auto_reset and self.game_over.any():
+            done = self.game_over.copy()
+            self.reset(done)
+        else:
+            done = None
+
+        live = ~self.game_over if done is None else ~(self.game_over | done)
+        if jump is not None:
+            jumping = live & jump
+            self.bird_vel[jumping] = JUMP_VELOCITY
+        if shield is not None:
+            self._activate_shield(live & shield)
+
+        self.tick_count += 1
+        self.sim_time_ms = self.tick_count * FIXED_DT_MS
+        now_ms = self.sim_time_ms
+
+        self.shield_active &= ~(now_ms >= self.shield_end_time)
+
+        active = ~self.game_over
+        spawn = np.flatnonzero(active & (now_ms - self.last_pipe_time > PIPE_INTERVAL_MS))
+        if spawn.size:
+            self._spawn(spawn, now_ms)
+
+        self.bird_vel[active] += GRAVITY
+        self.bird_y[active] += self.bird_vel[active]
+
+        moving = self.pipe_active & active[:, None]
+        self.pipe_x[moving] -= PIPE_SPEED
+        newly_passed = moving & ~self.pipe_passed & (self.pipe_x + PIPE_WIDTH < BIRD_X)
+        self.pipe_passed |= newly_passed
+        self.score += newly_passed.sum(axis=1)
+        np.maximum(self.max_score, self.score, out=self.max_score)
+        self.pipe_active &= ~(self.pipe_x + PIPE_WIDTH < PIPE_OFFSCREEN_X)
+
+        check = active & ~self.shield_active
+        self._check_pipe_collisions(check)
+        out_of_bounds = ((self.bird_y - BOUNDARY_MARGIN <= 0)
+                         | (self.bird_y + BOUNDARY_MARGIN >= self.WINDOW_HEIGHT - GROUND_HEIGHT))
+        self.game_over |= check & out_of_bounds
+        return done
+
+    def _activate_shield(self, want):
+        now_ms = self.sim_time_ms
+        ok = want & (self.shield_charges > 0) & (now_ms - self.last_shield_time >= SHIELD_COOLDOWN_MS)
+        self.shield_charges[ok] -= 1
+        self.shield_active[ok] = True
+        self.shield_end_time[ok] = now_ms + SHIELD_DURATION_MS
+        self.last_shield_time[ok] = now_ms
+
+    def _spawn(self, envs, now_ms):
+        hi = self.WINDOW_HEIGHT - GAP_BOTTOM_MARGIN - PIPE_GAP
+        free = np.argmin(self.pipe_active[envs], axis=1)
+        if self.pipe_active[envs, free].any():
+            raise RuntimeError("Boru kapasitesi aşıldı")
+        rngs = self.rngs
+        gaps = [rngs[e].randint(GAP_MIN_Y, hi) for e in envs.tolist()]
+        self.pipe_x[envs, free] = self.WINDOW_WIDTH + PIPE_SPAWN_OFFSET
+        self.pipe_gap_y[envs, free] = gaps
+        self.pipe_passed[envs, free] = False
+        self.pipe_active[envs, free] = True
+        self.last_pipe_time[envs] = now_ms
+
+    def _check_pipe_collisions(self, check):
+        # Bird.rect: merkez (int(x), int(y)); int() sıfıra doğru yuvarlar
+        left = BIRD_X - self.bird_w // 2
+        top = np.trunc(self.bird_y).astype(np.int64) - self.bird_h // 2
+
+        # Yatayda kuşla örtüşen borular (geniş faz)
+        c0 = self.pipe_x - left
+        c1 = c0 + PIPE_WIDTH
+        cand = self.pipe_active & check[:, None] & (c1 > 0) & (c0 < self.bird_w)
+        env, slot = np.nonzero(cand)
+        if env.size == 0:
+            return
+
+        # Dar faz: her sütunda boşluğun üstünde / altında opak piksel var mı
+        c0, c1 = c0[env, slot], c1[env, slot]
+        t = top[env]
+        gap_y = self.pipe_gap_y[env, slot]
+        cols = self._cols[None, :]
+        in_range = (cols >= c0[:, None]) & (cols < c1[:, None])
+
+        # Üst boru ekranda [0, gap_y) satırlarını kaplar
+        k_upper = np.clip(-t, 0, self.bird_h)
+        first = self.next_opaque[cols, k_upper[:, None]]
+        upper = (first < self.bird_h) & (first < (gap_y - t)[:, None])
+
+        # Alt boru [gap_y + PIPE_GAP, WINDOW_HEIGHT) satırlarını kaplar
+        k_lower = np.clip(self.WINDOW_HEIGHT - t, 0, self.bird_h)
+        last = self.prev_opaque[cols, k_lower[:, None]]
+        lower = (last >= 0) & (last >= (gap_y + PIPE_GAP - t)[:, None])
+
+        hit = ((upper | lower) & in_range).any(axis=1)
+        self.game_over[env[hit]] = True
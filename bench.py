@@ -0,0 +1,525 @@
+# bench.py
+# Sıcak yolların ekransız ve kamerasız kıyaslamaları (SDL dummy sürücüsü; MediaPipe yerine boş modül,
+# landmark'lar sentetik ya da kayıtlı izden). Her durum için yineleme başına süre ve bellek ayırma sayıları.
+#   python bench.py run --out bench.json [--trace oturum/trace.jsonl] [durum desenleri ...]
+#   python bench.py compare baseline.json bench.json --threshold 0.2
+#   python bench.py run --baseline baseline.json      (çalıştır ve karşılaştır)
+# Süreler aynı makinede bile süreçten sürece değişebilir (bellek yerleşimi, çekirdek); bu yüzden geriliyor
+# görünen durumlar taze süreçlerde yeniden ölçülür (--confirm) ve en iyi sonuç karşılaştırılır.
+import os
+
+if os.environ.get("SDL_VIDEODRIVER") not in ("dummy", "offscreen"):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import argparse
+import fnmatch
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+import numpy as np
+import pygame
+
+from frame_source import FrameSource, TraceResults, CAMERA_WIDTH, CAMERA_HEIGHT, read_trace
+from game_state import GameState, Pipe, SimClock, headless_bird_image, FIXED_DT_MS, PIPE_WIDTH, PIPE_GAP
+from simulate import gap_follower
+
+WINDOW_WIDTH, WINDOW_HEIGHT = 1440, 960
+# Süre: tekrarların en iyisi bu oranı aşarsa; ayırma: net blok sayısı bu kadardan fazla artarsa gerileme
+DEFAULT_THRESHOLD = 0.20
+ALLOC_SLACK_BLOCKS = 32
+PEAK_SLACK_BYTES = 4096
+# Bu kadar µs'den küçük farklar (zamanlayıcı ve çağrı gürültüsü) hiçbir oranda gerileme sayılmaz
+MIN_DELTA_US = 0.5
+
+CASES = {}
+
+
+def case(name, iterations):
+    # setup() -> her çağrısı bir yineleme olan fonksiyon
+    def register(setup):
+        CASES[name] = (setup, iterations)
+        return setup
+    return register
+
+
+def _stub_mediapipe():
+    # hand_tracker içe aktarılırken gerçek MediaPipe yüklenmez; kaynak landmark sağladığı için model hiç kurulmaz
+    if "mediapipe" not in sys.modules:
+        sys.modules["mediapipe"] = types.SimpleNamespace(solutions=types.SimpleNamespace(hands=None))
+
+
+def _running_game(seed=1, ticks=2000, bird_image=None, window_size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
+    game = GameState(bird_image or headless_bird_image(), *window_size, clock=SimClock(), seed=seed)
+    game.start_new_game()
+    game.fast_forward(ticks, gap_follower)
+    return game
+
+
+# --- Oyun mantığı ---
+
+@case("game.update_game_logic", 10000)
+def _update_game_logic():
+    clock = SimClock()
+    game = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=clock, seed=1)
+
+    def run():
+        gap_follower(game)
+        clock.advance(FIXED_DT_MS)
+        game.update_game_logic()
+    return run
+
+
+def _collision_case(count):
+    def setup():
+        game = _running_game()
+        game.pipes.clear()
+        rng = random.Random(count)
+        # Borular ekran boyunca eşit aralıklı; kuş, üstündeki borunun boşluğunda
+        for i in range(count):
+            game.pipes.spawn(i * (WINDOW_WIDTH - PIPE_WIDTH) / max(1, count - 1), rng)
+        bird = game.bird
+        for p in game.pipes:
+            if p.x <= bird.rect.right and p.x + p.width >= bird.rect.left:
+                bird.rect.centery = p.gap_y + PIPE_GAP // 2
+                break
+
+        def run():
+            game.game_over = False
+            game.check_collisions()
+        return run
+    return setup
+
+
+for _count in (1, 4, 16, 64):
+    case(f"game.check_collisions[{_count}]", 20000)(_collision_case(_count))
+
+
+@case("pipe.construct", 20000)
+def _pipe_construct():
+    rng = random.Random(3)
+
+    def run():
+        Pipe(WINDOW_WIDTH, WINDOW_HEIGHT, rng)
+    return run
+
+
+@case("pipe.respawn", 50000)
+def _pipe_respawn():
+    pipe = Pipe(WINDOW_WIDTH, WINDOW_HEIGHT, None)
+
+    def run():
+        pipe.respawn(WINDOW_WIDTH, 300)
+    return run
+
+
+@case("game.save_restore", 20000)
+def _save_restore():
+    game = _running_game()
+    while len(game.pipes) < 2:
+        gap_follower(game)
+        game.step()
+    other = _running_game(seed=2)
+    snap = game.save(game.new_snapshot())
+
+    def run():
+        game.save(snap)
+        other.restore(snap)
+    return run
+
+
+@case("autopilot.plan[16]", 300)
+def _autopilot_plan():
+    # Sabit rollout sayısı: süre, rollout başına maliyeti ölçer (rollout/s = 16 / süre)
+    from autopilot import Autopilot
+    game = _running_game()
+    autopilot = Autopilot(game, budget_ms=None, max_rollouts=16)
+
+    def run():
+        if game.game_over:
+            game.start_new_game()
+        if autopilot.plan():
+            game.jump()
+        game.step()
+    return run
+
+
+# --- Çizim ---
+
+_UI = {}
+
+
+def _ui(players=1):
+    # UIManager başına bir ekran; durumlar aynı örneği paylaşır (tam çizimle başlar)
+    if players not in _UI:
+        from ui_manager import UIManager
+        _UI[players] = UIManager(WINDOW_WIDTH, WINDOW_HEIGHT, dirty_rects=True, headless=True,
+                                 asset_cache_dir=None, players=players)
+    ui = _UI[players]
+    ui.invalidate()
+    return ui
+
+
+def _draw_case(state, players=1):
+    def setup():
+        ui = _ui(players)
+        games = [_running_game(seed=i + 1, bird_image=ui.bird_img, window_size=ui.view_size)
+                 for i in range(players)]
+        for game in games:
+            if state == "start":
+                game.reset_game()
+            elif state == "shield":
+                game.try_activate_shield()
+                game.bird.shield_end_time = math.inf
+            elif state == "game_over":
+                game.game_over = True
+        views = [{"cursor_pos": None, "pinch_strength": 0.0} for _ in range(players)]
+        hand_data = views[0] if players == 1 else {"players": views}
+        tick = [0]
+
+        def run():
+            # Simülasyon adımı yok: ara konum (alpha) ve imleç her karede değişir
+            i = tick[0] = tick[0] + 1
+            for game in games:
+                game.alpha = (i % 4) / 4
+            for p, view in enumerate(views):
+                view["cursor_pos"] = (200 + p * 700 + i % 300, 400)
+                view["pinch_strength"] = (i % 10) / 10
+            ui.draw_all(games, hand_data)
+        return run
+    return setup
+
+
+for _state in ("start", "playing", "shield", "game_over"):
+    case(f"ui.draw_all[{_state}]", 500)(_draw_case(_state))
+case("ui.draw_all[playing,2p]", 300)(_draw_case("playing", players=2))
+
+
+@case("ui.camera_preview", 300)
+def _camera_preview():
+    from camera_preview import CameraPreview
+    preview = CameraPreview((280, 210), fps=30)
+    frame = np.random.default_rng(0).integers(0, 255, (CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+    landmarks = [pts[:, :2] for pts in _synthetic_hands(1)[0]]
+    tick = [0]
+
+    def run():
+        # Her çağrı yeni bir kare ve önizleme hızını aşan bir zaman: her seferinde güncellenir
+        i = tick[0] = tick[0] + 1
+        preview.update(frame, landmarks, i, i * 100)
+    return run
+
+
+# --- El takibi (jest hesabı) ---
+
+def _synthetic_hands(frames, seed=0):
+    # Kareler arasında kayan, açılıp kapanan tutamlı iki el (normalize landmark'lar)
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(-0.05, 0.05, (21, 3)).astype(np.float32)
+    out = []
+    for i in range(frames):
+        hands = []
+        for h, cx in enumerate((0.3, 0.7)):
+            pts = base.copy()
+            pts[:, 0] += cx + 0.05 * math.sin(i / 20 + h)
+            pts[:, 1] += 0.5
+            pts[4, :2] = pts[8, :2] + 0.08 * (1 + math.sin(i / 7 + h)) / 2
+            hands.append(pts)
+        out.append(hands)
+    return out
+
+
+class _LandmarkSource(FrameSource):
+    # Hazır landmark dizisini döngüyle veren kaynak; kare boş ve tek seferlik ayrılır
+    provides_landmarks = True
+
+    def __init__(self, frames):
+        from roi_inference import LandmarkList
+        handedness = [types.SimpleNamespace(classification=[types.SimpleNamespace(label=label, score=0.9)])
+                      for label in ("Right", "Left")]
+        self.results_list = [TraceResults([LandmarkList(h) for h in hands], handedness[:len(hands)])
+                             if hands else TraceResults(None, None) for hands in frames]
+        self.frame = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+        self.index = 0
+        self.results = None
+
+    def read(self):
+        self.results = self.results_list[self.index % len(self.results_list)]
+        self.timestamp_ms = int(self.index * 1000 / 30)
+        self.index += 1
+        return True, self.frame
+
+
+_TRACE_FRAMES = {}
+
+
+def _landmark_frames():
+    # --trace verilmişse kayıtlı eller, yoksa sentetik eller
+    if "frames" not in _TRACE_FRAMES:
+        path = _TRACE_FRAMES.get("path")
+        if path:
+            frames = [[np.asarray(h, dtype=np.float32) for h in rec.get("hands") or []] for rec in read_trace(path)]
+        else:
+            frames = _synthetic_hands(300)
+        _TRACE_FRAMES["frames"] = frames
+    return _TRACE_FRAMES["frames"]
+
+
+def _tracker_case(players):
+    def setup():
+        _stub_mediapipe()
+        from hand_tracker import HandTracker
+        tracker = HandTracker(WINDOW_WIDTH, WINDOW_HEIGHT, source=_LandmarkSource(_landmark_frames()),
+                              players=players)
+
+        def run():
+            tracker.process_frame(None)
+        return run
+    return setup
+
+
+case("hand_tracker.process_frame[1p]", 2000)(_tracker_case(1))
+case("hand_tracker.process_frame[2p]", 2000)(_tracker_case(2))
+
+
+@case("gestures.hand_features[2]", 5000)
+def _hand_features():
+    from gestures import hand_features
+    hands = _landmark_frames()[0] or _synthetic_hands(1)[0]
+
+    def run():
+        hand_features(hands, CAMERA_WIDTH, CAMERA_HEIGHT)
+    return run
+
+
+@case("gestures.hand_assigner[2]", 5000)
+def _hand_assigner():
+    from gestures import HandAssigner
+    frames = _synthetic_hands(300)
+    assigner = HandAssigner(2)
+    labels = ["Right", "Left"]
+    tick = [0]
+
+    def run():
+        i = tick[0] = tick[0] + 1
+        assigner.assign(frames[i % len(frames)], labels, i * 33)
+    return run
+
+
+# --- Ölçüm ---
+
+def _reference():
+    # Makine hızı ölçüsü: sabit bir Python + küçük NumPy iş yükü. Karşılaştırmada süreler buna oranlanır,
+    # böylece aynı makinedeki genel yavaşlama (frekans, komşu yük) gerileme sayılmaz.
+    data = list(range(256))
+    arr = np.arange(64, dtype=np.float32)
+
+    def run():
+        total = 0
+        for v in data:
+            total += v * v
+        arr.sum()
+        return total
+    return run
+
+
+def measure(fn, iterations, repeats=5, warmup=None):
+    warmup = iterations // 10 if warmup is None else warmup
+    for _ in range(warmup):
+        fn()
+
+    # Süre: GC kapalıyken, yineleme başına µs; tekrarların en iyisi ve ortancası
+    times = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            times.append((time.perf_counter() - start) / iterations * 1e6)
+    finally:
+        gc.enable()
+
+    # Ayırmalar ayrı bir geçişte: net blok sayısı (büyüme) ve geçici tepe bayt
+    gc.collect()
+    tracemalloc.start()
+    try:
+        blocks = sys.getallocatedblocks()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(iterations):
+            fn()
+        current, peak = tracemalloc.get_traced_memory()
+        # Tam toplama serbest listelerdeki (float, tuple, çerçeve) blokları da bırakır; kalan gerçek büyümedir
+        gc.collect()
+        net_blocks = sys.getallocatedblocks() - blocks
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "us_min": round(min(times), 3),
+        "us_median": round(statistics.median(times), 3),
+        "net_blocks": net_blocks,
+        "net_bytes": current - base,
+        "peak_bytes": peak - base,
+    }
+
+
+def run_cases(patterns=None, scale=1.0, repeats=5, log=print):
+    reference = measure(_reference(), max(1, int(20000 * scale)), repeats)["us_min"]
+    log(f"{'(referans)':36s} {reference:10.2f} µs")
+    results = {}
+    for name, (setup, iterations) in CASES.items():
+        # Önce tam ad: durum adlarındaki [..] fnmatch'te karakter sınıfı sayılır
+        if patterns and name not in patterns and not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        fn = setup()
+        results[name] = measure(fn, max(1, int(iterations * scale)), repeats)
+        r = results[name]
+        log(f"{name:36s} {r['us_min']:10.2f} µs  net {r['net_blocks']:6d} blok  tepe {r['peak_bytes']:8d} B")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "trace": _TRACE_FRAMES.get("path"),
+            "reference_us": reference,
+        },
+        "cases": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, normalize=True, log=print):
+    # Gerileyen durumların listesini döner; yalnızca iki dosyada da olan durumlar karşılaştırılır.
+    # normalize: süreler iki çalıştırmanın referans iş yükü oranıyla düzeltilir
+    speed = 1.0
+    base_ref = baseline["meta"].get("reference_us")
+    cur_ref = current["meta"].get("reference_us")
+    if normalize and base_ref and cur_ref:
+        speed = cur_ref / base_ref
+        log(f"referans: {base_ref:.2f} -> {cur_ref:.2f} µs (süreler x{1 / speed:.2f} ile düzeltildi)")
+    regressions = []
+    for name, base in baseline["cases"].items():
+        cur = current["cases"].get(name)
+        if cur is None:
+            log(f"{name:36s} (yeni sonuçta yok)")
+            continue
+        cur_us = cur["us_min"] / speed
+        ratio = cur_us / base["us_min"] if base["us_min"] > 0 else 1.0
+        problems = []
+        if ratio > 1 + threshold and cur_us - base["us_min"] > MIN_DELTA_US:
+            problems.append(f"süre x{ratio:.2f}")
+        if cur["net_blocks"] > base["net_blocks"] + ALLOC_SLACK_BLOCKS:
+            problems.append(f"net blok {base['net_blocks']} -> {cur['net_blocks']}")
+        if cur["peak_bytes"] > base["peak_bytes"] * (1 + threshold) + PEAK_SLACK_BYTES:
+            problems.append(f"tepe {base['peak_bytes']} -> {cur['peak_bytes']} B")
+        status = "GERİLEME " + ", ".join(problems) if problems else "ok"
+        log(f"{name:36s} {base['us_min']:10.2f} -> {cur_us:10.2f} µs  ({ratio - 1:+.0%})  {status}")
+        if problems:
+            regressions.append(name)
+    for name in current["cases"].keys() - baseline["cases"].keys():
+        log(f"{name:36s} (taban çizgisinde yok)")
+    return regressions
+
+
+def _merge_best(results, other):
+    # Aynı durumun başka bir süreçteki ölçümü: süre için en hızlısı, ayırma için en küçüğü tutulur
+    scale = results["meta"]["reference_us"] / other["meta"]["reference_us"]
+    for name, r in other["cases"].items():
+        best = results["cases"].get(name)
+        if best is None:
+            continue
+        if r["us_min"] * scale < best["us_min"]:
+            best["us_min"] = round(r["us_min"] * scale, 3)
+            best["us_median"] = round(r["us_median"] * scale, 3)
+        for key in ("net_blocks", "net_bytes", "peak_bytes"):
+            best[key] = min(best[key], r[key])
+
+
+def confirm(names, results, args, runs):
+    # Geriliyor görünen durumlar ayrı süreçlerde yeniden ölçülür ve sonuçlar results'a katılır
+    for _ in range(runs):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            cmd = [sys.executable, os.path.abspath(__file__), "run", *names, "--out", path,
+                   "--repeats", str(args.repeats), "--scale", str(args.scale)]
+            if args.trace:
+                cmd += ["--trace", args.trace]
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+            _merge_best(results, _load(path))
+        finally:
+            os.remove(path)
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sıcak yol kıyaslamaları ve gerileme kontrolü")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="kıyaslamaları çalıştır")
+    run_p.add_argument("cases", nargs="*", help="tam durum adları ya da desenler (fnmatch), ör. 'ui.*'")
+    run_p.add_argument("--out", help="sonuçları bu JSON dosyasına yaz")
+    run_p.add_argument("--trace", help="jest durumları için kayıtlı trace.jsonl (varsayılan: sentetik eller)")
+    run_p.add_argument("--repeats", type=int, default=5)
+    run_p.add_argument("--scale", type=float, default=1.0, help="yineleme sayısı çarpanı")
+    run_p.add_argument("--baseline", help="çalıştıktan sonra bu sonuçla karşılaştır")
+    run_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run_p.add_argument("--no-normalize", action="store_true", help="referans iş yüküyle düzeltme yapma")
+    run_p.add_argument("--confirm", type=int, default=2,
+                       help="geriliyor görünen durumları bu kadar taze süreçte yeniden ölç")
+    run_p.add_argument("--list", action="store_true", help="durumları listele ve çık")
+    cmp_p = sub.add_parser("compare", help="iki sonuç dosyasını karşılaştır")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    cmp_p.add_argument("--no-normalize", action="store_true", help="referans iş yüküyle düzeltme yapma")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        regressions = compare(_load(args.baseline), _load(args.current), args.threshold, not args.no_normalize)
+    else:
+        if args.list:
+            print("\n".join(CASES))
+            return
+        _TRACE_FRAMES["path"] = args.trace
+        results = run_cases(args.cases, args.scale, args.repeats)
+        if args.baseline:
+            baseline = _load(args.baseline)
+            print()
+            regressions = compare(baseline, results, args.threshold, not args.no_normalize)
+            if regressions and args.confirm > 0:
+                print(f"\n{len(regressions)} durum {args.confirm} taze süreçte yeniden ölçülüyor...")
+                confirm(regressions, results, args, args.confirm)
+                regressions = compare(baseline, results, args.threshold, not args.no_normalize)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        if not args.baseline:
+            return
+
+    if regressions:
+        print(f"\n{len(regressions)} durumda gerileme: " + ", ".join(regressions))
+        sys.exit(1)
+    print("\nGerileme yok.")
+
+
+if __name__ == '__main__':
+    main()
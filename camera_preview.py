@@ -0,0 +1,77 @@
+# camera_preview.py
+import cv2
+import numpy as np
+import pygame
+
+# MediaPipe hand topology (mp.solutions.hands.HAND_CONNECTIONS), kept here so the
+# preview does not need to import mediapipe.
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+CONNECTION_COLOR = (224, 224, 224)
+LANDMARK_COLOR = (255, 0, 0)
+TIP_COLOR = (0, 200, 0)
+MID_COLOR = (255, 255, 255)
+
+
+class CameraPreview:
+    # The preview buffer is allocated once and shared with a persistent pygame
+    # Surface (frombuffer keeps a reference, it does not copy). Each update resizes
+    # the RGB inference frame straight into that buffer and draws landmarks at
+    # preview resolution, so a new frame costs no allocations.
+    def __init__(self, size, fps=30, interpolation=cv2.INTER_AREA):
+        self.size = size
+        self.fps = fps
+        self.interpolation = interpolation
+        w, h = size
+        self.buffer = np.zeros((h, w, 3), dtype=np.uint8)
+        self.surface = pygame.image.frombuffer(self.buffer, (w, h), 'RGB')
+        self._frame_time = None
+        self._last_update_ms = None
+        self.has_frame = False
+        # Landmark overlay; switched off at low quality levels
+        self.draw_landmarks = True
+
+        scale = w / 640
+        self.tip_radius = max(2, int(round(12 * scale)))
+        self.mid_radius = max(2, int(round(8 * scale)))
+
+    @property
+    def enabled(self):
+        return self.fps > 0
+
+    def update(self, frame, landmarks, frame_time_ms, now_ms):
+        # Skips all work when the preview is off, the frame is not new, or the
+        # preview rate has not elapsed yet.
+        if not self.enabled or frame is None:
+            return False
+        if self.has_frame and frame_time_ms is not None and frame_time_ms == self._frame_time:
+            return False
+        if self._last_update_ms is not None and now_ms - self._last_update_ms < 1000 / self.fps:
+            return False
+        self._frame_time = frame_time_ms
+        self._last_update_ms = now_ms
+
+        cv2.resize(frame, self.size, dst=self.buffer, interpolation=self.interpolation)
+        if landmarks and self.draw_landmarks:
+            self._draw_landmarks(landmarks)
+        self.has_frame = True
+        return True
+
+    def _draw_landmarks(self, landmarks):
+        w, h = self.size
+        buf = self.buffer
+        for pts in landmarks:
+            px = [tuple(p) for p in (np.asarray(pts) * (w, h)).astype(np.int32).tolist()]
+            for a, b in HAND_CONNECTIONS:
+                cv2.line(buf, px[a], px[b], CONNECTION_COLOR, 1)
+            for p in px:
+                cv2.circle(buf, p, 2, LANDMARK_COLOR, -1)
+            (tx, ty), (ix, iy) = px[4], px[8]
+            cv2.circle(buf, (tx, ty), self.tip_radius, TIP_COLOR, -1)
+            cv2.circle(buf, (ix, iy), self.tip_radius, TIP_COLOR, -1)
+            cv2.circle(buf, ((tx + ix) // 2, (ty + iy) // 2), self.mid_radius, MID_COLOR, 1)
@@ -0,0 +1,57 @@
+# collision.py
+# Borular eksen hizalı dolu dikdörtgenler olduğu için boru maskesine gerek yok:
+# kuş maskesinin sütun bazlı opak satır tabloları bir kez hesaplanır ve her boru
+# için piksel düzeyinde kesin sonuç, boru yüksekliğinden bağımsız sürede bulunur.
+import numpy as np
+
+
+def column_tables(mask):
+    # Her sütun için: k satırından itibaren ilk opak satır (yoksa h) ve
+    # k satırından önceki son opak satır (yoksa -1). Şekil: (w, h + 1)
+    w, h = mask.get_size()
+    opaque = np.zeros((w, h), dtype=bool)
+    for x in range(w):
+        for y in range(h):
+            opaque[x, y] = mask.get_at((x, y))
+
+    next_opaque = np.full((w, h + 1), h, dtype=np.int32)
+    prev_opaque = np.full((w, h + 1), -1, dtype=np.int32)
+    for k in range(h - 1, -1, -1):
+        next_opaque[:, k] = np.where(opaque[:, k], k, next_opaque[:, k + 1])
+    for k in range(1, h + 1):
+        prev_opaque[:, k] = np.where(opaque[:, k - 1], k - 1, prev_opaque[:, k - 1])
+    return next_opaque, prev_opaque
+
+
+class BirdCollider:
+    def __init__(self, mask):
+        self.width, self.height = mask.get_size()
+        self.next_opaque, self.prev_opaque = column_tables(mask)
+        # Skaler yol için satır başına Python listeleri: min/max dilimleri C hızında çalışır
+        self._next_rows = self.next_opaque.T.tolist()
+        self._prev_rows = self.prev_opaque.T.tolist()
+
+    def hits_pipe(self, bird_left, bird_top, pipe_x, pipe_width, gap_y, gap, window_height):
+        # Yatayda örtüşen kuş sütunları
+        c0 = max(0, pipe_x - bird_left)
+        c1 = min(self.width, pipe_x + pipe_width - bird_left)
+        if c0 >= c1:
+            return False
+        h = self.height
+        # Kuşun dikdörtgeni tamamen boşluktaysa piksel bakmaya gerek yok
+        if bird_top >= gap_y and bird_top + h <= gap_y + gap:
+            return False
+
+        # Üst boru ekranda [0, gap_y) satırlarını kaplar
+        if gap_y > 0:
+            k = min(h, max(0, -bird_top))
+            if min(self._next_rows[k][c0:c1]) < min(h, gap_y - bird_top):
+                return True
+
+        # Alt boru [gap_y + gap, window_height) satırlarını kaplar
+        lower_top = gap_y + gap
+        if window_height > lower_top:
+            k = min(h, max(0, window_height - bird_top))
+            if max(self._prev_rows[k][c0:c1]) >= max(0, lower_top - bird_top):
+                return True
+        return False
@@ -0,0 +1,238 @@
+# frame_source.py
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+# Orijinal, yüksek çözünürlüklü kamera ayarlarına geri dönüldü.
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+TRACE_FILE = "trace.jsonl"
+FRAMES_DIR = "frames"
+
+
+# Tüm kaynaklar cv2.VideoCapture ile aynı arayüzü sunar: read() -> (ret, frame).
+# timestamp_ms, kayıtlı oturumlarda karenin kaydedildiği andaki now_ms değeridir
+# (canlı kamerada None); lead_ms, o karede jest tahmini için kullanılan gecikmedir (kayıtta
+# yoksa None). provides_landmarks True ise kaynak MediaPipe sonucunu
+# da sağlar ve HandTracker çıkarımı atlar. live yalnızca canlı kamerada True'dur;
+# dosya kaynakları biter ve read() False döndüğünde bu hata değil, kaydın sonudur.
+class FrameSource:
+    provides_landmarks = False
+    live = False
+    timestamp_ms = None
+    lead_ms = None
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    live = True
+
+    def __init__(self, index=0, width=CAMERA_WIDTH, height=CAMERA_HEIGHT):
+        self.cap = cv2.VideoCapture(index)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, loop=False):
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_ms = 1000.0 / fps if fps and fps > 0 else 1000.0 / 30
+        self.index = 0
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if ret:
+            self.timestamp_ms = int(self.index * self.frame_ms)
+            self.index += 1
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirSource(FrameSource):
+    def __init__(self, path, timestamps=None, frame_ms=1000.0 / 30, leads=None):
+        self.files = sorted(os.path.join(path, f) for f in os.listdir(path)
+                            if f.lower().endswith(IMAGE_EXTENSIONS))
+        self.timestamps = timestamps
+        self.leads = leads
+        self.frame_ms = frame_ms
+        self.index = 0
+
+    def read(self):
+        if self.index >= len(self.files):
+            return False, None
+        frame = cv2.imread(self.files[self.index])
+        if self.timestamps is not None:
+            self.timestamp_ms = self.timestamps[self.index]
+        else:
+            self.timestamp_ms = int(self.index * self.frame_ms)
+        if self.leads is not None:
+            self.lead_ms = self.leads[self.index]
+        self.index += 1
+        return frame is not None, frame
+
+
+class TraceResults:
+    # hands.process() sonucunun kayıttan kurulan karşılığı
+    def __init__(self, multi_hand_landmarks, multi_handedness):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+def _build_results(hands, handedness):
+    from mediapipe.framework.formats import landmark_pb2, classification_pb2
+
+    if not hands:
+        return TraceResults(None, None)
+    lm_lists = []
+    for pts in hands:
+        lm_lists.append(landmark_pb2.NormalizedLandmarkList(
+            landmark=[landmark_pb2.NormalizedLandmark(x=x, y=y, z=z) for x, y, z in pts]))
+    cls_lists = []
+    for label, score in handedness or []:
+        cls_lists.append(classification_pb2.ClassificationList(
+            classification=[classification_pb2.Classification(label=label, score=score)]))
+    return TraceResults(lm_lists, cls_lists or None)
+
+
+def read_trace(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class LandmarkTraceSource(FrameSource):
+    # MediaPipe'ı tamamen atlar: kayıtlı landmark'ları boş bir kare ile döndürür
+    provides_landmarks = True
+
+    def __init__(self, path, width=CAMERA_WIDTH, height=CAMERA_HEIGHT):
+        if os.path.isdir(path):
+            path = os.path.join(path, TRACE_FILE)
+        self.records = read_trace(path)
+        self.shape = (height, width, 3)
+        self.index = 0
+        self.results = None
+
+    def read(self):
+        if self.index >= len(self.records):
+            return False, None
+        rec = self.records[self.index]
+        self.index += 1
+        self.timestamp_ms = rec["now_ms"]
+        self.lead_ms = rec.get("lead_ms")
+        self.results = _build_results(rec.get("hands"), rec.get("handedness"))
+        return True, np.zeros(self.shape, dtype=np.uint8)
+
+
+class PacedSource(FrameSource):
+    # Kayıtlı bir kaynağı kayıt hızında verir: her kare, kayıttaki aralıklarla clock() (ms) ekseninde
+    # hazır olana kadar bekletilir ve timestamp_ms bu eksene taşınır. Oyun, dosyadan gelen kareleri
+    # canlı kameradaki gibi kendi saatinde görür; jestlerin debounce süreleri kayıttakiyle aynı kalır.
+    def __init__(self, source, clock):
+        self.source = source
+        self.clock = clock
+        self.provides_landmarks = source.provides_landmarks
+        self.offset_ms = None
+
+    @property
+    def results(self):
+        return self.source.results
+
+    @property
+    def lead_ms(self):
+        return self.source.lead_ms
+
+    def read(self):
+        ret, frame = self.source.read()
+        if not ret:
+            return ret, frame
+        recorded_ms = self.source.timestamp_ms or 0
+        if self.offset_ms is None:
+            self.offset_ms = self.clock() - recorded_ms
+        self.timestamp_ms = recorded_ms + self.offset_ms
+        delay_ms = self.timestamp_ms - self.clock()
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        return ret, frame
+
+    def release(self):
+        self.source.release()
+
+
+def open_source(spec=None, landmarks=False):
+    # spec: None/"camera"/"camera:N", video dosyası, resim klasörü,
+    # kayıtlı oturum klasörü ya da trace.jsonl
+    if spec is None or isinstance(spec, int):
+        return CameraSource(spec or 0)
+    if isinstance(spec, FrameSource):
+        return spec
+    if spec.startswith("camera"):
+        _, _, index = spec.partition(":")
+        return CameraSource(int(index or 0))
+    if spec.endswith(".jsonl"):
+        return LandmarkTraceSource(spec)
+    if os.path.isdir(spec):
+        trace_path = os.path.join(spec, TRACE_FILE)
+        if os.path.exists(trace_path):
+            if landmarks:
+                return LandmarkTraceSource(trace_path)
+            records = read_trace(trace_path)
+            return ImageDirSource(os.path.join(spec, FRAMES_DIR), timestamps=[r["now_ms"] for r in records],
+                                  leads=[r.get("lead_ms") for r in records])
+        return ImageDirSource(spec)
+    return VideoFileSource(spec)
+
+
+class SessionRecorder:
+    # Gerçek bir oturumun ham karelerini (aynalanmadan önce), landmark'larını ve
+    # now_ms zaman damgalarını kaydeder; replay.py ile aynı girdi tekrar oynatılır.
+    def __init__(self, path, save_frames=True, save_landmarks=True):
+        self.path = path
+        self.save_frames = save_frames
+        self.save_landmarks = save_landmarks
+        os.makedirs(path, exist_ok=True)
+        if save_frames:
+            os.makedirs(os.path.join(path, FRAMES_DIR), exist_ok=True)
+        self._trace = open(os.path.join(path, TRACE_FILE), "w", encoding="utf-8")
+        self.count = 0
+
+    def record(self, now_ms, raw_frame, results, lead_ms=None):
+        rec = {"now_ms": int(now_ms)}
+        if lead_ms is not None:
+            rec["lead_ms"] = lead_ms
+        if self.save_frames:
+            name = f"{self.count:06d}.png"
+            cv2.imwrite(os.path.join(self.path, FRAMES_DIR, name), raw_frame)
+            rec["frame"] = f"{FRAMES_DIR}/{name}"
+        if self.save_landmarks:
+            hands = results.multi_hand_landmarks or []
+            rec["hands"] = [[[p.x, p.y, p.z] for p in h.landmark] for h in hands]
+            handedness = getattr(results, "multi_handedness", None) or []
+            rec["handedness"] = [[c.classification[0].label, c.classification[0].score] for c in handedness]
+        self._trace.write(json.dumps(rec) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._trace.close()
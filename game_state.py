@@ -1,6 +1,9 @@
 # game_state.py
 import pygame
 import random
+from itertools import islice
+
+from collision import BirdCollider
 
 # Oyun ayarları ve fizik sabitleri
 GRAVITY = 1.5
@@ -9,22 +12,69 @@ PIPE_SPEED = 8
 PIPE_GAP = 180
 PIPE_WIDTH = 90
 PIPE_INTERVAL_MS = 2500
+# Borular ekranın 20 px sağında doğar, sağ kenarı -10'u geçince silinir
+PIPE_SPAWN_OFFSET = 20
+PIPE_OFFSCREEN_X = -10
 SHIELD_DURATION_MS = 3000
 SHIELD_COOLDOWN_MS = 10000
+SHIELD_CHARGES = 3
+BIRD_X = 180
+# Sınır çarpışması: kuş merkezinin üst kenara / zemine (alttan 70 px) 8 px yaklaşması
+BOUNDARY_MARGIN = 8
+GROUND_HEIGHT = 70
+# Boşluğun üst kenarı için izin verilen aralık (kenarlara daha az yakın)
+GAP_MIN_Y = 150
+GAP_BOTTOM_MARGIN = 250
+
+# Sabit adımlı simülasyon: fizik, kare hızından bağımsız olarak saniyede SIM_HZ adım ilerler.
+SIM_HZ = 60
+FIXED_DT_MS = 1000 / SIM_HZ
+# Uzun bir takılmadan sonra adım biriktirip donmamak için tek karede işlenecek üst sınır
+MAX_FRAME_MS = 250
+# Gecikme telafisi: geç gelen bir jest zıplaması en fazla bu kadar geriye sarılarak, jestin
+# yapıldığı adımdan itibaren uygulanır (kuş son REWIND_TICKS adım için yeniden simüle edilir)
+MAX_REWIND_MS = 150
+REWIND_TICKS = int(MAX_REWIND_MS // FIXED_DT_MS)
+
+
+class SimClock:
+    # Elle ilerletilen saat: pygame.time.get_ticks() yerine enjekte edilir (headless / test)
+    def __init__(self, start_ms=0):
+        self.now_ms = start_ms
+
+    def __call__(self):
+        return self.now_ms
+
+    def advance(self, ms):
+        self.now_ms += ms
+
+
+def headless_bird_image(path="bg/logo.png", size=(100, 100)):
+    # Ekran açmadan kuş görselini yükler (convert_alpha görüntü modu ister)
+    return pygame.transform.smoothscale(pygame.image.load(path), size)
 
 
 class Bird:
-    def __init__(self, x, y, image):
+    __slots__ = ("x", "y", "vel", "prev_y", "image", "rect", "mask", "shield_active", "shield_end_time")
+
+    def __init__(self, x, y, image, mask=None):
         self.x = x
+        self.image = image
+        self.rect = self.image.get_rect(center=(x, y))
+        # Maske görselden bir kez çıkarılır; yeni oyunda kuş yeniden kurulmaz, reset edilir
+        self.mask = mask if mask is not None else pygame.mask.from_surface(self.image)
+        self.reset(y)
+
+    def reset(self, y):
         self.y = y
         self.vel = 0.0
-        self.image = image
-        self.rect = self.image.get_rect(center=(self.x, self.y))
-        self.mask = pygame.mask.from_surface(self.image)
+        self.prev_y = y
+        self.rect.center = (int(self.x), int(y))
         self.shield_active = False
         self.shield_end_time = 0
 
     def update(self):
+        self.prev_y = self.y
         self.vel += GRAVITY
         self.y += self.vel
         self.rect.center = (int(self.x), int(self.y))
@@ -32,61 +82,200 @@ class Bird:
     def jump(self, multiplier=1.0):
         self.vel = JUMP_VELOCITY * multiplier
 
-    def draw(self, surf):
-        surf.blit(self.image, self.rect)
+    def render_center(self, alpha=1.0):
+        # Son iki simülasyon adımı arasında enterpolasyonlu çizim konumu
+        return int(self.x), int(self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def draw(self, surf, alpha=1.0):
+        return surf.blit(self.image, self.image.get_rect(center=self.render_center(alpha)))
+
+
+def random_gap_y(rng, window_height):
+    return rng.randint(GAP_MIN_Y, window_height - GAP_BOTTOM_MARGIN - PIPE_GAP)  # Kenarlara daha az yakın
 
 
 class Pipe:
-    def __init__(self, x, window_height):
-        self.x = x
+    __slots__ = ("x", "prev_x", "width", "gap", "gap_y", "passed", "window_height", "rect_upper", "rect_lower")
+
+    def __init__(self, x, window_height, rng=random):
         self.width = PIPE_WIDTH
         self.gap = PIPE_GAP
-        self.gap_y = random.randint(150, window_height - 250 - self.gap)  # Kenarlara daha az yakın
-        self.passed = False
         self.window_height = window_height
 
-        # --- PERFORMANS DÜZELTMESİ: Rect ve Mask'lar burada, BİR KEZ oluşturulur ---
-        self.rect_upper = pygame.Rect(self.x, 0, self.width, self.gap_y)
-        self.rect_lower = pygame.Rect(self.x, self.gap_y + self.gap, self.width,
-                                      self.window_height - (self.gap_y + self.gap))
-
-        self.mask_upper = pygame.mask.Mask((int(self.width), int(self.gap_y)), fill=True) if self.gap_y > 0 else None
+        # --- PERFORMANS DÜZELTMESİ: Rect'ler burada, BİR KEZ oluşturulur ---
+        # Boru maskesi yok: çarpışma collision.BirdCollider ile analitik olarak bulunur.
+        self.rect_upper = pygame.Rect(0, 0, self.width, 0)
+        self.rect_lower = pygame.Rect(0, 0, self.width, 0)
+        self.respawn(x, random_gap_y(rng, window_height) if rng is not None else GAP_MIN_Y)
 
-        lower_top = self.gap_y + self.gap
-        h_lower = self.window_height - lower_top
-        self.mask_lower = pygame.mask.Mask((int(self.width), int(h_lower)), fill=True) if h_lower > 0 else None
+    def respawn(self, x, gap_y):
+        # Havuzdan geri dönüşüm: nesne ve Rect'ler yerinde yeni boru olarak kurulur
+        self.x = x
+        self.prev_x = x
+        self.gap_y = gap_y
+        self.passed = False
+        self.rect_upper.update(self.x, 0, self.width, self.gap_y)
+        self.rect_lower.update(self.x, self.gap_y + self.gap, self.width,
+                               self.window_height - (self.gap_y + self.gap))
 
     def update(self):
+        self.prev_x = self.x
         self.x -= PIPE_SPEED
         # Rect'lerin pozisyonunu da güncelle
         self.rect_upper.x = int(self.x)
         self.rect_lower.x = int(self.x)
 
     def off_screen(self):
-        return self.x + self.width < -10
+        return self.x + self.width < PIPE_OFFSCREEN_X
 
-    def draw(self, surf):
+    def render_x(self, alpha=1.0):
+        return int(self.prev_x + (self.x - self.prev_x) * alpha)
+
+    def draw(self, surf, alpha=1.0):
         # Çizim için de artık önceden oluşturulmuş Rect'leri kullanıyoruz
-        pygame.draw.rect(surf, (34, 139, 34), self.rect_upper)
-        pygame.draw.rect(surf, (0, 128, 0), self.rect_lower)
+        x = self.render_x(alpha)
+        upper = pygame.draw.rect(surf, (34, 139, 34), (x, self.rect_upper.y, self.rect_upper.w, self.rect_upper.h))
+        lower = pygame.draw.rect(surf, (0, 128, 0), (x, self.rect_lower.y, self.rect_lower.w, self.rect_lower.h))
+        # Kirli bölge takibi için boyanan alanın tamamı
+        return upper.union(lower)
+
+
+class PipePool:
+    # Sabit kapasiteli boru havuzu. Borular hep aynı noktada doğup aynı hızla ilerlediği için
+    # x sırası doğuş sırasıdır: canlı borular listenin başında sıralı durur, ekrandan çıkan
+    # baştan alınıp sona (boş kısma) döner, yeni boru ilk boş nesne yeniden kurularak eklenir.
+    # Kararlı durumda hiç nesne ayrılmaz.
+    __slots__ = ("_items", "_count", "window_height")
+
+    def __init__(self, window_height, capacity):
+        self.window_height = window_height
+        self._items = [Pipe(0, window_height, rng=None) for _ in range(capacity)]
+        self._count = 0
+
+    @property
+    def capacity(self):
+        return len(self._items)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if not -self._count <= i < self._count:
+            raise IndexError(i)
+        return self._items[i % self._count]
+
+    def __iter__(self):
+        return islice(self._items, self._count)
+
+    def clear(self):
+        self._count = 0
+
+    def resize(self, count):
+        # Geri yükleme için: ilk count nesne canlı borular olur (gerekirse havuz büyür)
+        while len(self._items) < count:
+            self._items.append(Pipe(0, self.window_height, rng=None))
+        self._count = count
+
+    def spawn(self, x, rng):
+        if self._count == len(self._items):
+            # Kapasite geometriden hesaplanır, buraya düşülmez; düşülürse havuz büyür
+            self._items.append(Pipe(0, self.window_height, rng=None))
+        pipe = self._items[self._count]
+        pipe.respawn(x, random_gap_y(rng, self.window_height))
+        self._count += 1
+        return pipe
+
+    def drop_offscreen(self):
+        items = self._items
+        while self._count and items[0].off_screen():
+            items.append(items.pop(0))
+            self._count -= 1
+
+
+def pipe_pool_capacity(window_width):
+    # Aynı anda ekranda olabilecek en fazla boru: doğuştan silinmeye kadar yol / iki doğuş arası yol
+    travel = window_width + PIPE_SPAWN_OFFSET + PIPE_WIDTH - PIPE_OFFSCREEN_X
+    spacing = PIPE_SPEED * (PIPE_INTERVAL_MS / FIXED_DT_MS)
+    return int(travel // spacing) + 2
+
+
+class GameSnapshot:
+    # GameState'in çizimden bağımsız tüm durumu: kuş, borular (havuz sırasıyla), skor, kalkan, RNG ve
+    # simülasyon saati. Listeler bir kez ayrılır; kaydetme ve geri yükleme yalnızca başvuru kopyalar.
+    # RNG durumu (getstate, 625 sayı) yalnızca son kayıttan bu yana boru doğduysa yeniden alınır.
+    __slots__ = ("bird_y", "bird_vel", "bird_prev_y", "shield_active", "shield_end_time",
+                 "pipe_count", "pipe_x", "pipe_prev_x", "pipe_gap_y", "pipe_passed",
+                 "score", "max_score", "shield_charges", "game_started", "game_over",
+                 "last_pipe_time", "last_shield_time", "slow_motion_end",
+                 "tick_count", "sim_time_ms", "accumulator_ms", "alpha",
+                 "rng_state", "rng_stream", "rng_draws")
+
+    def __init__(self, capacity):
+        self.pipe_count = 0
+        self.pipe_x = [0] * capacity
+        self.pipe_prev_x = [0] * capacity
+        self.pipe_gap_y = [0] * capacity
+        self.pipe_passed = [False] * capacity
+        self.rng_state = None
+        self.rng_stream = None
+        self.rng_draws = -1
+
+    def _grow(self, capacity):
+        extra = capacity - len(self.pipe_x)
+        if extra > 0:
+            self.pipe_x.extend([0] * extra)
+            self.pipe_prev_x.extend([0] * extra)
+            self.pipe_gap_y.extend([0] * extra)
+            self.pipe_passed.extend([False] * extra)
 
 
 class GameState:
-    def __init__(self, bird_image, window_width, window_height):
+    # on_event(tür, değer, sim_time_ms): oyun başlangıcı, skor, ölüm ve kalkan olayları (ör. telemetri)
+    def __init__(self, bird_image, window_width, window_height, clock=None, seed=None, on_event=None):
         self.WINDOW_WIDTH = window_width
         self.WINDOW_HEIGHT = window_height
         self.bird_img = bird_image
+        # Her oyunun kendi RNG'si: aynı tohumla aynı boru dizisi (batch_sim ile eşdeğerlik için)
+        self.rng = random.Random(seed)
+        # RNG yalnızca boru doğuşunda çekilir: (akış, çekiliş sayısı) durumunu tek başına belirler.
+        # Anlık görüntüden yüklenen oyun, görüntünün alındığı oyunun akışını devralır.
+        self._rng_stream = object()
+        self.rng_draws = 0
+        self.on_event = on_event
+
+        # Oyun zamanı duvar saatinden değil, simülasyon adımlarından gelir
+        self.clock = clock if clock is not None else pygame.time.get_ticks
+        self.tick_count = 0
+        self.sim_time_ms = 0.0
+        self.accumulator_ms = 0.0
+        self.alpha = 1.0
+        self._last_clock_ms = self.clock()
+        # Duvar saati - simülasyon saati; olay zaman damgalarını adım numarasına çevirir
+        self._clock_offset_ms = self._last_clock_ms
+
+        # Adım başına kuş durumu (bird.update'ten hemen önce) ve o adımdan önce uygulanan zıplama
+        self._hist_state = [None] * (REWIND_TICKS + 1)
+        self._hist_jump = [0.0] * (REWIND_TICKS + 1)
+        self._hist_from = 0
+        self._pending_jump = 0.0
+        self.rewinds = 0
+
+        # Kuş, maskesi ve boru havuzu bir kez kurulur; oyunlar arasında yeniden kullanılır
+        self.bird = Bird(BIRD_X, self.WINDOW_HEIGHT // 2, self.bird_img)
+        self.pipes = PipePool(self.WINDOW_HEIGHT, pipe_pool_capacity(self.WINDOW_WIDTH))
         self.reset_game()
+        # Kuş maskesinin sütun tabloları bir kez hesaplanır
+        self.collider = BirdCollider(self.bird.mask)
 
     def reset_game(self):
-        self.bird = Bird(180, self.WINDOW_HEIGHT // 2, self.bird_img)
-        self.pipes = []
+        self.bird.reset(self.WINDOW_HEIGHT // 2)
+        self.pipes.clear()
         self.score = 0
         self.max_score = getattr(self, 'max_score', 0)
-        self.shield_charges = 3
+        self.shield_charges = SHIELD_CHARGES
         self.game_started = False
         self.game_over = False
-        self.last_pipe_time = pygame.time.get_ticks() - PIPE_INTERVAL_MS
+        self.last_pipe_time = self.sim_time_ms - PIPE_INTERVAL_MS
         self.last_shield_time = -SHIELD_COOLDOWN_MS
         self.slow_motion_end = 0
 
@@ -95,14 +284,169 @@ class GameState:
         self.game_over = False
         self.score = 0
         self.pipes.clear()
-        self.bird = Bird(180, self.WINDOW_HEIGHT // 2, self.bird_img)
-        self.last_pipe_time = pygame.time.get_ticks()
-        self.bird.shield_active = False
+        self.bird.reset(self.WINDOW_HEIGHT // 2)
+        self.last_pipe_time = self.sim_time_ms
         self.last_shield_time = -SHIELD_COOLDOWN_MS
-        self.shield_charges = 3
+        self.shield_charges = SHIELD_CHARGES
+        # Yeni oyunun başından öncesine geri sarılmaz
+        self._hist_from = self.tick_count + 1
+        self._pending_jump = 0.0
+        if self.on_event is not None:
+            self.on_event("game_start", None, self.sim_time_ms)
+
+    def jump(self, event_time_ms=None, multiplier=1.0):
+        # event_time_ms: jestin ait olduğu kameranın kare zaman damgası (oyun saatiyle aynı saatte).
+        # Verilirse zıplama o ana ait adımdan itibaren uygulanır; verilmezse hemen.
+        self.bird.jump(multiplier)
+        self._pending_jump = multiplier
+        if event_time_ms is None or not self.game_started or self.game_over:
+            return
+        step = int((event_time_ms - self._clock_offset_ms) // FIXED_DT_MS) + 1
+        first = max(step, self.tick_count + 1 - REWIND_TICKS, self._hist_from)
+        if first <= self.tick_count:
+            self._pending_jump = 0.0
+            self._resimulate(first, multiplier)
+
+    def _resimulate(self, first, multiplier):
+        # Kuşu `first` adımının başına geri alır, zıplamayı orada uygular ve o günden bu yana
+        # kaydedilmiş zıplamalarla birlikte bugüne kadar yeniden simüle eder. Borular kuştan
+        # bağımsız ilerlediği için geçmiş adımdaki konumları kaydırma ile bulunur.
+        n = REWIND_TICKS + 1
+        bird = self.bird
+        bird.y, bird.vel, bird.prev_y, _ = self._hist_state[first % n]
+        self._hist_jump[first % n] = multiplier
+        self.rewinds += 1
+        for step in range(first, self.tick_count + 1):
+            i = step % n
+            if self._hist_jump[i]:
+                bird.jump(self._hist_jump[i])
+            shield_active = self._hist_state[i][3]
+            self._hist_state[i] = (bird.y, bird.vel, bird.prev_y, shield_active)
+            bird.update()
+            if not shield_active and self._bird_hits((self.tick_count - step) * PIPE_SPEED):
+                self._end_game()
+                return
+
+    def new_snapshot(self):
+        return GameSnapshot(self.pipes.capacity)
+
+    def save(self, snap):
+        bird = self.bird
+        snap.bird_y = bird.y
+        snap.bird_vel = bird.vel
+        snap.bird_prev_y = bird.prev_y
+        snap.shield_active = bird.shield_active
+        snap.shield_end_time = bird.shield_end_time
+
+        snap._grow(len(self.pipes))
+        i = 0
+        for p in self.pipes:
+            snap.pipe_x[i] = p.x
+            snap.pipe_prev_x[i] = p.prev_x
+            snap.pipe_gap_y[i] = p.gap_y
+            snap.pipe_passed[i] = p.passed
+            i += 1
+        snap.pipe_count = i
+
+        snap.score = self.score
+        snap.max_score = self.max_score
+        snap.shield_charges = self.shield_charges
+        snap.game_started = self.game_started
+        snap.game_over = self.game_over
+        snap.last_pipe_time = self.last_pipe_time
+        snap.last_shield_time = self.last_shield_time
+        snap.slow_motion_end = self.slow_motion_end
+        snap.tick_count = self.tick_count
+        snap.sim_time_ms = self.sim_time_ms
+        snap.accumulator_ms = self.accumulator_ms
+        snap.alpha = self.alpha
+
+        if snap.rng_stream is not self._rng_stream or snap.rng_draws != self.rng_draws:
+            snap.rng_state = self.rng.getstate()
+            snap.rng_stream = self._rng_stream
+            snap.rng_draws = self.rng_draws
+        return snap
+
+    def restore(self, snap):
+        # Başka bir GameState'in (aynı pencere yüksekliği) görüntüsü de yüklenebilir; olay bildirilmez
+        if snap.rng_state is None:
+            raise ValueError("Boş anlık görüntü")
+        bird = self.bird
+        bird.y = snap.bird_y
+        bird.vel = snap.bird_vel
+        bird.prev_y = snap.bird_prev_y
+        bird.shield_active = snap.shield_active
+        bird.shield_end_time = snap.shield_end_time
+        bird.rect.center = (int(bird.x), int(bird.y))
+
+        self.pipes.resize(snap.pipe_count)
+        i = 0
+        for p in self.pipes:
+            p.respawn(snap.pipe_x[i], snap.pipe_gap_y[i])
+            p.prev_x = snap.pipe_prev_x[i]
+            p.passed = snap.pipe_passed[i]
+            i += 1
+
+        self.score = snap.score
+        self.max_score = snap.max_score
+        self.shield_charges = snap.shield_charges
+        self.game_started = snap.game_started
+        self.game_over = snap.game_over
+        self.last_pipe_time = snap.last_pipe_time
+        self.last_shield_time = snap.last_shield_time
+        self.slow_motion_end = snap.slow_motion_end
+        self.tick_count = snap.tick_count
+        self.sim_time_ms = snap.sim_time_ms
+        self.accumulator_ms = snap.accumulator_ms
+        self.alpha = snap.alpha
+        self._clock_offset_ms = self._last_clock_ms - (self.sim_time_ms + self.accumulator_ms)
+        # Geçmiş, geri yüklenen andan öncesine geri sarılamaz
+        self._hist_from = self.tick_count + 1
+        self._pending_jump = 0.0
+
+        if self._rng_stream is not snap.rng_stream or self.rng_draws != snap.rng_draws:
+            self.rng.setstate(snap.rng_state)
+            self._rng_stream = snap.rng_stream
+            self.rng_draws = snap.rng_draws
+
+    def try_activate_shield(self):
+        now_ms = self.sim_time_ms
+        if self.shield_charges > 0 and now_ms - self.last_shield_time >= SHIELD_COOLDOWN_MS:
+            self.shield_charges -= 1
+            self.bird.shield_active = True
+            self.bird.shield_end_time = now_ms + SHIELD_DURATION_MS
+            self.last_shield_time = now_ms
+            if self.on_event is not None:
+                self.on_event("shield", self.shield_charges, now_ms)
+            return True
+        return False
 
     def update_game_logic(self):
-        now_ms = pygame.time.get_ticks()
+        # Biriktiricili sabit adım: geçen gerçek süre kadar FIXED_DT_MS'lik adım atılır,
+        # artan kısım bir sonraki kareye devreder ve çizim için alpha olarak kullanılır.
+        now = self.clock()
+        elapsed = min(max(0, now - self._last_clock_ms), MAX_FRAME_MS)
+        self._last_clock_ms = now
+        self.accumulator_ms += elapsed
+        while self.accumulator_ms >= FIXED_DT_MS:
+            self.step()
+            self.accumulator_ms -= FIXED_DT_MS
+        self.alpha = self.accumulator_ms / FIXED_DT_MS
+        self._clock_offset_ms = now - (self.sim_time_ms + self.accumulator_ms)
+
+    def fast_forward(self, ticks, controller=None):
+        # Ekran ve gerçek zaman olmadan simülasyonu olabildiğince hızlı ilerletir.
+        # controller(game) her adımdan önce çağrılır (ör. bir bot zıplatabilir).
+        for _ in range(ticks):
+            if controller is not None:
+                controller(self)
+            self.step()
+        self.alpha = 1.0
+
+    def step(self):
+        self.tick_count += 1
+        self.sim_time_ms = self.tick_count * FIXED_DT_MS
+        now_ms = self.sim_time_ms
 
         if self.bird.shield_active and now_ms >= self.bird.shield_end_time:
             self.bird.shield_active = False
@@ -111,10 +455,16 @@ class GameState:
             return
 
         if now_ms - self.last_pipe_time > PIPE_INTERVAL_MS:
-            self.pipes.append(Pipe(self.WINDOW_WIDTH + 20, self.WINDOW_HEIGHT))
+            self.pipes.spawn(self.WINDOW_WIDTH + PIPE_SPAWN_OFFSET, self.rng)
+            self.rng_draws += 1
             self.last_pipe_time = now_ms
 
-        self.bird.update()
+        i = self.tick_count % (REWIND_TICKS + 1)
+        bird = self.bird
+        self._hist_state[i] = (bird.y, bird.vel, bird.prev_y, bird.shield_active)
+        self._hist_jump[i] = self._pending_jump
+        self._pending_jump = 0.0
+        bird.update()
 
         for p in self.pipes:
             p.update()
@@ -123,27 +473,40 @@ class GameState:
                 self.score += 1
                 if self.score > self.max_score:
                     self.max_score = self.score
+                if self.on_event is not None:
+                    self.on_event("score", self.score, now_ms)
 
-        self.pipes = [p for p in self.pipes if not p.off_screen()]
+        self.pipes.drop_offscreen()
 
-        if not self.bird.shield_active:
-            self.check_collisions()  # Ayrı bir fonksiyona taşıdık
-            # Sınır çarpışması
-            if self.bird.y - 8 <= 0 or self.bird.y + 8 >= self.WINDOW_HEIGHT - 70:
-                self.game_over = True
+        if not self.bird.shield_active and self._bird_hits():
+            self._end_game()
+
+    def _end_game(self):
+        self.game_over = True
+        if self.on_event is not None:
+            self.on_event("death", self.score, self.sim_time_ms)
 
-    def check_collisions(self):
+    def _bird_hits(self, pipe_shift=0):
+        # Borular ve sınırlar; pipe_shift, geçmiş bir adım için boruların o andaki kayması
+        self.check_collisions(pipe_shift)  # Ayrı bir fonksiyona taşıdık
+        # Sınır çarpışması
+        return (self.game_over or self.bird.y - BOUNDARY_MARGIN <= 0
+                or self.bird.y + BOUNDARY_MARGIN >= self.WINDOW_HEIGHT - GROUND_HEIGHT)
+
+    def check_collisions(self, pipe_shift=0):
         # --- PERFORMANS DÜZELTMESİ: İki Aşamalı Çarpışma Kontrolü ---
+        # 1. Aşama: Borular x'e göre sıralı (hepsi aynı noktada doğup aynı hızla ilerler);
+        # yalnızca kuşla yatayda örtüşenler incelenir, sağdakilere gelince döngü biter.
+        bird_left = self.bird.rect.left
+        bird_right = self.bird.rect.right
+        bird_top = self.bird.rect.top
         for p in self.pipes:
-            # 1. Aşama: Hızlı Rect çarpışma kontrolü
-            if self.bird.rect.colliderect(p.rect_upper) or self.bird.rect.colliderect(p.rect_lower):
-                # 2. Aşama: Sadece Rect'ler çarpışıyorsa yavaş ve hassas Mask kontrolü yap
-                offset_upper = (int(p.rect_upper.x - self.bird.rect.left), int(p.rect_upper.y - self.bird.rect.top))
-                if p.mask_upper and self.bird.mask.overlap(p.mask_upper, offset_upper):
-                    self.game_over = True
-                    return  # Çarpışma bulundu, döngüden çık
-
-                offset_lower = (int(p.rect_lower.x - self.bird.rect.left), int(p.rect_lower.y - self.bird.rect.top))
-                if p.mask_lower and self.bird.mask.overlap(p.mask_lower, offset_lower):
-                    self.game_over = True
-                    return  # Çarpışma bulundu, döngüden çık
\ No newline at end of file
+            px = int(p.x + pipe_shift)
+            if px >= bird_right:
+                break
+            if px + p.width <= bird_left:
+                continue
+            # 2. Aşama: sütun tablolarıyla piksel düzeyinde kesin kontrol
+            if self.collider.hits_pipe(bird_left, bird_top, px, p.width, p.gap_y, p.gap, self.WINDOW_HEIGHT):
+                self.game_over = True
+                return  # Çarpışma bulundu, döngüden çık
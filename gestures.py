@@ -0,0 +1,380 @@
+# gestures.py
+# Landmark'lardan vektörel özellik çıkarımı ve birbirinden bağımsız jest durum makineleri.
+# Aynı sınıflandırıcılar canlı akışta (HandTracker) ve kayıtlı izlerin üzerinde toplu olarak çalışır:
+#   python gestures.py oturum/trace.jsonl --pinch-trigger 0.55
+import argparse
+import json
+import time
+
+import numpy as np
+
+from frame_source import CAMERA_WIDTH, CAMERA_HEIGHT, read_trace
+from motion_filter import PREDICT_MAX_MS
+
+# --- DEĞİŞİKLİK: Tıklama hassasiyeti ayarları güncellendi ---
+# Orijinal ayarlarınıza geri dönüldü ve yanlış tıklamaları önlemek için
+# PINCH_TRIGGER_LEVEL değeri biraz artırıldı.
+
+PINCH_MULTIPLIER = 0.38
+PINCH_SMOOTH_ALPHA = 0.35
+# Tıklama eşiği 0.6'dan 0.75'e yükseltildi. Artık tıklama için parmaklarınızı daha fazla yaklaştırmanız gerek.
+PINCH_TRIGGER_LEVEL = 0.5
+# Bırakma eşiği de orantılı olarak artırıldı.
+PINCH_RELEASE_LEVEL = 0.6
+PINCH_DEBOUNCE_MS = 220
+# El görünmediğinde tıklama gücü kare başına bu oranla söner
+PINCH_DECAY = 0.90
+# Eşikler, gücün ölçülen gecikme kadar ileri tahmin edilmiş değeriyle karşılaştırılır
+PINCH_PREDICT = True
+# Tahmin için güç değişim hızının (1/ms) yumuşatma katsayısı
+PINCH_RATE_ALPHA = 0.5
+# Canlı kamerada ölçülen gecikme her karede oturum izine (lead_ms) yazılır; tekrar oynatma ve toplu
+# değerlendirme o değeri kullanır. Gecikmesi kayıtlı olmayan kaynaklarda (eski izler, video, resim
+# klasörü) bu sabit kullanılır, böylece aynı kareler makine hızından bağımsız olarak aynı jestleri verir.
+REPLAY_LEAD_MS = 30
+
+# Yumruk: en fazla bu kadar parmak açıksa
+PUNCH_MAX_EXTENDED = 1
+
+THUMB_TIP, INDEX_TIP, WRIST, MIDDLE_MCP = 4, 8, 0, 9
+FINGER_TIPS = np.array([8, 12, 16, 20])
+# Avuç merkezi: bilek + dört parmak kökü; parmak hareketinden (tutam, yumruk) az etkilenir
+PALM = np.array([0, 5, 9, 13, 17])
+
+# Çok oyunculu el ataması: bir karede avuç merkezinin gidebileceği en uzak mesafe (normalize)
+ASSIGN_MAX_JUMP = 0.25
+# Bu kadar süre görünmeyen oyuncunun eli bırakılır, yeni gelen el o oyuncuya atanabilir
+ASSIGN_LOST_MS = 800
+# Sağ/sol etiketi izle uyuşmazsa mesafeye eklenen ceza
+HANDEDNESS_PENALTY = 0.1
+
+# Her el için tek seferde hesaplanan özellikler (skaler ya da toplu dizi olarak)
+FEATURE_KEYS = ("pinch_strength", "pinch_dist", "hand_scale", "fingers_extended", "mid_x", "mid_y")
+
+
+def landmarks_to_array(hand_landmarks):
+    # MediaPipe landmark listesini bir kez (21, 3) diziye çevirir
+    return np.array([(p.x, p.y, p.z) for p in hand_landmarks.landmark], dtype=np.float32)
+
+
+def batch_features(hands, width=CAMERA_WIDTH, height=CAMERA_HEIGHT):
+    # hands: (..., 21, 3) normalize landmark'lar. Tüm özellikler piksel uzayında, vektörel.
+    hands = np.asarray(hands, dtype=np.float32)
+    px = hands[..., 0] * width
+    py = hands[..., 1] * height
+
+    hand_scale = np.maximum(1.0, np.hypot(px[..., MIDDLE_MCP] - px[..., WRIST], py[..., MIDDLE_MCP] - py[..., WRIST]))
+    pinch_dist = np.hypot(px[..., THUMB_TIP] - px[..., INDEX_TIP], py[..., THUMB_TIP] - py[..., INDEX_TIP])
+    thresh = np.maximum(1.0, hand_scale * PINCH_MULTIPLIER)
+    pinch_strength = np.clip(1.0 - pinch_dist / thresh, 0.0, 1.0)
+
+    # Parmak ucu, iki alt ekleminden yukarıdaysa parmak açık sayılır
+    extended = hands[..., FINGER_TIPS, 1] < hands[..., FINGER_TIPS - 2, 1]
+    return {
+        "pinch_strength": pinch_strength,
+        "pinch_dist": pinch_dist,
+        "hand_scale": hand_scale,
+        "fingers_extended": extended.sum(axis=-1),
+        "mid_x": (px[..., THUMB_TIP] + px[..., INDEX_TIP]) / 2,
+        "mid_y": (py[..., THUMB_TIP] + py[..., INDEX_TIP]) / 2,
+    }
+
+
+def hand_features(hands, width=CAMERA_WIDTH, height=CAMERA_HEIGHT):
+    # Canlı akış: karedeki tüm eller tek çağrıda, sonuç el başına bir dict
+    feats = {k: v.tolist() for k, v in batch_features(np.stack(hands), width, height).items()}
+    return [{k: col[i] for k, col in feats.items()} for i in range(len(hands))]
+
+
+class Gesture:
+    # Her jest kendi durumunu, histerezisini ve debounce süresini taşır.
+    # update(features | None, now_ms) -> bu karede olay tetiklendi mi
+    # lead_ms: ölçülen boru hattı gecikmesi; tahmin yapan jestler kullanır
+    lead_ms = 0.0
+
+    def reset(self):
+        raise NotImplementedError
+
+    def update(self, feats, now_ms):
+        raise NotImplementedError
+
+    def run_batch(self, feats, present, timestamps, leads=None):
+        # Kayıtlı bir iz üzerinde aynı durum makinesi; özellikler önceden toplu hesaplanmıştır.
+        # leads: kare başına tahmin gecikmesi (canlı akışta set_lead_ms ile verilen değer)
+        self.reset()
+        out = np.zeros(len(timestamps), dtype=bool)
+        columns = [(k, feats[k].tolist()) for k in FEATURE_KEYS]
+        present = present.tolist()
+        leads = leads.tolist() if leads is not None else None
+        for i, now_ms in enumerate(timestamps.tolist()):
+            frame_feats = {k: col[i] for k, col in columns} if present[i] else None
+            if leads is not None:
+                self.lead_ms = leads[i]
+            out[i] = self.update(frame_feats, now_ms)
+        return out
+
+
+class PinchGesture(Gesture):
+    # smoother=None: sabit alfalı EMA; ya da motion_filter.OneEuroFilter (hızlı kapanışta daha az gecikme)
+    def __init__(self, trigger=PINCH_TRIGGER_LEVEL, release=PINCH_RELEASE_LEVEL, debounce_ms=PINCH_DEBOUNCE_MS,
+                 alpha=PINCH_SMOOTH_ALPHA, decay=PINCH_DECAY, smoother=None, predict=PINCH_PREDICT):
+        self.trigger = trigger
+        self.release = release
+        self.debounce_ms = debounce_ms
+        self.alpha = alpha
+        self.decay = decay
+        self.smoother = smoother
+        self.predict = predict
+        self.reset()
+
+    def reset(self):
+        self.strength = 0.0
+        self.rate = 0.0
+        self.level = 0.0
+        self.active = False
+        self.last_trigger_ms = 0
+        self._last_ms = None
+        if self.smoother is not None:
+            self.smoother.reset()
+
+    def update(self, feats, now_ms):
+        prev = self.strength
+        if feats is None:
+            self.strength = max(0.0, prev * self.decay)
+            if self.smoother is not None and self.smoother.value is not None:
+                self.smoother.value = self.strength
+        elif self.smoother is None:
+            self.strength = self.alpha * feats["pinch_strength"] + (1 - self.alpha) * prev
+        else:
+            self.strength = min(1.0, max(0.0, self.smoother(feats["pinch_strength"], now_ms)))
+
+        # Yumuşatılmış gücün değişim hızı; eşik kararı gecikme kadar ileri tahminle verilir
+        if self._last_ms is not None and now_ms > self._last_ms:
+            self.rate += PINCH_RATE_ALPHA * ((self.strength - prev) / (now_ms - self._last_ms) - self.rate)
+        self._last_ms = now_ms
+        self.level = self.strength
+        if self.predict:
+            lead = min(self.lead_ms, PREDICT_MAX_MS)
+            self.level = min(1.0, max(0.0, self.strength + self.rate * lead))
+
+        if not self.active and self.level >= self.trigger:
+            self.active = True
+        elif self.active and self.level < self.release:
+            self.active = False
+
+        # Basılı tutulan tutam debounce aralığıyla tekrar tetikler
+        if self.active and (now_ms - self.last_trigger_ms) > self.debounce_ms:
+            self.last_trigger_ms = now_ms
+            return True
+        return False
+
+
+class PunchGesture(Gesture):
+    # Seviye jesti: yumruk görüldüğü sürece active True; hold_frames/release_frames ile titreşim bastırılır
+    def __init__(self, max_extended=PUNCH_MAX_EXTENDED, hold_frames=1, release_frames=1):
+        self.max_extended = max_extended
+        self.hold_frames = hold_frames
+        self.release_frames = release_frames
+        self.reset()
+
+    def reset(self):
+        self.active = False
+        self._count = 0
+
+    def update(self, feats, now_ms):
+        fist = feats is not None and feats["fingers_extended"] <= self.max_extended
+        if fist != self.active:
+            self._count += 1
+            if self._count >= (self.hold_frames if fist else self.release_frames):
+                self.active = fist
+                self._count = 0
+        else:
+            self._count = 0
+        return self.active
+
+
+class GestureRegistry:
+    # name -> (mantıksal el yuvası, jest). Yuvalar, eller başparmak x'ine göre sıralanarak atanır.
+    def __init__(self):
+        self._entries = {}
+
+    def register(self, name, gesture, slot):
+        self._entries[name] = (slot, gesture)
+        return gesture
+
+    def __getitem__(self, name):
+        return self._entries[name][1]
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def names(self):
+        return list(self._entries)
+
+    def reset(self):
+        for _, gesture in self._entries.values():
+            gesture.reset()
+
+    def set_lead_ms(self, lead_ms):
+        for _, gesture in self._entries.values():
+            gesture.lead_ms = lead_ms
+
+    def update(self, slot_feats, now_ms):
+        events = {}
+        for name, (slot, gesture) in self._entries.items():
+            feats = slot_feats[slot] if slot < len(slot_feats) else None
+            events[name] = gesture.update(feats, now_ms)
+        return events
+
+    def run_batch(self, feats, present, timestamps, leads=None):
+        # feats: her anahtar için (N, yuva) dizileri; present: (N, yuva); leads: (N,) ya da None
+        out = {}
+        for name, (slot, gesture) in self._entries.items():
+            slot_feats = {k: v[:, slot] for k, v in feats.items()}
+            out[name] = gesture.run_batch(slot_feats, present[:, slot], timestamps, leads)
+        return out
+
+
+def default_registry(**pinch_kwargs):
+    # Sol (0) el yumrukla kalkan, sağ (1) el tutamla zıplama
+    registry = GestureRegistry()
+    registry.register("punch", PunchGesture(), slot=0)
+    registry.register("pinch", PinchGesture(**pinch_kwargs), slot=1)
+    return registry
+
+
+def player_registry(**pinch_kwargs):
+    # Çok oyunculu: her oyuncu tek elle oynar; tutam zıplama/tıklama, yumruk kalkan
+    registry = GestureRegistry()
+    registry.register("punch", PunchGesture(), slot=0)
+    registry.register("pinch", PinchGesture(**pinch_kwargs), slot=0)
+    return registry
+
+
+class HandAssigner:
+    # Algılanan elleri oyunculara kareler arasında kararlı biçimde dağıtır. Her oyuncunun bir izi
+    # (avuç merkezi + sağ/sol etiketi) tutulur; eller izlere en yakın eşleşme sırasıyla bağlanır.
+    # İzi olmayan oyuncuya yeni bir el, ekrandaki kendi bölgesine en yakınsa verilir.
+    def __init__(self, players, max_jump=ASSIGN_MAX_JUMP, lost_ms=ASSIGN_LOST_MS,
+                 handedness_penalty=HANDEDNESS_PENALTY):
+        self.players = players
+        self.max_jump = max_jump
+        self.lost_ms = lost_ms
+        self.handedness_penalty = handedness_penalty
+        # Oyuncu p'nin bölgesi ekranın p. dikey şeridinin ortası
+        self.home_x = [(p + 0.5) / players for p in range(players)]
+        self.reset()
+
+    def reset(self):
+        self.centers = [None] * self.players
+        self.labels = [None] * self.players
+        self.last_seen_ms = [None] * self.players
+
+    def assign(self, hands, labels, now_ms):
+        # hands: (21, 3) diziler, labels: "Left"/"Right" (ya da boş); oyuncu başına el indeksi ya da None döner
+        owners = [None] * self.players
+        for p, seen in enumerate(self.last_seen_ms):
+            if seen is not None and now_ms - seen > self.lost_ms:
+                self.centers[p] = self.labels[p] = self.last_seen_ms[p] = None
+        if not hands:
+            return owners
+
+        centers = np.stack(hands)[:, PALM, :2].mean(axis=1)
+        labels = labels if labels and len(labels) == len(hands) else [None] * len(hands)
+
+        pairs = []
+        for p, center in enumerate(self.centers):
+            if center is None:
+                continue
+            dists = np.hypot(*(centers - center).T).tolist()
+            for i, dist in enumerate(dists):
+                if labels[i] is not None and self.labels[p] is not None and labels[i] != self.labels[p]:
+                    dist += self.handedness_penalty
+                if dist <= self.max_jump:
+                    pairs.append((dist, p, i))
+        pairs.sort()
+        taken = set()
+        for _, p, i in pairs:
+            if owners[p] is None and i not in taken:
+                owners[p] = i
+                taken.add(i)
+
+        # Kısa süre kaybolan oyuncunun yeri ayrılmış kalır; yalnızca izi olmayanlar yeni el alır
+        for i in range(len(hands)):
+            if i in taken:
+                continue
+            free = [p for p in range(self.players) if owners[p] is None and self.centers[p] is None]
+            if not free:
+                break
+            p = min(free, key=lambda p: abs(float(centers[i, 0]) - self.home_x[p]))
+            owners[p] = i
+            taken.add(i)
+
+        for p, i in enumerate(owners):
+            if i is not None:
+                self.centers[p] = centers[i]
+                self.labels[p] = labels[i]
+                self.last_seen_ms[p] = now_ms
+        return owners
+
+
+def assign_slots(hands, slots=2):
+    # Elleri başparmak ucunun x'ine göre soldan sağa mantıksal yuvalara yerleştirir
+    return sorted(hands, key=lambda pts: pts[THUMB_TIP][0])[:slots]
+
+
+def trace_to_arrays(records, slots=2):
+    # trace.jsonl kayıtları -> timestamps (N,), hands (N, yuva, 21, 3), present (N, yuva)
+    n = len(records)
+    timestamps = np.array([r["now_ms"] for r in records], dtype=np.int64)
+    hands = np.zeros((n, slots, 21, 3), dtype=np.float32)
+    present = np.zeros((n, slots), dtype=bool)
+    for i, rec in enumerate(records):
+        for slot, pts in enumerate(assign_slots(rec.get("hands") or [], slots)):
+            hands[i, slot] = pts
+            present[i, slot] = True
+    return timestamps, hands, present
+
+
+def trace_leads(records, lead_ms=None):
+    # Kare başına tahmin gecikmesi: lead_ms verilirse her karede o, yoksa kayıttaki değer (canlı oyunla aynı)
+    if lead_ms is not None:
+        return np.full(len(records), float(lead_ms))
+    return np.array([r.get("lead_ms", REPLAY_LEAD_MS) for r in records], dtype=np.float64)
+
+
+def trace_events(records, registry=None, lead_ms=None):
+    # Kayıtlı izin her karesi için jest olayları: isim -> (N,) bool
+    registry = registry or default_registry()
+    timestamps, hands, present = trace_to_arrays(records)
+    return registry.run_batch(batch_features(hands), present, timestamps, trace_leads(records, lead_ms))
+
+
+def evaluate_trace(path, registry=None, lead_ms=None):
+    records = read_trace(path)
+    start = time.perf_counter()
+    events = trace_events(records, registry, lead_ms)
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": len(records),
+        "frames_per_s": int(len(records) / elapsed) if elapsed > 0 else 0,
+        **{f"{name}_frames": int(ev.sum()) for name, ev in events.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jest sınıflandırıcılarını kayıtlı bir iz üzerinde çalıştırır.")
+    parser.add_argument("trace", help="trace.jsonl")
+    parser.add_argument("--pinch-trigger", type=float, default=PINCH_TRIGGER_LEVEL)
+    parser.add_argument("--pinch-release", type=float, default=PINCH_RELEASE_LEVEL)
+    parser.add_argument("--pinch-debounce", type=float, default=PINCH_DEBOUNCE_MS)
+    parser.add_argument("--lead-ms", type=float,
+                        help="her karede bu tahmin gecikmesi (varsayılan: kayıttaki kare gecikmesi, canlı oyunla aynı)")
+    args = parser.parse_args()
+    registry = default_registry(trigger=args.pinch_trigger, release=args.pinch_release,
+                                debounce_ms=args.pinch_debounce)
+    print(json.dumps(evaluate_trace(args.trace, registry, args.lead_ms), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# governor.py
+# Kare süresi bütçesini korumak için kalite seviyeleri arasında gezinen yönetici.
+# Ölçülen süre, kare boyunca yapılan iştir (clock.tick'in beklemesi hariç). Süre bütçeyi
+# bir süre aşarsa bir seviye düşülür; uzun süre rahatça altında kalırsa bir seviye geri çıkılır.
+# Düşme ve toparlanma eşikleri ile bekleme süreleri farklıdır (histerezis), seviye gidip gelmez.
+
+# Seviye 0 en yüksek kalitedir.
+# tracker_tier: roi_inference.QUALITY_TIERS (çıkarım çözünürlüğü ve atlama oranı);
+# preview_fps / preview_scale: kamera önizlemesinin hızı ve boyutu; smooth: önizleme küçültmesi
+# alan ortalamalı (smoothscale karşılığı) ya da en yakın komşu (scale karşılığı);
+# effects: yarı saydam kalkan halesi ve önizlemedeki landmark çizimi.
+QUALITY_LEVELS = (
+    {"name": "high", "tracker_tier": "full", "preview_fps": 30, "preview_scale": 1.0, "smooth": True,
+     "effects": True},
+    {"name": "medium", "tracker_tier": "balanced", "preview_fps": 20, "preview_scale": 1.0, "smooth": True,
+     "effects": True},
+    {"name": "low", "tracker_tier": "fast", "preview_fps": 15, "preview_scale": 0.75, "smooth": False,
+     "effects": False},
+    {"name": "minimal", "tracker_tier": "eco", "preview_fps": 10, "preview_scale": 0.5, "smooth": False,
+     "effects": False},
+)
+
+# Bütçenin bu oranını aşan ortalama iş süresi "yavaş" sayılır; bu oranın altı "rahat"
+DEGRADE_AT = 0.85
+RECOVER_AT = 0.55
+# Düşmek için kısa, geri çıkmak için uzun süre (kare) koşulun sürmesi gerekir
+DEGRADE_FRAMES = 30
+RECOVER_FRAMES = 240
+# Her değişiklikten sonra ölçümün oturması için beklenen kare sayısı
+HOLD_FRAMES = 60
+FRAME_MS_ALPHA = 0.1
+
+
+class QualityGovernor:
+    def __init__(self, target_fps=60, levels=QUALITY_LEVELS, level=0, enabled=True):
+        self.budget_ms = 1000 / target_fps
+        self.levels = levels
+        self.level = level
+        self.enabled = enabled
+        self.frame_ms = 0.0  # iş süresinin EMA'sı
+        self.changes = 0
+        self._slow = 0
+        self._fast = 0
+        self._hold = HOLD_FRAMES
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    @property
+    def name(self):
+        return self.current["name"]
+
+    def update(self, work_ms):
+        # Her karenin sonunda çağrılır; seviye değiştiyse True döner
+        self.frame_ms += FRAME_MS_ALPHA * (work_ms - self.frame_ms)
+        if not self.enabled:
+            return False
+        if self._hold > 0:
+            self._hold -= 1
+            return False
+
+        if self.frame_ms > self.budget_ms * DEGRADE_AT:
+            self._slow += 1
+            self._fast = 0
+        elif self.frame_ms < self.budget_ms * RECOVER_AT:
+            self._fast += 1
+            self._slow = 0
+        else:
+            self._slow = self._fast = 0
+
+        if self._slow >= DEGRADE_FRAMES and self.level < len(self.levels) - 1:
+            return self.set_level(self.level + 1)
+        if self._fast >= RECOVER_FRAMES and self.level > 0:
+            return self.set_level(self.level - 1)
+        return False
+
+    def set_level(self, level):
+        level = min(max(0, level), len(self.levels) - 1)
+        self._slow = self._fast = 0
+        self._hold = HOLD_FRAMES
+        if level == self.level:
+            return False
+        self.level = level
+        self.changes += 1
+        return True
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "name": self.name,
+            "frame_ms": round(self.frame_ms, 2),
+            "budget_ms": round(self.budget_ms, 2),
+            "changes": self.changes,
+        }
@@ -1,47 +1,88 @@
 # hand_tracker.py
+import time
+
 import cv2
 import mediapipe as mp
-import math
-
-# --- DEĞİŞİKLİK: Tıklama hassasiyeti ayarları güncellendi ---
-# Orijinal ayarlarınıza geri dönüldü ve yanlış tıklamaları önlemek için
-# PINCH_TRIGGER_LEVEL değeri biraz artırıldı.
+import numpy as np
 
-PINCH_MULTIPLIER = 0.38
-PINCH_SMOOTH_ALPHA = 0.35
-# Tıklama eşiği 0.6'dan 0.75'e yükseltildi. Artık tıklama için parmaklarınızı daha fazla yaklaştırmanız gerek.
-PINCH_TRIGGER_LEVEL = 0.5
-# Bırakma eşiği de orantılı olarak artırıldı.
-PINCH_RELEASE_LEVEL = 0.6
-PINCH_DEBOUNCE_MS = 220
+from frame_source import open_source, PacedSource, SessionRecorder, CAMERA_WIDTH, CAMERA_HEIGHT
+from gestures import (landmarks_to_array, hand_features, assign_slots, default_registry, player_registry,
+                      HandAssigner, REPLAY_LEAD_MS)
+from roi_inference import AdaptiveInference, DEFAULT_TIER
 
-# Orijinal, yüksek çözünürlüklü kamera ayarlarına geri dönüldü.
-CAMERA_WIDTH = 640
-CAMERA_HEIGHT = 480
+LATENCY_ALPHA = 0.1
 
 
 class HandTracker:
-    def __init__(self, window_width, window_height):
+    # players > 1: her oyuncu tek elle oynar; eller HandAssigner ile oyunculara kalıcı olarak
+    # dağıtılır ve tek çıkarım sonucu tüm oyuncuların jestlerini besler.
+    # clock verilirse kayıtlı kaynaklar bu saatin ekseninde kayıt hızında oynatılır (bkz. PacedSource);
+    # replay.py gibi toplu araçlar clock vermez ve kareleri beklemeden okur.
+    def __init__(self, window_width, window_height, source=None, record_dir=None, quality=DEFAULT_TIER,
+                 players=1, clock=None):
         self.WINDOW_WIDTH = window_width
         self.WINDOW_HEIGHT = window_height
+        self.players = players
 
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+        # Kare kaynağı: canlı kamera (varsayılan), video, resim klasörü ya da kayıtlı landmark izi
+        self.source = open_source(source)
+        self.paced = clock is not None and not self.source.live
+        if self.paced:
+            self.source = PacedSource(self.source, clock)
+        # Kayıtlı kaynak sona erdi (hata değil); process_frame bundan sonra (None, {}) döner
+        self.exhausted = False
+        self.recorder = SessionRecorder(record_dir) if record_dir else None
 
         self.mp_hands = mp.solutions.hands
-        # Orijinal, daha hassas olan MediaPipe model ayarlarına geri dönüldü.
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.6,
-            min_tracking_confidence=0.6
-        )
-        self.mp_draw = mp.solutions.drawing_utils
-
-        self.pinch_state = [False, False]
-        self.pinch_ema = [0.0, 0.0]
-        self.last_pinch_time = 0
+        # Landmark izi oynatılırken MediaPipe modeli hiç kurulmaz.
+        self.hands = None
+        self.roi_hands = None
+        self.inference = None
+        if not self.source.provides_landmarks:
+            # Orijinal, daha hassas olan MediaPipe model ayarlarına geri dönüldü.
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=max(2, players),
+                min_detection_confidence=0.6,
+                min_tracking_confidence=0.6
+            )
+            # Kırpıntılar ayrı bir model örneğinde izlenir; tam kare modelinin takibi bozulmaz
+            self.roi_hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=max(2, players),
+                min_detection_confidence=0.6,
+                min_tracking_confidence=0.6
+            )
+            self.inference = AdaptiveInference(self.hands, self.roi_hands, quality)
+
+        # Her jest kendi durum makinesini taşır; yenileri buraya kaydedilebilir
+        self.gestures = default_registry()
+        self.assigner = HandAssigner(players) if players > 1 else None
+        self.player_gestures = [player_registry() for _ in range(players)] if players > 1 else []
+        # Kare zaman damgasından sonucun hazır olmasına kadar ölçülen gecikme (EMA, ms);
+        # canlı kamerada jestler eşik kararını bu kadar ileri tahminle verir (bkz. _lead_ms)
+        self.latency_ms = 0.0
+        self.last_now_ms = None
+
+    def warm_up(self):
+        # İlk çıkarım modeli yükler ve grafiği hazırlar (yüzlerce ms); oyun başlamadan
+        # arka planda boş bir kareyle yapılır ki ilk gerçek kare gecikmesin.
+        if self.hands is None:
+            return
+        blank = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+        self.hands.process(blank)
+        self.roi_hands.process(blank)
+
+    def set_quality(self, tier):
+        if self.inference is not None:
+            self.inference.set_tier(tier)
+
+    def _lead_ms(self):
+        # Jest tahmini: canlı kamerada ölçülen gecikme (oturum kaydına da yazılır); kayıtlı kaynakta
+        # kaydın kendi değeri, yoksa sabit. Tekrar oynatma böylece makine hızına bağlı olmaz.
+        if self.source.live:
+            return round(self.latency_ms, 2)
+        return REPLAY_LEAD_MS if self.source.lead_ms is None else self.source.lead_ms
 
     def _map_point_camera_to_screen(self, px, py):
         sx = int(px / CAMERA_WIDTH * self.WINDOW_WIDTH)
@@ -49,89 +90,108 @@ class HandTracker:
         return sx, sy
 
     def process_frame(self, now_ms):
-        ret, frame = self.cap.read()
+        t0 = time.perf_counter()
+        ret, raw_frame = self.source.read()
+        t1 = time.perf_counter()
         if not ret:
-            print('Kamera açılamadı.')
+            if self.source.live:
+                print('Kamera açılamadı.')
+            else:
+                self.exhausted = True
             return None, {}
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb)
+        # Tekrar oynatmada zaman, kaynağın kayıtlı now_ms değerinden gelir (kayıt hızında
+        # oynatılan kaynakta clock eksenine taşınmış hali)
+        if now_ms is None:
+            now_ms = self.source.timestamp_ms or 0
+        self.last_now_ms = now_ms
+
+        # Çıkarım için üretilen aynalanmış RGB kare önizlemede de aynen kullanılır;
+        # landmark'lar tam çözünürlükte çizilmez, önizleme boyutunda UI tarafında çizilir.
+        if self.source.provides_landmarks:
+            frame = raw_frame
+            results = self.source.results
+        else:
+            frame = cv2.cvtColor(cv2.flip(raw_frame, 1), cv2.COLOR_BGR2RGB)
+            results = self.inference.process(frame)
+        t2 = time.perf_counter()
 
-        punch_detected = False
-        cursor_screen_pos = None
+        h, w = frame.shape[:2]
+        if self.assigner is not None:
+            return frame, self._process_players(results, w, h, now_ms, raw_frame, t0, t1, t2)
 
-        hands_detected = results.multi_hand_landmarks
-        if hands_detected:
-            hand_entries = []
-            h, w, _ = frame.shape
-            for handLms in hands_detected:
-                lm = handLms.landmark
-                thumb_x = lm[4].x * w
-                hand_entries.append((thumb_x, handLms))
-            hand_entries.sort(key=lambda e: e[0])
-
-            hand_map = [None, None]
-            for i, (_, handLms) in enumerate(hand_entries):
-                if i == 0:
-                    hand_map[0] = handLms
-                elif i == 1:
-                    hand_map[1] = handLms
-
-            for logical_idx in [0, 1]:
-                handLms = hand_map[logical_idx]
-                if handLms is None:
-                    self.pinch_ema[logical_idx] = max(0.0, self.pinch_ema[logical_idx] * 0.90)
-                    continue
-
-                self.mp_draw.draw_landmarks(frame, handLms, self.mp_hands.HAND_CONNECTIONS)
-                lm = handLms.landmark
-
-                tx, ty = int(lm[4].x * w), int(lm[4].y * h)
-                ix, iy = int(lm[8].x * w), int(lm[8].y * h)
-                mid_x, mid_y = int((tx + ix) / 2), int((ty + iy) / 2)
-                cursor_screen_pos = self._map_point_camera_to_screen(mid_x, mid_y)
-
-                cv2.circle(frame, (tx, ty), 12, (0, 200, 0), -1)
-                cv2.circle(frame, (ix, iy), 12, (0, 200, 0), -1)
-                cv2.circle(frame, (mid_x, mid_y), 8, (255, 255, 255), 2)
-
-                wx, wy = int(lm[0].x * w), int(lm[0].y * h)
-                mx, my = int(lm[9].x * w), int(lm[9].y * h)
-                hand_size_px = max(1.0, math.hypot(mx - wx, my - wy))
-                pinch_dist_px = math.hypot(tx - ix, ty - iy)
-                thresh_px = hand_size_px * PINCH_MULTIPLIER
-                raw_strength = max(0.0, min(1.0, 1.0 - (pinch_dist_px / max(1.0, thresh_px))))
-                self.pinch_ema[logical_idx] = PINCH_SMOOTH_ALPHA * raw_strength + (1 - PINCH_SMOOTH_ALPHA) * \
-                                              self.pinch_ema[logical_idx]
-
-                fingers_extended = sum([lm[i].y < lm[i - 2].y for i in [8, 12, 16, 20]])
-
-                if logical_idx == 0:
-                    if fingers_extended <= 1:
-                        punch_detected = True
-                else:
-                    if not self.pinch_state[1] and self.pinch_ema[1] >= PINCH_TRIGGER_LEVEL:
-                        self.pinch_state[1] = True
-                    elif self.pinch_state[1] and self.pinch_ema[1] < PINCH_RELEASE_LEVEL:
-                        self.pinch_state[1] = False
-        else:
-            self.pinch_ema[0] = max(0.0, self.pinch_ema[0] * 0.90)
-            self.pinch_ema[1] = max(0.0, self.pinch_ema[1] * 0.90)
+        # Her el bir kez (21, 3) diziye çevrilir, sonra başparmak x'ine göre yuvalara dağıtılır
+        hands = assign_slots([landmarks_to_array(hl) for hl in results.multi_hand_landmarks or []])
+        slot_feats = hand_features(hands, w, h) if hands else []
+        lead_ms = self._lead_ms()
+        self.gestures.set_lead_ms(lead_ms)
+        events = self.gestures.update(slot_feats, now_ms)
 
-        pinch_triggered = False
-        if self.pinch_state[1] and (now_ms - self.last_pinch_time) > PINCH_DEBOUNCE_MS:
-            pinch_triggered = True
-            self.last_pinch_time = now_ms
+        cursor_screen_pos = None
+        if slot_feats:
+            feats = slot_feats[-1]
+            cursor_screen_pos = self._map_point_camera_to_screen(feats["mid_x"], feats["mid_y"])
+        t3 = time.perf_counter()
+        self.latency_ms += LATENCY_ALPHA * ((t3 - t0) * 1000 - self.latency_ms)
+
+        if self.recorder is not None:
+            self.recorder.record(now_ms, raw_frame, results, lead_ms)
+
+        hand_data = self._event_data(events, self.gestures, cursor_screen_pos, now_ms)
+        hand_data.update({
+            "landmarks": [pts[:, :2] for pts in hands],
+            "frame_time_ms": now_ms,
+            # Aşama süreleri (ms): kare okuma, çıkarım, jest hesabı; profiler bunları ana döngüde toplar
+            "stage_ms": ((t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000),
+        })
+        return frame, hand_data
 
-        hand_data = {
-            "punch_detected": punch_detected,
-            "pinch_triggered": pinch_triggered,
+    def _process_players(self, results, w, h, now_ms, raw_frame, t0, t1, t2):
+        hands = [landmarks_to_array(hl) for hl in results.multi_hand_landmarks or []]
+        labels = [c.classification[0].label for c in results.multi_handedness or []]
+        owners = self.assigner.assign(hands, labels, now_ms)
+        feats = hand_features(hands, w, h) if hands else []
+
+        lead_ms = self._lead_ms()
+        players = []
+        for registry, index in zip(self.player_gestures, owners):
+            registry.set_lead_ms(lead_ms)
+            player_feats = [feats[index]] if index is not None else []
+            events = registry.update(player_feats, now_ms)
+            cursor_screen_pos = None
+            if player_feats:
+                cursor_screen_pos = self._map_point_camera_to_screen(player_feats[0]["mid_x"],
+                                                                     player_feats[0]["mid_y"])
+            players.append(self._event_data(events, registry, cursor_screen_pos, now_ms))
+        t3 = time.perf_counter()
+        self.latency_ms += LATENCY_ALPHA * ((t3 - t0) * 1000 - self.latency_ms)
+
+        if self.recorder is not None:
+            self.recorder.record(now_ms, raw_frame, results, lead_ms)
+
+        return {
+            "players": players,
+            "landmarks": [pts[:, :2] for pts in hands],
+            "frame_time_ms": now_ms,
+            "stage_ms": ((t1 - t0) * 1000, (t2 - t1) * 1000, (t3 - t2) * 1000),
+        }
+
+    @staticmethod
+    def _event_data(events, registry, cursor_screen_pos, now_ms):
+        return {
+            "punch_detected": events["punch"],
+            "pinch_triggered": events["pinch"],
+            # Olayın ait olduğu kameranın kare zaman damgası: GameState zıplamayı o ana uygular
+            "pinch_time_ms": now_ms if events["pinch"] else None,
+            "punch_time_ms": now_ms if events["punch"] else None,
             "cursor_pos": cursor_screen_pos,
-            "pinch_strength": self.pinch_ema[1]
+            "pinch_strength": registry["pinch"].strength,
         }
-        return frame, hand_data
 
     def close(self):
-        self.cap.release()
-        self.hands.close()
\ No newline at end of file
+        self.source.release()
+        if self.hands is not None:
+            self.hands.close()
+            self.roi_hands.close()
+        if self.recorder is not None:
+            self.recorder.close()
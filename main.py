@@ -1,75 +1,207 @@
 # main.py
 import pygame
 import sys
-from game_state import GameState, SHIELD_DURATION_MS, SHIELD_COOLDOWN_MS
-from hand_tracker import HandTracker
+import time
+from game_state import GameState
+from governor import QualityGovernor
+from profiler import StageProfiler, TRACKER_STAGES
+from telemetry import Telemetry
+from tracker_pipeline import TrackerPipeline, player_views
 from ui_manager import UIManager
+from video_recorder import VideoRecorder
 
 # Ayarlar
 WINDOW_WIDTH, WINDOW_HEIGHT = 1440, 960
 FPS = 60
+# El izleyici arka planda çalışır: "thread" ya da "process" (paylaşılan bellek)
+TRACKER_BACKEND = "thread"
+# Kare kaynağı: None (kamera), "camera:N", video dosyası, resim klasörü ya da kayıtlı oturum;
+# kayıtlar kayıt hızında oynatılır ve bitince oyun kapanır
+CAMERA_SOURCE = None
+# Bir klasör verilirse oturumun kareleri ve landmark'ları replay.py için kaydedilir
+RECORD_SESSION_DIR = None
+# Yalnızca değişen bölgeleri yeniden çiz ve ekrana gönder (düşük güçlü ekranlar için)
+DIRTY_RECT_RENDERING = True
+# Kamera önizlemesinin güncellenme hızı; 0 önizlemeyi tamamen kapatır
+CAMERA_PREVIEW_FPS = 30
+# Aşama süreleri ölçümü ve ekran üstü tablo (oyunda F3 ile açılıp kapanır)
+PROFILER_ENABLED = False
+# Bir dosya verilirse çıkışta son ölçümler CSV ya da .jsonl olarak yazılır
+PROFILE_EXPORT_PATH = None
+# Ölçeklenmiş görsellerin disk önbelleği (None: önbellek yok)
+ASSET_CACHE_DIR = ".asset_cache"
+# Oyuncu sayısı: 1'den fazlaysa ekran bölünür, her oyuncu tek elle (tutam: zıplama, yumruk: kalkan)
+# kendi oyununu oynar; tüm oyuncular aynı kamera ve aynı el takibi çıkarımını paylaşır
+PLAYERS = 1
+# Klavye yedeği: oyuncu başına zıplama tuşu
+PLAYER_JUMP_KEYS = (pygame.K_SPACE, pygame.K_RETURN, pygame.K_UP, pygame.K_w)
+# Pencere açmadan çalış (sunucuda; SDL dummy sürücüsü, ekran dışı yüzeye çizim)
+HEADLESS = False
+# Bu kadar saniye sonra çık (None: pencere kapatılana ya da kaynak bitene kadar)
+RUN_SECONDS = None
+# Bir dosya verilirse oyun görüntüsü arka planda videoya kodlanır (ör. "oturum.mp4")
+RECORD_VIDEO_PATH = None
+RECORD_VIDEO_FPS = 30
+# Kodlayıcı yetişemezse: "drop" kareyi atlar, "block" kısa süre bekler (bkz. video_recorder)
+RECORD_VIDEO_POLICY = "drop"
+# Oturum, oyun ve jest olaylarının SQLite kaydı; kiosk başına en yüksek skor da burada tutulur (None: kapalı)
+TELEMETRY_DB = "telemetry.sqlite3"
+# Kiosk adı (None: bilgisayar adı)
+KIOSK_ID = None
+# Kare süresi FPS bütçesini aşarsa kaliteyi (çıkarım, önizleme, efektler) kademeli düşür, rahatlayınca geri al
+ADAPTIVE_QUALITY = True
+# Oyunları ileriye bakan planlayıcı oynar (dayanıklılık testi, vitrin modu); el jestleri yok sayılır.
+# Planlayıcının skorları kiosk rekoru olmasın diye oyun olayları telemetriye yazılmaz.
+AUTOPILOT = False
+# Oyuncu başına, kare başına planlama süresi
+AUTOPILOT_BUDGET_MS = 2.0
+
+
+def apply_player_input(game, view, player_data):
+    # Bir oyuncunun tutam/yumruk girdisi; el takibinden ya da otomatik pilottan aynı biçimde gelir
+    # Buton tıklamaları
+    if player_data["pinch_triggered"]:
+        cursor_pos = player_data["cursor_pos"]
+        if cursor_pos:
+            if not game.game_started and view.start_button.collidepoint(cursor_pos):
+                game.start_new_game()
+            elif game.game_over and view.restart_button.collidepoint(cursor_pos):
+                game.start_new_game()
+            # Oyun içi zıplama: jestin yapıldığı kare anına geri sarılarak uygulanır
+            elif game.game_started and not game.game_over:
+                game.jump(player_data["pinch_time_ms"])
+
+    # Kalkan aktivasyonu
+    if player_data["punch_detected"] and game.game_started and not game.game_over:
+        game.try_activate_shield()
 
 
 def main():
     # Sınıfları başlat
-    ui = UIManager(WINDOW_WIDTH, WINDOW_HEIGHT)
-    game = GameState(ui.bird_img, WINDOW_WIDTH, WINDOW_HEIGHT)
-    tracker = HandTracker(WINDOW_WIDTH, WINDOW_HEIGHT)
+    profiler = StageProfiler(enabled=PROFILER_ENABLED)
+    ui = UIManager(WINDOW_WIDTH, WINDOW_HEIGHT, dirty_rects=DIRTY_RECT_RENDERING,
+                   preview_fps=CAMERA_PREVIEW_FPS, profiler=profiler, asset_cache_dir=ASSET_CACHE_DIR,
+                   players=PLAYERS, headless=HEADLESS)
+    telemetry = Telemetry(TELEMETRY_DB, kiosk=KIOSK_ID, players=PLAYERS) if TELEMETRY_DB else None
+    listen = telemetry is not None and not AUTOPILOT
+    games = [GameState(ui.bird_img, *ui.view_size, on_event=telemetry.game_listener(i) if listen else None)
+             for i in range(PLAYERS)]
+    if telemetry is not None:
+        for game in games:
+            game.max_score = telemetry.high_score
+    # Kamera ve model arka planda açılır; pencere hemen gelir, hazır olana kadar SPACE ile oynanır
+    tracker = TrackerPipeline(WINDOW_WIDTH, WINDOW_HEIGHT, backend=TRACKER_BACKEND,
+                              source=CAMERA_SOURCE, record_dir=RECORD_SESSION_DIR, players=PLAYERS)
+    ui.set_status("El takibi yükleniyor... (SPACE ile oynayabilirsin)")
+    recorder = None
+    if RECORD_VIDEO_PATH:
+        recorder = VideoRecorder(RECORD_VIDEO_PATH, (WINDOW_WIDTH, WINDOW_HEIGHT), fps=RECORD_VIDEO_FPS,
+                                 policy=RECORD_VIDEO_POLICY)
+    autopilots = None
+    if AUTOPILOT:
+        from autopilot import Autopilot
+        autopilots = [Autopilot(game, budget_ms=AUTOPILOT_BUDGET_MS, seed=i) for i, game in enumerate(games)]
+    governor = QualityGovernor(target_fps=FPS, enabled=ADAPTIVE_QUALITY)
+    ui.set_quality(governor.current)
     clock = pygame.time.Clock()
+    last_seq = tracker.seq
 
     running = True
     while running:
-        now_ms = pygame.time.get_ticks()
+        profiler.begin_frame()
+        frame_start = time.perf_counter()
 
-        # El hareketlerini işle
-        cam_frame, hand_data = tracker.process_frame(now_ms)
-        if cam_frame is None:
+        # El hareketlerini işle: en son sonucu beklemeden al
+        cam_frame, hand_data = tracker.poll()
+        if tracker.failed:
             running = False
             continue
+        # Kayıtlı kaynak bittiyse son sonuç bu karede işlenir ve oyun kapanır
+        if tracker.exhausted:
+            running = False
 
         hand_data["frame"] = cam_frame
+        if ui.status and tracker.ready:
+            ui.set_status(None)
+        new_result = tracker.seq != last_seq
+        last_seq = tracker.seq
+        if new_result and "stage_ms" in hand_data:
+            for stage, ms in zip(TRACKER_STAGES, hand_data["stage_ms"]):
+                profiler.record(stage, ms)
+        profiler.lap("poll")
 
         # Pygame olaylarını işle
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                ui.invalidate()
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
+                if event.key in PLAYER_JUMP_KEYS[:PLAYERS]:
+                    game = games[PLAYER_JUMP_KEYS.index(event.key)]
                     if not game.game_started or game.game_over:
                         game.start_new_game()
                     else:
-                        game.bird.jump()
-
-        # El hareketi girdilerini işle
-        # Buton tıklamaları
-        if hand_data["pinch_triggered"]:
-            cursor_pos = hand_data["cursor_pos"]
-            if cursor_pos:
-                if not game.game_started and ui.start_button.collidepoint(cursor_pos):
-                    game.start_new_game()
-                elif game.game_over and ui.restart_button.collidepoint(cursor_pos):
-                    game.start_new_game()
-                # Oyun içi zıplama
-                elif game.game_started and not game.game_over:
-                    game.bird.jump()
-
-        # Kalkan aktivasyonu
-        if hand_data["punch_detected"] and game.game_started and not game.game_over:
-            if game.shield_charges > 0 and now_ms - game.last_shield_time >= SHIELD_COOLDOWN_MS:
-                game.shield_charges -= 1
-                game.bird.shield_active = True
-                game.bird.shield_end_time = now_ms + SHIELD_DURATION_MS
-                game.last_shield_time = now_ms
-
-        # Oyun mantığını güncelle
-        game.update_game_logic()
-
-        # Her şeyi ekrana çiz
-        ui.draw_all(game, hand_data, now_ms)
+                        game.jump()
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+        profiler.lap("events")
+
+        # El hareketi girdilerini işle (oyuncu başına)
+        views = player_views(hand_data)
+        for i, (game, view, player_data) in enumerate(zip(games, ui.views, views)):
+            if autopilots is not None:
+                player_data = autopilots[i].player_input(view)
+            elif telemetry is not None:
+                telemetry.log_gestures(player_data, i)
+            apply_player_input(game, view, player_data)
+
+            # Oyun mantığını güncelle
+            game.update_game_logic()
+        profiler.lap("update")
+
+        # Her şeyi ekrana çiz (zamanlayıcılar her oyunun simülasyon saatine göre)
+        ui.draw_all(games, hand_data)
+
+        # Kameranın kareyi yakaladığı andan ekrana gönderildiği ana kadar geçen süre
+        if new_result and profiler.enabled:
+            photon_ms = pygame.time.get_ticks() - hand_data["frame_time_ms"]
+            profiler.record("frame_to_photon", photon_ms)
+            if any(v["pinch_triggered"] or v["punch_detected"] for v in views):
+                profiler.record("gesture_to_photon", photon_ms)
+
+        # Yalnızca bu karede ekrana gönderilen bölgeler kopyalanır
+        if recorder is not None:
+            recorder.submit(ui.screen, ui.updated_rects, pygame.time.get_ticks())
+        profiler.lap("record")
+
+        if RUN_SECONDS is not None and pygame.time.get_ticks() >= RUN_SECONDS * 1000:
+            running = False
+
+        # Kare bütçesi bekleme hariç iş süresine göre korunur
+        if governor.update((time.perf_counter() - frame_start) * 1000):
+            level = governor.current
+            ui.set_quality(level)
+            tracker.set_quality(level["tracker_tier"])
+            print(f"Kalite seviyesi: {level['name']} ({governor.frame_ms:.1f} ms / {governor.budget_ms:.1f} ms)")
+            if telemetry is not None:
+                telemetry.log("quality", governor.level, pygame.time.get_ticks())
 
         clock.tick(FPS)
+        profiler.lap("tick")
+        profiler.end_frame()
 
     # Temizlik
+    if PROFILE_EXPORT_PATH:
+        profiler.export(PROFILE_EXPORT_PATH)
+    if autopilots is not None:
+        for i, autopilot in enumerate(autopilots):
+            print(f"Otomatik pilot {i + 1}: {autopilot.stats()}")
+    if recorder is not None:
+        recorder.close()
+        print(recorder.stats())
+    if telemetry is not None:
+        telemetry.close()
     tracker.close()
     pygame.quit()
     sys.exit()
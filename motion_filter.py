@@ -0,0 +1,65 @@
+# motion_filter.py
+# One-Euro filtresi (Casiez vd.): yavaş harekette güçlü yumuşatma (titreşim yok),
+# hızlı harekette kesim frekansı yükselir (gecikme yok). Filtrelenmiş türev,
+# sinyali ölçülen boru hattı gecikmesi kadar ileri tahmin etmek için de kullanılır.
+import math
+
+# İmleç ekran pikseliyle çalışır: beta, px/s cinsinden hıza göre kesim artışıdır
+CURSOR_FILTER = {"min_cutoff": 1.2, "beta": 0.004, "d_cutoff": 1.0}
+# Tahmin en fazla bu kadar ileri yapılır; daha uzun gecikmede ileri tahmin aşırı salınır
+PREDICT_MAX_MS = 100
+
+
+def _smoothing(cutoff_hz, dt_s):
+    tau = 1.0 / (2 * math.pi * cutoff_hz)
+    return 1.0 / (1.0 + tau / dt_s)
+
+
+class OneEuroFilter:
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self, value=None):
+        self.value = value
+        self.deriv = 0.0  # birim / s
+        self._t_ms = None
+
+    def __call__(self, x, t_ms):
+        if self.value is None or self._t_ms is None:
+            self.value = x
+            self._t_ms = t_ms
+            return x
+        dt_s = max(1e-3, (t_ms - self._t_ms) / 1000)
+        self._t_ms = t_ms
+        a_d = _smoothing(self.d_cutoff, dt_s)
+        self.deriv += a_d * ((x - self.value) / dt_s - self.deriv)
+        a = _smoothing(self.min_cutoff + self.beta * abs(self.deriv), dt_s)
+        self.value += a * (x - self.value)
+        return self.value
+
+    def predict(self, lead_ms):
+        if self.value is None:
+            return None
+        return self.value + self.deriv * min(max(0.0, lead_ms), PREDICT_MAX_MS) / 1000
+
+
+class PointFilter:
+    # Ekran noktası: iki eksen bağımsız filtrelenir
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0):
+        self.x = OneEuroFilter(min_cutoff, beta, d_cutoff)
+        self.y = OneEuroFilter(min_cutoff, beta, d_cutoff)
+
+    def reset(self):
+        self.x.reset()
+        self.y.reset()
+
+    def __call__(self, point, t_ms):
+        return self.x(point[0], t_ms), self.y(point[1], t_ms)
+
+    def predict(self, lead_ms):
+        if self.x.value is None:
+            return None
+        return self.x.predict(lead_ms), self.y.predict(lead_ms)
@@ -0,0 +1,106 @@
+# profiler.py
+# Kare başına aşama süreleri sabit boyutlu bir halka tamponda tutulur (satır = kare, sütun = aşama).
+# Kapalıyken her çağrı tek bir bayrak kontrolünden ibarettir.
+import csv
+import json
+import math
+import time
+
+import numpy as np
+
+# Ana döngü: poll .. tick (total: tüm kare); izleyici (HandTracker.process_frame): read, inference, gestures;
+# frame_to_photon: kameranın kare zaman damgasından ekrana gönderilmesine kadar geçen süre.
+STAGES = (
+    "poll", "events", "update", "draw", "flip", "record", "tick", "total",
+    "read", "inference", "gestures",
+    "frame_to_photon", "gesture_to_photon",
+)
+TRACKER_STAGES = ("read", "inference", "gestures")
+PERCENTILES = (50, 95, 99)
+
+
+class StageProfiler:
+    def __init__(self, enabled=False, capacity=600, stages=STAGES):
+        self.stages = stages
+        self.capacity = capacity
+        self._index = {name: i for i, name in enumerate(stages)}
+        self.samples = np.full((capacity, len(stages)), np.nan)
+        self.frame_ids = np.zeros(capacity, dtype=np.int64)
+        self.frames = 0
+
+        # Açma/kapama bir sonraki karenin başında uygulanır; yarım kalan kare kaydedilmez
+        self.enabled = False
+        self._want_enabled = enabled
+        self._row = self.samples[0]
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    def toggle(self):
+        self._want_enabled = not self._want_enabled
+        return self._want_enabled
+
+    def begin_frame(self):
+        self.enabled = self._want_enabled
+        if not self.enabled:
+            return
+        slot = self.frames % self.capacity
+        self._row = self.samples[slot]
+        self._row.fill(np.nan)
+        self.frame_ids[slot] = self.frames
+        self._frame_start = self._last = time.perf_counter()
+
+    def lap(self, stage):
+        # Bir önceki lap'ten (ya da kare başından) bu yana geçen süre bu aşamaya yazılır
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._row[self._index[stage]] = (now - self._last) * 1000
+        self._last = now
+
+    def record(self, stage, ms):
+        if not self.enabled:
+            return
+        self._row[self._index[stage]] = ms
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self._row[self._index["total"]] = (time.perf_counter() - self._frame_start) * 1000
+        self.frames += 1
+
+    def _ordered(self):
+        # Dolu satırlar, en eskiden en yeniye
+        n = min(self.frames, self.capacity)
+        if self.frames <= self.capacity:
+            return self.frame_ids[:n], self.samples[:n]
+        start = self.frames % self.capacity
+        order = np.r_[start:self.capacity, 0:start]
+        return self.frame_ids[order], self.samples[order]
+
+    def summary(self):
+        # Aşama -> (örnek sayısı, p50, p95, p99); son `capacity` kare üzerinden
+        _, samples = self._ordered()
+        out = {}
+        for name, column in zip(self.stages, samples.T):
+            values = column[~np.isnan(column)]
+            if values.size:
+                out[name] = (int(values.size), *np.percentile(values, PERCENTILES).tolist())
+        return out
+
+    def export(self, path):
+        # Uzantıya göre CSV (kare başına bir satır, aşama sütunları) ya da JSONL
+        frame_ids, samples = self._ordered()
+        path = str(path)
+        if path.endswith(".jsonl"):
+            with open(path, "w", encoding="utf-8") as f:
+                for frame_id, row in zip(frame_ids.tolist(), samples.tolist()):
+                    rec = {"frame": frame_id}
+                    rec.update((name, round(v, 4)) for name, v in zip(self.stages, row) if not math.isnan(v))
+                    f.write(json.dumps(rec) + "\n")
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame",) + tuple(self.stages))
+                for frame_id, row in zip(frame_ids.tolist(), samples.tolist()):
+                    writer.writerow([frame_id] + ["" if math.isnan(v) else round(v, 4) for v in row])
+        return path
@@ -0,0 +1,197 @@
+# replay.py
+# Kayıtlı bir oturumu (ya da video / resim klasörünü) kamera olmadan HandTracker'dan geçirir.
+#   python replay.py oturum/               -> kareler, MediaPipe ile
+#   python replay.py oturum/ --landmarks   -> kayıtlı landmark'lar, MediaPipe atlanır
+#   python replay.py oturum/ --realtime    -> kayıt hızında oynatır
+#   python replay.py oturum/ --tiers full,balanced,fast  -> kalite seviyelerini "full"a göre karşılaştırır
+import argparse
+import json
+import math
+import time
+
+from frame_source import open_source, CAMERA_WIDTH, CAMERA_HEIGHT
+from gestures import PALM
+from hand_tracker import HandTracker
+from roi_inference import QUALITY_TIERS
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def replay(spec, landmarks=False, realtime=False, window_size=(1440, 960)):
+    source = open_source(spec, landmarks=landmarks)
+    tracker = HandTracker(window_size[0], window_size[1], source=source)
+
+    frame_ms = []
+    events = []
+    trigger_latency_ms = []
+    first_ts = None
+    wall_start = time.perf_counter()
+    index = 0
+    try:
+        while True:
+            t0 = time.perf_counter()
+            # now_ms=None: kaynağın kayıtlı zaman damgası kullanılır, böylece debounce aynı davranır
+            frame, hand_data = tracker.process_frame(None)
+            t1 = time.perf_counter()
+            if frame is None:
+                break
+            ts = tracker.last_now_ms
+            if first_ts is None:
+                first_ts = ts
+            frame_ms.append((t1 - t0) * 1000)
+
+            if hand_data["pinch_triggered"] or hand_data["punch_detected"]:
+                # Algılama gecikmesi: karenin "yakalandığı" an ile sonucun hazır olduğu an arası.
+                # Gerçek zamanlı modda kuyruk beklemesi de buna dahildir.
+                captured_at = wall_start + (ts - first_ts) / 1000 if realtime else t0
+                trigger_latency_ms.append((t1 - captured_at) * 1000)
+                if hand_data["pinch_triggered"]:
+                    events.append({"frame": index, "now_ms": ts, "event": "pinch"})
+                if hand_data["punch_detected"]:
+                    events.append({"frame": index, "now_ms": ts, "event": "punch"})
+
+            if realtime:
+                target = wall_start + (ts - first_ts) / 1000
+                delay = target - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            index += 1
+    finally:
+        tracker.close()
+
+    wall_s = time.perf_counter() - wall_start
+    return {
+        "source": str(spec),
+        "landmarks": landmarks,
+        "realtime": realtime,
+        "frames": index,
+        "wall_s": round(wall_s, 3),
+        "fps": round(index / wall_s, 1) if wall_s > 0 else 0.0,
+        "frame_ms_p50": round(_percentile(frame_ms, 50), 3),
+        "frame_ms_p95": round(_percentile(frame_ms, 95), 3),
+        "frame_ms_max": round(max(frame_ms, default=0.0), 3),
+        "trigger_latency_ms_p50": round(_percentile(trigger_latency_ms, 50), 3),
+        "trigger_latency_ms_p95": round(_percentile(trigger_latency_ms, 95), 3),
+        "pinch_count": sum(1 for e in events if e["event"] == "pinch"),
+        "punch_frames": sum(1 for e in events if e["event"] == "punch"),
+        "events": events,
+    }
+
+
+def _run_tier(spec, tier, window_size):
+    source = open_source(spec)
+    if source.provides_landmarks:
+        # Kayıtlı landmark'lar MediaPipe'ı atlar; seviyeler arasında karşılaştırılacak çıkarım yoktur
+        source.release()
+        raise ValueError("kalite seviyeleri yalnızca kare içeren kaynaklarda karşılaştırılabilir")
+    tracker = HandTracker(window_size[0], window_size[1], source=source, quality=tier)
+    landmarks, frame_ms = [], []
+    try:
+        while True:
+            t0 = time.perf_counter()
+            frame, hand_data = tracker.process_frame(None)
+            if frame is None:
+                break
+            frame_ms.append((time.perf_counter() - t0) * 1000)
+            landmarks.append(hand_data["landmarks"])
+        inference = tracker.inference
+        counters = {"full_detects": inference.full_detects, "roi_runs": inference.roi_runs,
+                    "skipped_frames": inference.skipped_frames}
+    finally:
+        tracker.close()
+    return landmarks, frame_ms, counters
+
+
+def _palm_px(pts):
+    x, y = pts[PALM].mean(axis=0)
+    return x * CAMERA_WIDTH, y * CAMERA_HEIGHT
+
+
+def _match_hands(ref_hands, hands):
+    # MediaPipe elleri her seviyede aynı sırada döndürmez; eller avuç ortalarına göre en yakından
+    # başlayarak eşlenir
+    ref_palms = [_palm_px(pts) for pts in ref_hands]
+    palms = [_palm_px(pts) for pts in hands]
+    pairs = sorted((math.hypot(x - rx, y - ry), r, i)
+                   for r, (rx, ry) in enumerate(ref_palms) for i, (x, y) in enumerate(palms))
+    used_ref, used = set(), set()
+    for _, r, i in pairs:
+        if r not in used_ref and i not in used:
+            used_ref.add(r)
+            used.add(i)
+            yield ref_hands[r], hands[i]
+
+
+def evaluate_tiers(spec, tiers, window_size=(1440, 960)):
+    # Her seviye aynı kayıtlı kareler üzerinde çalışır; doğruluk, "full" seviyenin
+    # landmark'larına olan ortalama uzaklıkla (kamera pikseli) ölçülür.
+    reference, _, _ = _run_tier(spec, "full", window_size)
+    rows = []
+    for tier in tiers:
+        landmarks, frame_ms, counters = _run_tier(spec, tier, window_size)
+        errors = []
+        agree = 0
+        for ref_hands, hands in zip(reference, landmarks):
+            if len(ref_hands) != len(hands):
+                continue
+            agree += 1
+            for ref_pts, pts in _match_hands(ref_hands, hands):
+                for (rx, ry), (x, y) in zip(ref_pts, pts):
+                    errors.append(math.hypot((x - rx) * CAMERA_WIDTH, (y - ry) * CAMERA_HEIGHT))
+        n = len(landmarks)
+        total_s = sum(frame_ms) / 1000
+        rows.append({
+            "tier": tier,
+            "frames": n,
+            "fps": round(n / total_s, 1) if total_s > 0 else 0.0,
+            "frame_ms_p50": round(_percentile(frame_ms, 50), 3),
+            "frame_ms_p95": round(_percentile(frame_ms, 95), 3),
+            "hand_count_agreement": round(agree / n, 3) if n else 0.0,
+            "error_px_mean": round(sum(errors) / len(errors), 2) if errors else 0.0,
+            "error_px_p95": round(_percentile(errors, 95), 2),
+            **counters,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıtlı oturumu HandTracker üzerinden tekrar oynatır.")
+    parser.add_argument("source", help="oturum klasörü, trace.jsonl, video dosyası ya da resim klasörü")
+    parser.add_argument("--landmarks", action="store_true", help="kayıtlı landmark'ları kullan (MediaPipe'sız)")
+    parser.add_argument("--realtime", action="store_true", help="kayıt hızında oynat")
+    parser.add_argument("--tiers", help="virgülle ayrılmış kalite seviyeleri: " + ", ".join(QUALITY_TIERS))
+    parser.add_argument("--json", dest="json_path", help="sonucu bu dosyaya JSON olarak yaz")
+    args = parser.parse_args()
+
+    if args.tiers:
+        tiers = [t.strip() for t in args.tiers.split(",") if t.strip()]
+        unknown = [t for t in tiers if t not in QUALITY_TIERS]
+        if unknown:
+            parser.error("bilinmeyen kalite seviyesi: " + ", ".join(unknown))
+        if args.landmarks or args.source.endswith(".jsonl"):
+            parser.error("--tiers kare içeren bir kaynak ister (video, resim klasörü ya da oturum klasörü); "
+                         "trace.jsonl ve --landmarks MediaPipe'ı atlar")
+        rows = evaluate_tiers(args.source, tiers)
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(rows, f, indent=2, ensure_ascii=False)
+        return
+
+    report = replay(args.source, landmarks=args.landmarks, realtime=args.realtime)
+    summary = {k: v for k, v in report.items() if k != "events"}
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+# roi_inference.py
+# Uyarlanabilir MediaPipe çıkarımı: önceki karenin landmark'larının etrafını kırpar,
+# eller büyükse kırpıntıyı küçültür, eller neredeyse hareketsizse bazı karelerde
+# çıkarımı atlayıp son landmark'ları sabit hızla ileri taşır. İz kaybolunca tam kare
+# taramasına döner.
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from frame_source import TraceResults
+from gestures import landmarks_to_array
+
+# roi: önceki ellerin etrafını kırp; max_side: kırpıntının en uzun kenarı bundan büyükse küçült;
+# skip_motion: el boyuna göre normalize kare başı hareket bu eşiğin altındaysa atla;
+# max_skip: art arda en fazla kaç kare atlanır; redetect_every: yeni giren eli yakalamak için
+# bu kadar karede bir tam kare taraması.
+QUALITY_TIERS = {
+    "full": {"roi": False, "max_side": None, "skip_motion": 0.0, "max_skip": 0, "redetect_every": 0},
+    "balanced": {"roi": True, "max_side": 320, "skip_motion": 0.0, "max_skip": 0, "redetect_every": 30},
+    "fast": {"roi": True, "max_side": 256, "skip_motion": 0.015, "max_skip": 1, "redetect_every": 30},
+    "eco": {"roi": True, "max_side": 192, "skip_motion": 0.03, "max_skip": 3, "redetect_every": 20},
+}
+DEFAULT_TIER = "full"
+
+ROI_MARGIN = 0.35
+ROI_MIN_SIDE = 96
+
+Landmark = namedtuple("Landmark", "x y z")
+
+
+class LandmarkList:
+    __slots__ = ("landmark",)
+
+    def __init__(self, points):
+        self.landmark = [Landmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+def _hand_scale(pts):
+    # Bilek (0) ile orta parmak kökü (9) arası: el boyu ölçüsü
+    return max(1e-3, float(np.hypot(*(pts[9, :2] - pts[0, :2]))))
+
+
+class AdaptiveInference:
+    def __init__(self, hands, roi_hands, tier=DEFAULT_TIER):
+        self.hands = hands
+        self.roi_hands = roi_hands
+        self.set_tier(tier)
+
+        self._prev = []          # son çıkarımın landmark dizileri (normalize, tam kare)
+        self._velocity = []      # kare başına normalize hız
+        self._velocity_valid = False
+        self._handedness = None
+        self._skipped = 0
+        self._since_detect = 0
+
+        # Raporlama için sayaçlar
+        self.full_detects = 0
+        self.roi_runs = 0
+        self.skipped_frames = 0
+
+    def set_tier(self, tier):
+        if tier not in QUALITY_TIERS:
+            raise ValueError(f"Bilinmeyen kalite seviyesi: {tier}")
+        self.tier = tier
+        self.params = QUALITY_TIERS[tier]
+
+    def process(self, rgb):
+        params = self.params
+        if not params["roi"]:
+            self.full_detects += 1
+            return self.hands.process(rgb)
+
+        # 1) Hareket çok azsa çıkarımı atla, son landmark'ları ileri taşı
+        if (self._velocity_valid and self._skipped < params["max_skip"]
+                and self._motion() < params["skip_motion"]):
+            self._skipped += 1
+            self.skipped_frames += 1
+            self._since_detect += 1
+            hands = [p + v * self._skipped for p, v in zip(self._prev, self._velocity)]
+            return self._results(hands, self._handedness)
+
+        # 2) Önceki ellerin etrafındaki kırpıntıda çıkarım
+        redetect = params["redetect_every"] and self._since_detect >= params["redetect_every"]
+        if self._prev and not redetect:
+            hands, handedness = self._process_roi(rgb, params["max_side"])
+            # Eksik el: iz kaybı, aynı karede tam kare taramasına düş
+            if len(hands) >= len(self._prev):
+                self.roi_runs += 1
+                self._since_detect += 1
+                return self._remember(hands, handedness)
+
+        # 3) Tam kare taraması
+        self.full_detects += 1
+        self._since_detect = 0
+        results = self.hands.process(rgb)
+        hands = [landmarks_to_array(h) for h in results.multi_hand_landmarks or []]
+        self._remember(hands, results.multi_handedness)
+        return results
+
+    def _motion(self):
+        return max(float(np.abs(v[:, :2]).max()) / _hand_scale(p) for p, v in zip(self._prev, self._velocity))
+
+    def _remember(self, hands, handedness):
+        self._velocity_valid = bool(hands) and len(hands) == len(self._prev)
+        if self._velocity_valid:
+            self._velocity = [(h - p) / (self._skipped + 1) for h, p in zip(hands, self._prev)]
+        else:
+            self._velocity = [np.zeros_like(h) for h in hands]
+        self._prev = hands
+        self._handedness = handedness
+        self._skipped = 0
+        return self._results(hands, handedness)
+
+    def _process_roi(self, rgb, max_side):
+        h, w = rgb.shape[:2]
+        pts = np.concatenate(self._prev)
+        x0, y0 = pts[:, 0].min() * w, pts[:, 1].min() * h
+        x1, y1 = pts[:, 0].max() * w, pts[:, 1].max() * h
+        side_x = max(ROI_MIN_SIDE, (x1 - x0) * (1 + 2 * ROI_MARGIN))
+        side_y = max(ROI_MIN_SIDE, (y1 - y0) * (1 + 2 * ROI_MARGIN))
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        left = int(max(0, cx - side_x / 2))
+        top = int(max(0, cy - side_y / 2))
+        right = int(min(w, cx + side_x / 2))
+        bottom = int(min(h, cy + side_y / 2))
+        if right - left < 8 or bottom - top < 8:
+            return [], None
+
+        crop = rgb[top:bottom, left:right]
+        crop_w, crop_h = right - left, bottom - top
+        if max_side and max(crop_w, crop_h) > max_side:
+            scale = max_side / max(crop_w, crop_h)
+            crop = cv2.resize(crop, (max(1, int(crop_w * scale)), max(1, int(crop_h * scale))),
+                              interpolation=cv2.INTER_AREA)
+        else:
+            crop = np.ascontiguousarray(crop)
+
+        results = self.roi_hands.process(crop)
+        hands = []
+        for hand in results.multi_hand_landmarks or []:
+            a = landmarks_to_array(hand)
+            a[:, 0] = (a[:, 0] * crop_w + left) / w
+            a[:, 1] = (a[:, 1] * crop_h + top) / h
+            a[:, 2] *= crop_w / w
+            hands.append(a)
+        return hands, results.multi_handedness
+
+    @staticmethod
+    def _results(hands, handedness):
+        if not hands:
+            return TraceResults(None, None)
+        return TraceResults([LandmarkList(h) for h in hands], handedness)
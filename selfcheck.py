@@ -0,0 +1,531 @@
+# selfcheck.py
+# Ekransız doğrulamalar: python selfcheck.py [kontrol_adı ...]
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from game_state import GameState, SimClock, headless_bird_image
+
+WINDOW_WIDTH, WINDOW_HEIGHT = 1440, 960
+
+
+def _random_policy(seed, n_envs, shield_p=0.005):
+    # Kuşu ekranın ortasındaki bir bantta tutmaya çalışan gürültülü politika:
+    # hem boru çarpışmaları hem sınır ölümleri sık yaşanır
+    rng = np.random.default_rng(seed)
+
+    def policy(batch):
+        target = WINDOW_HEIGHT / 2 + rng.normal(0, 160, n_envs)
+        jump = ((batch.bird_y > target) & (batch.bird_vel > 0)) | (rng.random(n_envs) < 0.01)
+        return jump, rng.random(n_envs) < shield_p
+    return policy
+
+
+def check_batch_equivalence(n_envs=32, ticks=6000, seed=1234):
+    # BatchGame, aynı tohum ve aynı girdilerle her adımda GameState ile aynı durumu üretmeli
+    from batch_sim import BatchGame
+
+    bird_img = headless_bird_image()
+    seeds = [seed + i for i in range(n_envs)]
+    games = []
+    for s in seeds:
+        g = GameState(bird_img, WINDOW_WIDTH, WINDOW_HEIGHT, clock=SimClock(), seed=s)
+        g.start_new_game()
+        games.append(g)
+    batch = BatchGame(n_envs, WINDOW_WIDTH, WINDOW_HEIGHT, games[0].bird.mask, seeds=seeds)
+    policy = _random_policy(seed, n_envs)
+
+    deaths = 0
+    for tick in range(ticks):
+        jump, shield = policy(batch)
+        for i, g in enumerate(games):
+            if g.game_over:
+                g.start_new_game()
+                continue
+            if jump[i]:
+                g.bird.jump()
+            if shield[i]:
+                g.try_activate_shield()
+        done = batch.step(jump, shield)
+        if done is not None:
+            deaths += int(done.sum())
+        for g in games:
+            g.step()
+
+        for i, g in enumerate(games):
+            pipes_scalar = sorted((int(p.x), p.gap_y, p.passed) for p in g.pipes)
+            active = batch.pipe_active[i]
+            pipes_batch = sorted(zip(batch.pipe_x[i][active].tolist(), batch.pipe_gap_y[i][active].tolist(),
+                                     batch.pipe_passed[i][active].tolist()))
+            state_scalar = (g.bird.y, g.bird.vel, g.score, g.max_score, g.game_over, g.bird.shield_active,
+                            g.shield_charges, pipes_scalar)
+            state_batch = (batch.bird_y[i], batch.bird_vel[i], batch.score[i], batch.max_score[i],
+                           bool(batch.game_over[i]), bool(batch.shield_active[i]), batch.shield_charges[i],
+                           pipes_batch)
+            if state_scalar != state_batch:
+                raise AssertionError(f"tick {tick}, ortam {i}: {state_scalar} != {state_batch}")
+    return f"{n_envs} ortam x {ticks} adım eşdeğer, {deaths} ölüm"
+
+
+def check_batch_throughput(n_envs=4096, ticks=500, minimum=100_000):
+    from batch_sim import BatchGame
+
+    bird_img = headless_bird_image()
+    mask = GameState(bird_img, WINDOW_WIDTH, WINDOW_HEIGHT, clock=SimClock()).bird.mask
+    batch = BatchGame(n_envs, WINDOW_WIDTH, WINDOW_HEIGHT, mask)
+    policy = _random_policy(0, n_envs)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        jump, shield = policy(batch)
+        batch.step(jump, shield)
+    rate = n_envs * ticks / (time.perf_counter() - start)
+    if rate < minimum:
+        raise AssertionError(f"{rate:,.0f} ortam-adım/s < {minimum:,}")
+    return f"{rate:,.0f} ortam-adım/s"
+
+
+def _mask_reference_hit(bird_mask, bird_left, bird_top, pipe_x, gap_y, window_height):
+    # Eski yöntem: her boru için dolu pygame maskeleri ve Mask.overlap
+    import pygame
+    from game_state import PIPE_WIDTH, PIPE_GAP
+
+    if gap_y > 0:
+        upper = pygame.mask.Mask((PIPE_WIDTH, gap_y), fill=True)
+        if bird_mask.overlap(upper, (pipe_x - bird_left, 0 - bird_top)):
+            return True
+    lower_top = gap_y + PIPE_GAP
+    if window_height - lower_top > 0:
+        lower = pygame.mask.Mask((PIPE_WIDTH, window_height - lower_top), fill=True)
+        if bird_mask.overlap(lower, (pipe_x - bird_left, lower_top - bird_top)):
+            return True
+    return False
+
+
+def check_collision_masks(random_cases=20000, seed=7):
+    # Analitik çarpışma, maske testinin sonucuyla piksel piksel aynı olmalı:
+    # boşluk kenarları, boru kenar sütunları, ekranın üstünde/altında kalan kuş
+    import pygame
+    from collision import BirdCollider
+    from game_state import PIPE_WIDTH, PIPE_GAP
+
+    logo_mask = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=SimClock()).bird.mask
+    # Delikli ve düzensiz bir maske: sütun içi boşlukları da sınar
+    holey = pygame.mask.Mask((37, 23))
+    rng = random.Random(seed)
+    for x in range(37):
+        for y in range(23):
+            if rng.random() < 0.3:
+                holey.set_at((x, y))
+
+    h = WINDOW_HEIGHT
+    cases = 0
+    for mask in (logo_mask, holey):
+        collider = BirdCollider(mask)
+        w, bh = mask.get_size()
+        left = 130
+        edge_xs = [left - PIPE_WIDTH + d for d in (-1, 0, 1, 2)] + [left + w + d for d in (-2, -1, 0, 1)]
+        edge_xs += [left + d for d in (-1, 0, 1)] + [left + w - PIPE_WIDTH + d for d in (-1, 0, 1)]
+        tops = [-bh - 1, -bh, -bh + 1, -1, 0, 1, 300, h - bh - 1, h - bh, h - bh + 1, h - 1, h, h + 1]
+        for pipe_x in edge_xs:
+            for top in tops:
+                gaps = {max(1, top + d) for d in range(-2, bh + 3)}
+                gaps |= {top - PIPE_GAP + d for d in range(-2, bh + 3)}
+                gaps |= {1, 150, h - PIPE_GAP - 1}
+                for gap_y in gaps:
+                    if gap_y <= 0 or gap_y + PIPE_GAP >= h:
+                        continue
+                    expected = _mask_reference_hit(mask, left, top, pipe_x, gap_y, h)
+                    got = collider.hits_pipe(left, top, pipe_x, PIPE_WIDTH, gap_y, PIPE_GAP, h)
+                    if expected != got:
+                        raise AssertionError(f"x={pipe_x} top={top} gap_y={gap_y}: {got} != {expected}")
+                    cases += 1
+        for _ in range(random_cases):
+            pipe_x = rng.randint(left - PIPE_WIDTH - 3, left + w + 3)
+            top = rng.randint(-bh - 3, h + 3)
+            gap_y = rng.randint(1, h - PIPE_GAP - 1)
+            expected = _mask_reference_hit(mask, left, top, pipe_x, gap_y, h)
+            got = collider.hits_pipe(left, top, pipe_x, PIPE_WIDTH, gap_y, PIPE_GAP, h)
+            if expected != got:
+                raise AssertionError(f"x={pipe_x} top={top} gap_y={gap_y}: {got} != {expected}")
+            cases += 1
+    return f"{cases} konum maske testiyle aynı"
+
+
+def check_steady_state_allocations(warmup=3000, ticks=30000, seed=5, max_net_bytes=1024, max_peak_bytes=2048):
+    # Kararlı durumda (ölüp yeniden başlayan oyunlar dahil) oyun döngüsü bellekte büyümemeli:
+    # kuş, maskesi ve boru nesneleri yeniden kullanılır. tracemalloc ile net fark yalnızca
+    # nesnelerde tutulan sayı değerleri kadar, tepe değer de geçici yineleyiciler kadar olmalı.
+    import tracemalloc
+    from game_state import FIXED_DT_MS
+    from simulate import gap_follower
+
+    clock = SimClock()
+    game = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=clock, seed=seed)
+    deaths = 0
+
+    def frame(tick):
+        nonlocal deaths
+        if game.game_over:
+            deaths += 1
+        # Her 1500 adımın son çeyreğinde bot zıplamayı bırakır: oyunlar ölüp yeniden başlar
+        if game.game_over or not game.game_started or (tick // 375) % 4 != 3:
+            gap_follower(game)
+        clock.advance(FIXED_DT_MS)
+        game.update_game_logic()
+
+    for tick in range(warmup):
+        frame(tick)
+    bird, mask, pool = game.bird, game.bird.mask, list(game.pipes._items)
+
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        deaths = 0
+        for tick in range(warmup, warmup + ticks):
+            frame(tick)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    if game.bird is not bird or game.bird.mask is not mask or list(game.pipes._items) != pool:
+        raise AssertionError("kuş, maske ya da boru havuzu yeniden ayrıldı")
+    if deaths == 0:
+        raise AssertionError("ölçüm sırasında hiç oyun yeniden başlamadı")
+    if current - base > max_net_bytes or peak - base > max_peak_bytes:
+        raise AssertionError(f"net {current - base} bayt, tepe {peak - base} bayt")
+    return f"{ticks} adım, {deaths} yeniden başlama: net {current - base} bayt, tepe {peak - base} bayt"
+
+
+def check_hand_assignment(frames=600, seed=11):
+    # İki oyuncunun elleri kesişse, algılama sırası her karede karışsa ve eller ara ara
+    # kaybolsa da her oyuncu kendi elini korumalı; uzun süre kaybolan oyuncunun yeri boşalmalı.
+    from gestures import HandAssigner, ASSIGN_LOST_MS
+
+    rng = random.Random(seed)
+    assigner = HandAssigner(2)
+    swaps = 0
+    for i in range(frames):
+        now_ms = i * 33
+        # Eller ekranın iki yanından karşıya salınır ve ortada birbirinin yanından geçer
+        phase = np.cos(i / 40)
+        xs = (0.5 - 0.3 * phase, 0.5 + 0.3 * phase)
+        hands, labels, identities = [], [], []
+        for ident, (x, label) in enumerate(zip(xs, ("Right", "Left"))):
+            if rng.random() < 0.1:
+                continue
+            pts = np.zeros((21, 3), dtype=np.float32)
+            pts[:, 0] = x + rng.uniform(-0.01, 0.01)
+            pts[:, 1] = 0.5 + 0.05 * ident
+            hands.append(pts)
+            labels.append(label)
+            identities.append(ident)
+        order = list(range(len(hands)))
+        rng.shuffle(order)
+        owners = assigner.assign([hands[k] for k in order], [labels[k] for k in order], now_ms)
+        for player, index in enumerate(owners):
+            if index is not None and identities[order[index]] != player:
+                swaps += 1
+    if swaps:
+        raise AssertionError(f"{swaps} karede el başka oyuncuya geçti")
+
+    assigner.assign([], [], frames * 33 + ASSIGN_LOST_MS + 1)
+    if any(c is not None for c in assigner.centers):
+        raise AssertionError("kaybolan ellerin izi bırakılmadı")
+    return f"{frames} kare, kesişen ve kaybolan ellerde kimlik korundu"
+
+
+def _trace_hand(x, fist=False, pinch_gap=0.08):
+    # Dik duran el (normalize landmark'lar): parmaklar açık ya da yumruk, başparmak işaret ucundan
+    # pinch_gap kadar uzakta
+    pts = np.zeros((21, 3))
+    pts[:, 0] = x
+    pts[:, 1] = 0.6
+    pts[0, 1] = 0.75                                           # bilek
+    pts[[6, 10, 14, 18], 1] = 0.5                              # parmak eklemleri
+    pts[[8, 12, 16, 20], 1] = 0.55 if fist else 0.4            # parmak uçları
+    pts[4] = pts[8]
+    pts[4, 0] += pinch_gap
+    return pts.tolist()
+
+
+def _write_trace(path, frames, frame_ms=33, leads=None):
+    # İki elli sentetik oturum izi: sol el ara sıra yumruk olur, sağ elde başparmak ve işaret ucu değişen
+    # hızlarla birleşip ayrılır (tutam); eller ara sıra görünmez. leads: kare başına kayıtlı tahmin gecikmesi
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(frames):
+            gap = 0.08 * (1 + np.cos(i / 6 + 0.8 * np.sin(i / 17))) / 2
+            visible = i % 61 < 58
+            rec = {"now_ms": 5000 + i * frame_ms,
+                   "hands": [_trace_hand(0.3, fist=i % 97 >= 85), _trace_hand(0.6, pinch_gap=gap)] if visible else [],
+                   "handedness": [["Left", 0.9], ["Right", 0.9]] if visible else []}
+            if leads is not None:
+                rec["lead_ms"] = leads[i]
+            f.write(json.dumps(rec) + "\n")
+
+
+def check_tracker_replay(frames=45, frame_ms=33, max_dropped=3, timeout_s=30):
+    # Dosya kaynağı oyunda kayıt hızında oynatılmalı: sonuçlar kayıttaki aralıklarla ve oyun saatinde
+    # damgalanarak gelmeli, kaydın sonu kamera hatası değil "kaynak bitti" olmalı (iki arka uçta da)
+    from tracker_pipeline import TrackerPipeline
+
+    def clock():
+        return int(time.monotonic() * 1000)
+
+    span_s = (frames - 1) * frame_ms / 1000
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl")
+        _write_trace(path, frames, frame_ms)
+        for backend in ("thread", "process"):
+            tracker = TrackerPipeline(WINDOW_WIDTH, WINDOW_HEIGHT, backend=backend, clock=clock, source=path)
+            first = None
+            deadline = time.monotonic() + timeout_s
+            try:
+                while not (tracker.failed or tracker.exhausted) and time.monotonic() < deadline:
+                    tracker.poll()
+                    if first is None and tracker.timestamp_ms is not None:
+                        first = time.monotonic()
+                    time.sleep(1 / 60)
+                elapsed_s = time.monotonic() - first if first is not None else 0.0
+                lag_ms = clock() - tracker.timestamp_ms if tracker.timestamp_ms is not None else None
+            finally:
+                tracker.close()
+            if tracker.failed or not tracker.exhausted:
+                raise AssertionError(f"{backend}: kaynak sonu algılanmadı (failed={tracker.failed})")
+            if tracker.frames_received != frames or tracker.dropped_frames > max_dropped:
+                raise AssertionError(f"{backend}: {tracker.frames_received}/{frames} sonuç, "
+                                     f"{tracker.dropped_frames} düşürüldü")
+            if elapsed_s < 0.9 * span_s:
+                raise AssertionError(f"{backend}: {span_s:.2f} s'lik kayıt {elapsed_s:.2f} s'de bitti")
+            if lag_ms is None or not 0 <= lag_ms < 500:
+                raise AssertionError(f"{backend}: son sonuç oyun saatinde değil ({lag_ms} ms)")
+            results.append(f"{backend}: {elapsed_s:.2f} s, {tracker.dropped_frames} düşürüldü")
+    return f"{frames} karelik iz ({span_s:.2f} s); " + ", ".join(results)
+
+
+def check_gesture_replay(frames=600, seed=13):
+    # Aynı iz, canlı akıştan (HandTracker.process_frame) ve toplu değerlendirmeden (gestures.trace_events)
+    # her karede aynı jestleri vermeli. Tahmin, kayıttaki kare gecikmesiyle yapılır; gecikme 0 alınınca
+    # olayların değişmesi, tahminin bu kontrolde gerçekten sınandığını gösterir.
+    from frame_source import read_trace
+    from gestures import trace_events
+    from hand_tracker import HandTracker
+
+    rng = random.Random(seed)
+    leads = [round(rng.uniform(5, 80), 2) for _ in range(frames)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl")
+        _write_trace(path, frames, leads=leads)
+        records = read_trace(path)
+        tracker = HandTracker(WINDOW_WIDTH, WINDOW_HEIGHT, source=path)
+        live = {"pinch": [], "punch": []}
+        try:
+            while True:
+                frame, hand_data = tracker.process_frame(None)
+                if frame is None:
+                    break
+                live["pinch"].append(hand_data["pinch_triggered"])
+                live["punch"].append(hand_data["punch_detected"])
+        finally:
+            tracker.close()
+    if not tracker.exhausted:
+        raise AssertionError("iz sonu kaynak hatası sayıldı")
+
+    batch = trace_events(records)
+    for name, events in live.items():
+        diff = [i for i, (a, b) in enumerate(zip(events, batch[name].tolist())) if a != b]
+        if len(events) != frames or diff:
+            raise AssertionError(f"{name}: canlı ve toplu sonuç {len(diff)} karede farklı (ilk: {diff[:5]})")
+    unpredicted = trace_events(records, lead_ms=0)["pinch"].tolist()
+    if unpredicted == live["pinch"]:
+        raise AssertionError("gecikme 0 ile aynı tutamlar: tahmin sınanmadı")
+    return (f"{frames} kare: {sum(live['pinch'])} tutam, {sum(live['punch'])} yumruk karesi aynı; "
+            f"gecikme 0 ile {sum(unpredicted)} tutam")
+
+
+def check_jump_rewind(delays_ms=(17, 50, 100), frame_ms=16, seed=9):
+    # Geç gelen zıplama (pinch_time_ms geçmişte), jest anında verilmiş zıplamayla aynı kuş yolunu vermeli
+    from game_state import MAX_REWIND_MS
+
+    def run(jump_at_ms, deliver_at_ms, until_ms):
+        clock = SimClock()
+        game = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=clock, seed=seed)
+        game.start_new_game()
+        path = []
+        jumped = False
+        while clock() < until_ms:
+            clock.advance(frame_ms)
+            game.update_game_logic()
+            if not jumped and clock() >= deliver_at_ms:
+                game.jump(jump_at_ms)
+                jumped = True
+            path.append((game.tick_count, game.bird.y, game.bird.vel))
+        return path, game.rewinds
+
+    jump_at = 10 * frame_ms
+    until = jump_at + MAX_REWIND_MS + 400
+    reference, _ = run(jump_at, jump_at, until)
+    for delay in delays_ms:
+        path, rewinds = run(jump_at, jump_at + delay, until)
+        if rewinds != 1:
+            raise AssertionError(f"{delay} ms gecikme: {rewinds} geri sarma")
+        # Olay teslim edildikten sonraki tüm karelerde kuş, zamanında zıplamış gibi olmalı
+        after = (jump_at + delay) // frame_ms
+        if path[after:] != reference[after:]:
+            raise AssertionError(f"{delay} ms gecikmeli zıplama zamanında zıplamayla aynı yolu vermedi")
+    return f"{len(delays_ms)} gecikmede ({', '.join(map(str, delays_ms))} ms) kuş yolu aynı"
+
+
+def _trajectory(game, ticks, seed):
+    # Tohumlu rastgele zıplamalar ve kalkanlarla oyunu ilerletir; adım başına gözlenen durumu döner
+    rng = random.Random(seed)
+    states = []
+    for _ in range(ticks):
+        if not game.game_started or game.game_over:
+            game.start_new_game()
+        elif game.bird.y > WINDOW_HEIGHT / 2 + rng.uniform(-200, 200) and game.bird.vel > 0:
+            game.jump()
+        if rng.random() < 0.01:
+            game.try_activate_shield()
+        game.step()
+        states.append((game.tick_count, game.bird.y, game.bird.vel, game.bird.shield_active, game.score,
+                       game.game_over, tuple((p.x, p.gap_y, p.passed) for p in game.pipes)))
+    return states
+
+
+def check_snapshot_restore(warmup=2000, ticks=3000, cycles=2000, seed=21, max_net_bytes=256, max_peak_bytes=1024):
+    # Görüntüden geri yüklenen oyun (kendisi ya da başka bir GameState) aynı girdilerle adım adım
+    # aynı yolu izlemeli: yeni borular dahil (RNG durumu). Kaydet/yükle döngüsü bellekte büyümemeli.
+    import tracemalloc
+
+    game = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=SimClock(), seed=seed)
+    _trajectory(game, warmup, seed)
+    snap = game.save(game.new_snapshot())
+    draws = game.rng_draws
+    expected = _trajectory(game, ticks, seed + 1)
+    if not any(state[5] for state in expected) or game.rng_draws == draws:
+        raise AssertionError("karşılaştırma sırasında hiç oyun bitmedi ya da boru doğmadı")
+
+    game.restore(snap)
+    if _trajectory(game, ticks, seed + 1) != expected:
+        raise AssertionError("kendi görüntüsünden yüklenen oyun farklı ilerledi")
+    other = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=SimClock(), seed=seed + 99)
+    other.restore(snap)
+    if _trajectory(other, ticks, seed + 1) != expected:
+        raise AssertionError("başka bir oyuna yüklenen görüntü farklı ilerledi")
+
+    # Borular ekrandayken, ara adım olmadan kaydet/yükle: RNG durumu yeniden alınmaz, nesne ayrılmaz
+    game.restore(snap)
+    while len(game.pipes) < 2 or game.game_over:
+        _trajectory(game, 1, seed)
+    game.save(snap)
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(cycles):
+            game.save(snap)
+            other.restore(snap)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if current - base > max_net_bytes or peak - base > max_peak_bytes:
+        raise AssertionError(f"kaydet/yükle: net {current - base} bayt, tepe {peak - base} bayt")
+    return (f"{ticks} adım aynı ({len(game.pipes)} boru, RNG dahil); {cycles} kaydet/yükle: "
+            f"net {current - base} bayt, tepe {peak - base} bayt")
+
+
+def check_autopilot(ticks=3000, rollouts=6, seed=2, min_score=15):
+    # Sabit rollout sayısıyla (makine hızından bağımsız) planlayıcı oyunu uzun süre ölmeden oynamalı
+    from autopilot import Autopilot
+
+    game = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=SimClock(), seed=seed)
+    autopilot = Autopilot(game, budget_ms=None, max_rollouts=rollouts)
+    game.start_new_game()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if game.game_over:
+            raise AssertionError(f"{game.tick_count}. adımda öldü (skor {game.score})")
+        if autopilot.plan():
+            game.jump()
+        game.step()
+    elapsed = time.perf_counter() - start
+    if game.score < min_score:
+        raise AssertionError(f"skor {game.score} < {min_score}")
+    return (f"{ticks} adım ölmeden, skor {game.score}; "
+            f"{int(autopilot.rollouts / elapsed)} rollout/s ({autopilot.plan_ms:.2f} ms/kare)")
+
+
+def check_autopilot_frames(frames=2000, rollouts=8, seed=2, max_deaths=1, min_score=10):
+    # Ana döngüdeki yol: player_input -> apply_player_input -> update_game_logic. Kare süreleri
+    # oynak (60 ve 30 FPS civarı) olduğunda kare başına 0-3 adım ilerlenir; kararlar kaybolmamalı.
+    import types
+    import pygame
+    from autopilot import Autopilot
+    from main import apply_player_input
+
+    view = types.SimpleNamespace(offset=(0, 0), start_button=pygame.Rect(620, 400, 200, 80),
+                                 restart_button=pygame.Rect(620, 600, 200, 80))
+    results = []
+    for frame_ms in ((16, 17), (33, 34), (0, 16, 17, 33)):
+        rng = random.Random(seed)
+        clock = SimClock()
+        game = GameState(headless_bird_image(), WINDOW_WIDTH, WINDOW_HEIGHT, clock=clock, seed=seed)
+        autopilot = Autopilot(game, budget_ms=None, max_rollouts=rollouts, seed=seed)
+        deaths = 0
+        for _ in range(frames):
+            was_over = game.game_over
+            apply_player_input(game, view, autopilot.player_input(view))
+            clock.advance(rng.choice(frame_ms))
+            game.update_game_logic()
+            if game.game_over and not was_over:
+                deaths += 1
+        if deaths > max_deaths or game.max_score < min_score:
+            raise AssertionError(f"kare süreleri {frame_ms} ms: {deaths} ölüm, en iyi skor {game.max_score}")
+        results.append(f"{'/'.join(map(str, frame_ms))} ms: {deaths} ölüm")
+    return f"{frames} kare; " + ", ".join(results)
+
+
+CHECKS = {
+    "collision_masks": check_collision_masks,
+    "batch_equivalence": check_batch_equivalence,
+    "batch_throughput": check_batch_throughput,
+    "steady_state_allocations": check_steady_state_allocations,
+    "hand_assignment": check_hand_assignment,
+    "tracker_replay": check_tracker_replay,
+    "gesture_replay": check_gesture_replay,
+    "jump_rewind": check_jump_rewind,
+    "snapshot_restore": check_snapshot_restore,
+    "autopilot": check_autopilot,
+    "autopilot_frames": check_autopilot_frames,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekransız doğrulamalar")
+    parser.add_argument("checks", nargs="*", help="varsayılan: hepsi (" + ", ".join(CHECKS) + ")")
+    args = parser.parse_args()
+    unknown = [c for c in args.checks if c not in CHECKS]
+    if unknown:
+        parser.error("bilinmeyen kontrol: " + ", ".join(unknown))
+    random.seed(0)
+
+    failed = 0
+    for name in args.checks or CHECKS:
+        try:
+            print(f"[OK]   {name}: {CHECKS[name]()}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[HATA] {name}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
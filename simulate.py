@@ -0,0 +1,70 @@
+# simulate.py
+# Ekran açmadan uzun oyun oturumlarını simüle eder: python simulate.py --ticks 200000
+# --autopilot MS: basit bot yerine ileriye bakan planlayıcı (adım başına MS planlama süresi)
+import argparse
+import time
+
+from game_state import GameState, SimClock, headless_bird_image, SIM_HZ, PIPE_GAP
+
+
+def gap_follower(game):
+    # Basit bot: kuş en yakın boşluğun ortasının altındaysa ve düşüyorsa zıplar
+    if not game.game_started or game.game_over:
+        game.start_new_game()
+        return
+    bird = game.bird
+    target_y = game.WINDOW_HEIGHT // 2
+    for p in game.pipes:
+        if p.x + p.width >= bird.x - 50:
+            target_y = p.gap_y + PIPE_GAP // 2
+            break
+    if bird.y > target_y + 20 and bird.vel > 0:
+        bird.jump()
+
+
+def run(ticks, window_size=(1440, 960), autopilot_ms=None):
+    game = GameState(headless_bird_image(), window_size[0], window_size[1], clock=SimClock())
+    deaths = 0
+    best = 0
+    autopilot = None
+    if autopilot_ms is not None:
+        from autopilot import Autopilot
+        autopilot = Autopilot(game, budget_ms=autopilot_ms)
+
+    def controller(g):
+        nonlocal deaths, best
+        if g.game_over:
+            deaths += 1
+            best = max(best, g.score)
+        if autopilot is None or not g.game_started or g.game_over:
+            gap_follower(g)
+        elif autopilot.plan():
+            g.jump()
+
+    start = time.perf_counter()
+    game.fast_forward(ticks, controller)
+    elapsed = time.perf_counter() - start
+    result = {
+        "ticks": ticks,
+        "sim_minutes": round(ticks / SIM_HZ / 60, 1),
+        "wall_s": round(elapsed, 3),
+        "ticks_per_s": int(ticks / elapsed) if elapsed > 0 else 0,
+        "deaths": deaths,
+        "max_score": max(best, game.max_score),
+    }
+    if autopilot is not None:
+        result.update(autopilot.stats())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless oyun simülasyonu")
+    parser.add_argument("--ticks", type=int, default=SIM_HZ * 60 * 10)
+    parser.add_argument("--autopilot", type=float, metavar="MS", help="ileriye bakan planlayıcı, adım başına bütçe")
+    args = parser.parse_args()
+    for key, value in run(args.ticks, autopilot_ms=args.autopilot).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+# telemetry.py
+# Oyun ve jest olaylarının SQLite'a kalıcı kaydı. Ana döngü yalnızca sınırlı bir kuyruğa demet
+# bırakır (asla beklemez; kuyruk doluysa olay sayılıp düşürülür). Arka plandaki yazıcı olayları
+# toplayıp belirli aralıklarla tek işlemde (group commit) yazar; disk G/Ç kare süresine girmez.
+# Kiosk başına en yüksek skor da aynı işlemde güncellenir ve sonraki açılışta geri yüklenir.
+import queue
+import socket
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    kiosk TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    player INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    t_ms REAL,
+    value REAL,
+    wall_time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_session_kind ON events(session_id, kind);
+CREATE TABLE IF NOT EXISTS high_scores (
+    kiosk TEXT PRIMARY KEY,
+    score INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Yazılamayan (ör. "database is locked") bir parti bir sonraki aralıkta bu kadar kez daha denenir, sonra atılır
+FLUSH_RETRIES = 3
+# close(): yazıcı takılmışsa çıkışta en fazla bu kadar beklenir
+CLOSE_TIMEOUT_S = 5.0
+
+# Olay türleri: GameState (game_start, score, death, shield) ve el takibi (pinch, punch)
+GAME_EVENTS = ("game_start", "score", "death", "shield")
+GESTURE_EVENTS = ("pinch", "punch")
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    # WAL: okuyucular (analiz) yazıcıyı bekletmez; NORMAL: her commit'te fsync yok, WAL checkpoint'te var
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class Telemetry:
+    def __init__(self, path, kiosk=None, players=1, queue_size=8192, batch_size=1024, commit_interval_ms=1000):
+        self.path = path
+        self.kiosk = kiosk or socket.gethostname()
+        self.batch_size = batch_size
+        self.commit_interval_s = commit_interval_ms / 1000
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closing = threading.Event()
+        # Yumruk bir seviye sinyalidir (yumruk tutuldukça her karede True): oyuncu başına önceki durum
+        self._punch_held = [False] * players
+
+        # Şema, oturum satırı ve kayıtlı en yüksek skor döngü başlamadan önce bir kez, eşzamanlı olarak
+        conn = _connect(path)
+        try:
+            conn.executescript(SCHEMA)
+            cur = conn.execute("INSERT INTO sessions (kiosk, players, started_at) VALUES (?, ?, ?)",
+                               (self.kiosk, players, time.time()))
+            self.session_id = cur.lastrowid
+            row = conn.execute("SELECT score FROM high_scores WHERE kiosk = ?", (self.kiosk,)).fetchone()
+            self.high_score = row[0] if row else 0
+            conn.commit()
+        finally:
+            conn.close()
+
+        # Sayaçlar
+        self.events_logged = 0
+        self.events_dropped = 0
+        self.events_written = 0
+        self.commits = 0
+        self.flush_ms = 0.0
+        self.flush_errors = 0
+        self.batches_dropped = 0
+
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def log(self, kind, value=None, t_ms=None, player=0):
+        # Ana döngüden çağrılır: yalnızca bir demet kuyruğa girer
+        try:
+            self._queue.put_nowait((self.session_id, player, kind, t_ms, value, time.time()))
+            self.events_logged += 1
+        except queue.Full:
+            self.events_dropped += 1
+
+    def game_listener(self, player=0):
+        # GameState(on_event=...) için: (tür, değer, simülasyon zamanı) -> olay kaydı
+        def on_event(kind, value, t_ms):
+            if kind == "death" and value > self.high_score:
+                self.high_score = value
+            self.log(kind, value, t_ms, player)
+        return on_event
+
+    def log_gestures(self, player_data, player=0):
+        # tracker_pipeline sonucundaki tıklama/yumruk olayları, kameranın kare zaman damgasıyla.
+        # Yumruk yalnızca yükselen kenarında (yeni yapıldığında) bir kez yazılır.
+        if player_data["pinch_triggered"]:
+            self.log("pinch", player_data["pinch_strength"], player_data["pinch_time_ms"], player)
+        punch = player_data["punch_detected"]
+        if punch and not self._punch_held[player]:
+            self.log("punch", None, player_data["punch_time_ms"], player)
+        self._punch_held[player] = punch
+
+    def _run(self):
+        conn = _connect(self.path)
+        batch = []
+        failures = 0
+        running = True
+        try:
+            while running:
+                # Bir commit aralığı boyunca (ya da parti dolana kadar) olaylar toplanır
+                deadline = time.monotonic() + self.commit_interval_s
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        running = False
+                        break
+                    batch.append(item)
+                if not batch:
+                    continue
+                if not self._flush(conn, batch):
+                    failures += 1
+                    if running and failures <= FLUSH_RETRIES:
+                        # Parti korunur, sonraki aralıkta yeni olaylarla birlikte yeniden denenir
+                        # (parti doluysa toplama beklemez, beklemeyi burada yapar)
+                        if len(batch) >= self.batch_size:
+                            self._closing.wait(self.commit_interval_s)
+                        continue
+                    self.events_dropped += len(batch)
+                    self.batches_dropped += 1
+                failures = 0
+                batch.clear()
+            try:
+                with conn:
+                    conn.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", (time.time(), self.session_id))
+            except sqlite3.Error as e:
+                self._flush_failed(e)
+        finally:
+            conn.close()
+
+    def _flush(self, conn, batch):
+        # Başarılıysa True; hata yazıcıyı durdurmaz, işlem geri alınır ve sayılır
+        start = time.perf_counter()
+        best = max((item[4] for item in batch if item[2] == "death"), default=None)
+        try:
+            with conn:
+                conn.executemany("INSERT INTO events (session_id, player, kind, t_ms, value, wall_time) "
+                                 "VALUES (?, ?, ?, ?, ?, ?)", batch)
+                if best is not None:
+                    conn.execute("INSERT INTO high_scores (kiosk, score, updated_at) VALUES (?, ?, ?) "
+                                 "ON CONFLICT(kiosk) DO UPDATE SET score = excluded.score, "
+                                 "updated_at = excluded.updated_at WHERE excluded.score > high_scores.score",
+                                 (self.kiosk, int(best), time.time()))
+        except sqlite3.Error as e:
+            self._flush_failed(e)
+            return False
+        self.events_written += len(batch)
+        self.commits += 1
+        self.flush_ms = (time.perf_counter() - start) * 1000
+        return True
+
+    def _flush_failed(self, error):
+        self.flush_errors += 1
+        print(f"Telemetri yazılamadı ({self.flush_errors}): {error}")
+
+    def stats(self):
+        return {
+            "session_id": self.session_id,
+            "queue_depth": self._queue.qsize(),
+            "events_logged": self.events_logged,
+            "events_dropped": self.events_dropped,
+            "events_written": self.events_written,
+            "commits": self.commits,
+            "last_flush_ms": round(self.flush_ms, 2),
+            "flush_errors": self.flush_errors,
+            "batches_dropped": self.batches_dropped,
+        }
+
+    def close(self, timeout=CLOSE_TIMEOUT_S):
+        # Kuyruktaki olaylar yazılır, oturum kapatılır. Yazıcı ölmüş ya da takılmışsa kuyruk dolu
+        # kalabilir: çıkış en fazla timeout saniye bekler, kalan olaylar atılır.
+        self._closing.set()
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
@@ -0,0 +1,397 @@
+# tracker_pipeline.py
+import sys
+import threading
+import time
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from motion_filter import PointFilter, CURSOR_FILTER
+
+# Ana döngü, izleyiciyi beklemeden en son sonucu okur. Okunmadan üzerine yazılan
+# sonuçlar "düşürülmüş kare" sayılır; olay bayrakları kaybolmasın diye birleştirilir.
+EVENT_KEYS = ("pinch_triggered", "punch_detected")
+# Olay bayrağı -> olayın kare zaman damgası; birleştirmede en eski (gerçek) an korunur
+EVENT_TIME_KEYS = {"pinch_triggered": "pinch_time_ms", "punch_detected": "punch_time_ms"}
+
+EMPTY_HAND_DATA = {
+    "punch_detected": False,
+    "pinch_triggered": False,
+    "pinch_time_ms": None,
+    "punch_time_ms": None,
+    "cursor_pos": None,
+    "pinch_strength": 0.0,
+}
+# İmleç, ekrana çıkışa kadar geçecek süre için bu kadar daha ileri tahmin edilir (~1 kare)
+DISPLAY_LEAD_MS = 16
+# Alt süreç, model ısındıktan sonra bu mesajı bir kez gönderir
+READY = "ready"
+# Kayıtlı kaynak bittiğinde gönderilir (None: kamera/model hatası)
+EXHAUSTED = "exhausted"
+LATENCY_ALPHA = 0.1
+
+
+def empty_hand_data(players=1):
+    if players == 1:
+        return dict(EMPTY_HAND_DATA)
+    return {"players": [dict(EMPTY_HAND_DATA) for _ in range(players)]}
+
+
+def player_views(hand_data):
+    # Oyuncu başına olay/imleç sözlükleri; tek oyunculu sonuçta sözlüğün kendisi
+    return hand_data.get("players") or [hand_data]
+
+
+def _merge_events(dropped, newer):
+    for old, new in zip(player_views(dropped), player_views(newer)):
+        for key in EVENT_KEYS:
+            if old.get(key):
+                new[key] = True
+                time_key = EVENT_TIME_KEYS[key]
+                if old.get(time_key) is not None:
+                    new[time_key] = old[time_key]
+    return newer
+
+
+class _ThreadBackend:
+    def __init__(self, window_width, window_height, clock, tracker_kwargs):
+        self._size = (window_width, window_height)
+        self._tracker_kwargs = tracker_kwargs
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pending = None  # (timestamp_ms, frame, hand_data)
+        self._pending_count = 0
+        # Ana döngünün istediği çıkarım kalitesi; iş parçacığı kareler arasında uygular
+        self._quality = None
+        self._source_done = False
+        self.failed = False
+        self.exhausted = False
+        self.ready = False
+        self._thread = threading.Thread(target=self._run, name="hand-tracker", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        # mediapipe/cv2 içe aktarma, kamera açma ve model ısınması bu iş parçacığında yapılır;
+        # pencere bu sırada açık ve klavyeyle oynanabilir durumdadır.
+        from hand_tracker import HandTracker
+        try:
+            tracker = HandTracker(*self._size, clock=self._clock, **self._tracker_kwargs)
+            tracker.warm_up()
+        except Exception:
+            self.failed = True
+            raise
+        self.ready = True
+        quality = None
+        try:
+            while not self._stop.is_set():
+                if self._quality != quality:
+                    quality = self._quality
+                    tracker.set_quality(quality)
+                # Kayıtlı kaynak karenin zamanını kendisi verir (kayıt hızında, bu saatin ekseninde)
+                frame, hand_data = tracker.process_frame(None if tracker.paced else self._clock())
+                if frame is None:
+                    if tracker.exhausted:
+                        with self._lock:
+                            self._source_done = True
+                    else:
+                        self.failed = True
+                    break
+                now_ms = tracker.last_now_ms
+                with self._lock:
+                    if self._pending is not None:
+                        _merge_events(self._pending[2], hand_data)
+                    self._pending = (now_ms, frame, hand_data)
+                    self._pending_count += 1
+        finally:
+            tracker.close()
+
+    def fetch(self):
+        # (sonuç, bekleyen sonuç sayısı) döner; sonuç yoksa (None, 0)
+        with self._lock:
+            result, count = self._pending, self._pending_count
+            self._pending, self._pending_count = None, 0
+            # Kaynak bitti bilgisi son sonuçla birlikte verilir; o sonuç kaybolmaz
+            self.exhausted = self._source_done
+        return result, count
+
+    def set_quality(self, tier):
+        self._quality = tier
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+
+
+def _process_worker(window_width, window_height, tracker_kwargs, conn, control, stop_event, slot_locks,
+                    clock_offset_ms):
+    # Alt süreç: kamera + MediaPipe burada çalışır, kareler paylaşılan belleğe yazılır.
+    from hand_tracker import HandTracker
+
+    def clock():
+        return int(time.monotonic() * 1000 + clock_offset_ms)
+
+    try:
+        tracker = HandTracker(window_width, window_height, clock=clock, **tracker_kwargs)
+        tracker.warm_up()
+    except Exception:
+        conn.send(None)
+        raise
+    conn.send(READY)
+    shm = None
+    slots = None
+    slot = 0
+    try:
+        while not stop_event.is_set():
+            # Ana süreçten gelen kalite değişiklikleri (yalnızca en sonuncusu geçerli)
+            while control.poll():
+                tracker.set_quality(control.recv())
+            frame, hand_data = tracker.process_frame(None if tracker.paced else clock())
+            if frame is None:
+                conn.send(EXHAUSTED if tracker.exhausted else None)
+                break
+            now_ms = tracker.last_now_ms
+
+            if shm is None or slots[0].shape != frame.shape:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+                shm = shared_memory.SharedMemory(create=True, size=2 * frame.nbytes)
+                slots = [np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf, offset=i * frame.nbytes)
+                         for i in range(2)]
+
+            with slot_locks[slot]:
+                np.copyto(slots[slot], frame)
+            conn.send((now_ms, shm.name, slot, frame.shape, hand_data))
+            slot ^= 1
+    except (BrokenPipeError, EOFError):
+        pass
+    finally:
+        tracker.close()
+        if shm is not None:
+            slots = None
+            shm.close()
+            shm.unlink()
+
+
+def _attach_untracked(name):
+    # Bölümün sahibi alt süreçtir (oluşturur, resource_tracker'a kaydeder ve siler). Okuyucu taraf
+    # kaydolursa çıkışta "leaked shared_memory" uyarısı çıkar ve bölüm bir kez daha silinmeye çalışılır.
+    # Sonradan unregister da olmaz: spawn ile alt süreç aynı izleyiciyi paylaşır, alt sürecin kaydı silinir.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class _ProcessBackend:
+    def __init__(self, window_width, window_height, clock, tracker_kwargs):
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe(duplex=False)
+        child_control, self._control = ctx.Pipe(duplex=False)
+        self._stop = ctx.Event()
+        self._slot_locks = [ctx.Lock(), ctx.Lock()]
+        # Alt süreç zaman damgalarını ana sürecin saatine hizalar
+        clock_offset_ms = clock() - time.monotonic() * 1000
+        self._proc = ctx.Process(
+            target=_process_worker,
+            args=(window_width, window_height, tracker_kwargs, child_conn, child_control, self._stop,
+                  self._slot_locks, clock_offset_ms),
+            name="hand-tracker",
+            daemon=True,
+        )
+        self._proc.start()
+        child_conn.close()
+        child_control.close()
+
+        self._shm = None
+        self._slots = None
+        self._frame = None
+        self.failed = False
+        self.exhausted = False
+        self.ready = False
+
+    def _attach(self, name, shape):
+        if self._shm is not None:
+            self._slots = None
+            self._shm.close()
+        self._shm = _attach_untracked(name)
+        nbytes = int(np.prod(shape))
+        self._slots = [np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf, offset=i * nbytes)
+                       for i in range(2)]
+        # Ana süreçteki kare tamponu bir kez ayrılır ve her seferinde yeniden kullanılır
+        self._frame = np.empty(shape, dtype=np.uint8)
+
+    def fetch(self):
+        latest = None
+        count = 0
+        try:
+            while self._conn.poll():
+                msg = self._conn.recv()
+                if msg is None:
+                    self.failed = True
+                    break
+                if msg == READY:
+                    self.ready = True
+                    continue
+                if msg == EXHAUSTED:
+                    self.exhausted = True
+                    break
+                if latest is not None:
+                    _merge_events(latest[4], msg[4])
+                latest = msg
+                count += 1
+        except (EOFError, OSError):
+            self.failed = True
+
+        if latest is None:
+            return None, count
+
+        now_ms, name, slot, shape, hand_data = latest
+        if self._shm is None or self._shm.name.lstrip("/") != name.lstrip("/") or self._frame.shape != shape:
+            self._attach(name, shape)
+        with self._slot_locks[slot]:
+            np.copyto(self._frame, self._slots[slot])
+        return (now_ms, self._frame, hand_data), count
+
+    def set_quality(self, tier):
+        try:
+            self._control.send(tier)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def close(self):
+        self._stop.set()
+        self._proc.join(timeout=3.0)
+        terminated = self._proc.is_alive()
+        if terminated:
+            self._proc.terminate()
+            self._proc.join(timeout=1.0)
+        self._conn.close()
+        self._control.close()
+        if self._shm is not None:
+            self._slots = None
+            self._shm.close()
+            if terminated:
+                # Alt süreç bölümü silemeden sonlandırıldı; son bilinen bölüm burada silinir
+                try:
+                    self._shm.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+BACKENDS = {
+    "thread": _ThreadBackend,
+    "process": _ProcessBackend,
+}
+
+
+class TrackerPipeline:
+    # source ve record_dir HandTracker'a iletilir; süreç arka ucu için seçilebilir
+    # (picklable) olmaları gerekir, bu yüzden kaynak bir yol/"camera:N" dizesi olarak verilir.
+    # cursor_filter: One-Euro parametreleri (motion_filter.CURSOR_FILTER); None ham imleci verir
+    # players > 1: sonuç "players" altında oyuncu başına olay/imleç taşır (bkz. player_views)
+    def __init__(self, window_width, window_height, backend="thread", clock=None, source=None, record_dir=None,
+                 cursor_filter=CURSOR_FILTER, players=1):
+        if backend not in BACKENDS:
+            raise ValueError(f"Bilinmeyen izleyici arka ucu: {backend}")
+        if clock is None:
+            import pygame
+            clock = pygame.time.get_ticks
+        self.backend_name = backend
+        self._clock = clock
+        self._window_size = (window_width, window_height)
+        self.players = players
+        self._cursor_filters = [PointFilter(**cursor_filter) for _ in range(players)] if cursor_filter else None
+        # Kare zaman damgasından ana döngünün sonucu aldığı ana kadar geçen süre (EMA, ms)
+        self.latency_ms = 0.0
+        tracker_kwargs = {"source": source, "record_dir": record_dir, "players": players}
+        self._backend = BACKENDS[backend](window_width, window_height, clock, tracker_kwargs)
+
+        self._frame = None
+        self._hand_data = empty_hand_data(players)
+        self.timestamp_ms = None
+        self.seq = 0
+
+        # Çıkarımın geride kalıp kalmadığını görmek için sayaçlar
+        self.queue_depth = 0
+        self.dropped_frames = 0
+        self.frames_received = 0
+
+    @property
+    def failed(self):
+        return self._backend.failed
+
+    @property
+    def exhausted(self):
+        # Kayıtlı kaynak (video, resim klasörü, oturum) sona erdi ve son sonuç teslim edildi
+        return self._backend.exhausted
+
+    @property
+    def ready(self):
+        # Model yüklenip ısınana kadar False; bu sürede oyun yalnızca klavyeyle oynanır
+        return self._backend.ready
+
+    def set_quality(self, tier):
+        # roi_inference.QUALITY_TIERS'tan bir seviye; izleyici bir sonraki karede uygular
+        self._backend.set_quality(tier)
+
+    def poll(self):
+        # Asla beklemez: yeni sonuç varsa onu, yoksa öncekini döner.
+        # Olay bayrakları (tıklama/yumruk) yalnızca bir kez teslim edilir.
+        result, count = self._backend.fetch()
+        self.queue_depth = count
+        if result is None:
+            for view in player_views(self._hand_data):
+                for key in EVENT_KEYS:
+                    view[key] = False
+                    view[EVENT_TIME_KEYS[key]] = None
+        else:
+            self.timestamp_ms, self._frame, self._hand_data = result
+            self.seq += 1
+            self.frames_received += count
+            self.dropped_frames += max(0, count - 1)
+            self.latency_ms += LATENCY_ALPHA * (self._clock() - self.timestamp_ms - self.latency_ms)
+            self._filter_cursors()
+
+        hand_data = dict(self._hand_data)
+        if "players" in hand_data:
+            hand_data["players"] = [dict(view) for view in hand_data["players"]]
+        if self._cursor_filters is not None:
+            # Yeni sonuç olmasa da imleç her karede kare yaşı + ekran gecikmesi kadar ileri tahmin edilir
+            w, h = self._window_size
+            for view, cursor_filter in zip(player_views(hand_data), self._cursor_filters):
+                if view["cursor_pos"] is None:
+                    continue
+                lead_ms = self._clock() - self.timestamp_ms + DISPLAY_LEAD_MS
+                x, y = cursor_filter.predict(lead_ms)
+                view["cursor_pos"] = (min(max(0, int(x)), w - 1), min(max(0, int(y)), h - 1))
+        return self._frame, hand_data
+
+    def _filter_cursors(self):
+        if self._cursor_filters is None:
+            return
+        for view, cursor_filter in zip(player_views(self._hand_data), self._cursor_filters):
+            cursor = view["cursor_pos"]
+            if cursor is None:
+                cursor_filter.reset()
+            else:
+                cursor_filter(cursor, self.timestamp_ms)
+
+    def stats(self):
+        return {
+            "backend": self.backend_name,
+            "queue_depth": self.queue_depth,
+            "dropped_frames": self.dropped_frames,
+            "frames_received": self.frames_received,
+            "latency_ms": round(self.latency_ms, 1),
+            "timestamp_ms": self.timestamp_ms,
+        }
+
+    def close(self):
+        self._backend.close()
@@ -1,32 +1,115 @@
 # ui_manager.py
-import pygame
+import os
+
 import cv2
+import pygame
+
+from asset_cache import AssetCache
+from camera_preview import CameraPreview
+from game_state import SHIELD_COOLDOWN_MS
+from profiler import StageProfiler
+from tracker_pipeline import player_views
+from ui_widgets import TextCache, TextWidget, make_button
+
+# Cursor colour per player (player 1 keeps the original white cursor)
+PLAYER_COLORS = ((255, 255, 255), (255, 200, 0), (255, 110, 200), (120, 255, 160))
+SEPARATOR_WIDTH = 4
+PREVIEW_SIZE = (280, 210)
+
+
+class PlayerView:
+    # One player's part of the window: a subsurface of the screen (so pipes are clipped to it)
+    # plus that player's retained HUD widgets. Single-player is one view over the whole window.
+    # Button rects are kept in both view and window coordinates (the latter for cursor hit tests).
+    def __init__(self, screen, rect, cache, font, index):
+        self.index = index
+        self.offset = rect.topleft
+        self.surface = screen.subsurface(rect)
+        self.width, self.height = rect.size
+
+        self.start_local = pygame.Rect(self.width // 2 - 120, self.height // 2 - 40, 240, 80)
+        self.restart_local = pygame.Rect(self.width // 2 - 150, self.height // 2 + 20, 300, 80)
+        self.start_button = self.start_local.move(self.offset)
+        self.restart_button = self.restart_local.move(self.offset)
+
+        self.score_widget = TextWidget(cache, font, (255, 255, 255), "Skor {}")
+        self.max_score_widget = TextWidget(cache, font, (255, 215, 0), "Maksimum Skor: {}")
+        self.shield_widget = TextWidget(cache, font, (80, 200, 255), "Kalkan: {:.1f} sn")
+        self.cooldown_widget = TextWidget(cache, font, (150, 150, 150), "Kalkan: Hazır değil ({:.1f}s)")
+        self.final_score_widget = TextWidget(cache, font, (255, 255, 255), "Skorun: {}")
 
 
 class UIManager:
-    def __init__(self, width, height):
+    def __init__(self, width, height, dirty_rects=False, preview_fps=30, profiler=None,
+                 asset_cache_dir=".asset_cache", players=1, headless=False):
         self.WINDOW_WIDTH = width
         self.WINDOW_HEIGHT = height
+        self.players = players
+
+        # Dirty-rect mode: only regions touched this frame or last frame are restored
+        # from the cached background and pushed with display.update(rects).
+        self.dirty_rects = dirty_rects
+        self._rects = []
+        self._prev_rects = []
+        self._screen_state = None
+        # Regions pushed to the display last frame (None after a full redraw); video recording reads these
+        self.updated_rects = None
+
+        # Stage timings for draw/flip; the overlay is shown while the profiler is enabled
+        self.profiler = profiler if profiler is not None else StageProfiler()
+        self._profile_surf = None
+        self._profile_refresh_ms = None
 
+        # Headless: SDL's dummy driver (no window, no GPU) and rendering into an off-screen surface.
+        # A 1x1 display mode is still set so convert()/convert_alpha() have a pixel format to match.
+        self.headless = headless
+        if headless and os.environ.get("SDL_VIDEODRIVER") not in ("dummy", "offscreen"):
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
         pygame.init()
-        self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
+        if headless:
+            pygame.display.set_mode((1, 1))
+            self.screen = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT)).convert()
+        else:
+            self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
         pygame.display.set_caption('Socitek Fly')
         self.font = pygame.font.SysFont(None, 36)
         self.big_font = pygame.font.SysFont(None, 64)
+        self.small_font = pygame.font.SysFont(None, 22)
+
+        # Split screen: one column per player, separated by a thin bar; each GameState runs at view size
+        view_w = (self.WINDOW_WIDTH - SEPARATOR_WIDTH * (players - 1)) // players
+        self.view_size = (view_w, self.WINDOW_HEIGHT)
+        self._view_rects = [pygame.Rect(i * (view_w + SEPARATOR_WIDTH), 0, view_w, self.WINDOW_HEIGHT)
+                            for i in range(players)]
 
+        # Scaled assets come from the on-disk cache after the first launch at this resolution
+        self.asset_cache = AssetCache(asset_cache_dir)
         self.bird_img, self.bg = self._load_assets()
         self._create_pre_rendered_surfaces()
 
-        self.start_button = pygame.Rect(self.WINDOW_WIDTH // 2 - 120, self.WINDOW_HEIGHT // 2 - 40, 240, 80)
-        self.restart_button = pygame.Rect(self.WINDOW_WIDTH // 2 - 150, self.WINDOW_HEIGHT // 2 + 20, 300, 80)
-        self.cam_w, self.cam_h = 280, 210
-        self.cam_pos = (self.WINDOW_WIDTH - self.cam_w - 16, 12)
+        # preview_fps=0 turns the camera inset off entirely; quality levels can only lower the rate
+        self._max_preview_fps = preview_fps
+        self._create_preview(PREVIEW_SIZE, preview_fps, cv2.INTER_AREA)
+        # Cheaper drawing at low quality levels (see set_quality)
+        self.effects = True
+        self.quality_name = None
+        self._create_widgets()
+
+        # Player 1's buttons, for single-player callers
+        self.start_button = self.views[0].start_button
+        self.restart_button = self.views[0].restart_button
 
     def _load_assets(self):
-        bird_img = pygame.image.load("bg/logo.png").convert_alpha()
-        bird_img = pygame.transform.smoothscale(bird_img, (100, 100))
-        bg = pygame.image.load("bg/background.png").convert()
-        bg = pygame.transform.scale(bg, (self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
+        bird_img = self.asset_cache.load_scaled("bg/logo.png", (100, 100), smooth=True, alpha=True)
+        # One background tile at view size, shared by all views and composed once into the
+        # full-window background that dirty-rect restores read from
+        tile = self.asset_cache.load_scaled("bg/background.png", self.view_size, smooth=False)
+        if self.players == 1:
+            return bird_img, tile
+        bg = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT)).convert()
+        bg.fill((20, 20, 20))
+        for rect in self._view_rects:
+            bg.blit(tile, rect)
         return bird_img, bg
 
     def _create_pre_rendered_surfaces(self):
@@ -46,100 +129,224 @@ class UIManager:
         self.faded_heart = self.heart_img.copy()
         self.faded_heart.fill((255, 255, 255, 60), None, pygame.BLEND_RGBA_MULT)
 
-    def draw_all(self, game_state, hand_data, now_ms):
+    def _create_preview(self, size, fps, interpolation):
+        self.cam_w, self.cam_h = size
+        self.cam_pos = (self.WINDOW_WIDTH - self.cam_w - 16, 12)
+        self.preview = CameraPreview(size, fps=fps, interpolation=interpolation)
+
+    def set_quality(self, level):
+        # level: an entry of governor.QUALITY_LEVELS. The preview is rebuilt only when its size
+        # or resize filter changes (nearest-neighbour is the cv2 counterpart of scale vs smoothscale).
+        scale = level["preview_scale"]
+        size = (int(PREVIEW_SIZE[0] * scale), int(PREVIEW_SIZE[1] * scale))
+        fps = min(self._max_preview_fps, level["preview_fps"])
+        interpolation = cv2.INTER_AREA if level["smooth"] else cv2.INTER_NEAREST
+        if size != self.preview.size or interpolation != self.preview.interpolation:
+            self._create_preview(size, fps, interpolation)
+            self.invalidate()
+        else:
+            self.preview.fps = fps
+        self.effects = level["effects"]
+        self.preview.draw_landmarks = level["effects"]
+        self.quality_name = level["name"]
+
+    def set_status(self, text):
+        # Bottom status line (e.g. while hand tracking is still loading); None hides it
+        self.status = text
+
+    def invalidate(self):
+        # Force a full redraw on the next frame (e.g. after the window was exposed)
+        self._screen_state = None
+        # The recorder copies only updated_rects into its previous frame. A full redraw can change
+        # pixels outside any tracked rect, so None makes it copy the whole screen instead
+        self.updated_rects = None
+
+    def _create_widgets(self):
+        # Retained HUD: each widget keeps its surface until its bound value changes
+        self.text_cache = TextCache()
+        cache = self.text_cache
+        self.views = [PlayerView(self.screen, rect, cache, self.font, i) for i, rect in enumerate(self._view_rects)]
+        self.player_labels = [cache.render(self.small_font, f"OYUNCU {i + 1}", PLAYER_COLORS[i % len(PLAYER_COLORS)])
+                              for i in range(self.players)]
+        self.status_widget = TextWidget(cache, self.small_font, (255, 255, 255))
+        self.status = None
+
+        # Static overlay screens, pre-composited in both hover states (all views share the size)
+        view = self.views[0]
+        start_label = cache.render(self.big_font, 'BAŞLA', (255, 255, 255))
+        self.start_button_surfs = (make_button(view.start_local, (70, 130, 180), start_label),
+                                   make_button(view.start_local, (80, 200, 120), start_label))
+        restart_label = cache.render(self.font, 'YENİDEN OYNA', (255, 255, 255))
+        self.restart_button_surfs = (make_button(view.restart_local, (178, 34, 34), restart_label),
+                                     make_button(view.restart_local, (255, 69, 0), restart_label))
+        self.game_over_title = cache.render(self.big_font, 'KAYBETTİN', (255, 60, 60))
+
+    def draw_all(self, game_states, hand_data):
+        # game_states: one GameState, or one per player view. HUD timers follow each game's
+        # simulation clock.
+        if not isinstance(game_states, (list, tuple)):
+            game_states = (game_states,)
+        views = player_views(hand_data)
+
+        # Full redraw on state transitions (start, game over); otherwise only erase
+        # what was drawn last frame.
+        screen_state = tuple((g.game_started, g.game_over) for g in game_states)
+        full_redraw = not self.dirty_rects or screen_state != self._screen_state
+        self._screen_state = screen_state
+
         # Background
-        self.screen.blit(self.bg, (0, 0))
+        if full_redraw:
+            self.screen.blit(self.bg, (0, 0))
+        else:
+            for r in self._prev_rects:
+                self.screen.blit(self.bg, r, r)
+        rects = self._rects
+        rects.clear()
+
+        for view, game_state, player_data in zip(self.views, game_states, views):
+            self._draw_view(view, game_state, player_data['cursor_pos'])
+
+        # Camera and cursor
+        self._draw_camera_and_cursor(hand_data, views)
+
+        if self.status:
+            self.status_widget.set(self.status)
+            rects.append(self.status_widget.draw_centered(self.screen, (self.WINDOW_WIDTH // 2,
+                                                                       self.WINDOW_HEIGHT - 24)))
+
+        if self.profiler.enabled:
+            self._draw_profiler_overlay()
+        self.profiler.lap("draw")
+
+        if full_redraw:
+            self.updated_rects = None
+            if not self.headless:
+                pygame.display.flip()
+        else:
+            self.updated_rects = self._prev_rects + rects
+            if not self.headless:
+                pygame.display.update(self.updated_rects)
+        self._rects, self._prev_rects = self._prev_rects, rects
+        self.profiler.lap("flip")
 
-        # Pipes and Bird
+    def _push(self, view, rect):
+        # Draw calls on a subsurface return view-local rects; dirty tracking is in window coordinates
+        self._rects.append(rect.move(view.offset) if view.index else rect)
+
+    def _draw_view(self, view, game_state, cursor_pos):
+        surf = view.surface
+
+        # Pipes and Bird (interpolated between fixed simulation steps)
+        alpha = game_state.alpha
         for p in game_state.pipes:
-            p.draw(self.screen)
-        game_state.bird.draw(self.screen)
+            self._push(view, p.draw(surf, alpha))
+        self._push(view, game_state.bird.draw(surf, alpha))
 
         # Shield effect
         if game_state.bird.shield_active:
-            blit_pos = (game_state.bird.rect.centerx - self.shield_surf.get_width() // 2,
-                        game_state.bird.rect.centery - self.shield_surf.get_height() // 2)
-            self.screen.blit(self.shield_surf, blit_pos)
+            bird_cx, bird_cy = game_state.bird.render_center(alpha)
+            if self.effects:
+                blit_pos = (bird_cx - self.shield_surf.get_width() // 2,
+                            bird_cy - self.shield_surf.get_height() // 2)
+                self._push(view, surf.blit(self.shield_surf, blit_pos))
+            else:
+                # Plain outline instead of the alpha-blended halo
+                radius = self.shield_surf.get_width() // 2 - 6
+                self._push(view, pygame.draw.circle(surf, (80, 200, 255), (bird_cx, bird_cy), radius, 3))
 
         # HUD (Heads-Up Display)
-        self._draw_hud(game_state, now_ms)
+        self._draw_hud(view, game_state, game_state.sim_time_ms)
+        if self.players > 1:
+            label = self.player_labels[view.index]
+            self._push(view, surf.blit(label, (12, view.height - label.get_height() - 12)))
 
         # Start/Game Over screens
         if not game_state.game_started:
-            self._draw_start_screen(hand_data['cursor_pos'])
+            self._draw_start_screen(view, cursor_pos)
         if game_state.game_over:
-            self._draw_game_over_screen(game_state.score, hand_data['cursor_pos'])
-
-        # Camera and cursor
-        self._draw_camera_and_cursor(hand_data)
+            self._draw_game_over_screen(view, game_state.score, cursor_pos)
 
-        pygame.display.flip()
-
-    def _draw_hud(self, game_state, now_ms):
-        score_surf = self.font.render(f"Skor {game_state.score}", True, (255, 255, 255))
-        max_surf = self.font.render(f"Maksimum Skor: {game_state.max_score}", True, (255, 215, 0))
-        self.screen.blit(score_surf, (12, 12))
-        self.screen.blit(max_surf, (12, 52))
+    def _draw_hud(self, view, game_state, now_ms):
+        surf = view.surface
+        view.score_widget.set(game_state.score)
+        view.max_score_widget.set(game_state.max_score)
+        self._push(view, view.score_widget.draw(surf, (12, 12)))
+        self._push(view, view.max_score_widget.draw(surf, (12, 52)))
 
         # Shield charges (hearts)
         for i in range(3):
             x = 12 + i * 28
             y = 130
             if i < game_state.shield_charges:
-                self.screen.blit(self.heart_img, (x, y))
+                self._push(view, surf.blit(self.heart_img, (x, y)))
             else:
-                self.screen.blit(self.faded_heart, (x, y))
+                self._push(view, surf.blit(self.faded_heart, (x, y)))
 
-        # Shield timer/cooldown
+        # Shield timer/cooldown (bound to 0.1 s steps, so text re-renders ten times a second at most)
         if game_state.bird.shield_active:
             remaining_ms = game_state.bird.shield_end_time - now_ms
-            remaining_s = max(0, remaining_ms // 100) / 10
-            shield_text = self.font.render(f"Kalkan: {remaining_s:.1f} sn", True, (80, 200, 255))
-            self.screen.blit(shield_text, (12, 92))
+            view.shield_widget.set(max(0, remaining_ms // 100) / 10)
+            self._push(view, view.shield_widget.draw(surf, (12, 92)))
         else:
-            from game_state import SHIELD_COOLDOWN_MS
             cooldown_remaining = (SHIELD_COOLDOWN_MS - (now_ms - game_state.last_shield_time)) / 1000
             if cooldown_remaining > 0:
-                cd_text = self.font.render(f"Kalkan: Hazır değil ({cooldown_remaining:.1f}s)", True, (150, 150, 150))
-                self.screen.blit(cd_text, (12, 92))
-
-    def _draw_start_screen(self, cursor_pos):
-        btn_color, hover_color = (70, 130, 180), (80, 200, 120)
-        is_hover = cursor_pos is not None and self.start_button.collidepoint(cursor_pos)
-        pygame.draw.rect(self.screen, hover_color if is_hover else btn_color, self.start_button, border_radius=12)
-        label = self.big_font.render('BAŞLA', True, (255, 255, 255))
-        self.screen.blit(label, (self.start_button.centerx - label.get_width() // 2,
-                                 self.start_button.centery - label.get_height() // 2))
-
-    def _draw_game_over_screen(self, score, cursor_pos):
-        over = self.big_font.render('KAYBETTİN', True, (255, 60, 60))
-        self.screen.blit(over, (self.WINDOW_WIDTH // 2 - over.get_width() // 2, self.WINDOW_HEIGHT // 2 - 140))
-        sub = self.font.render(f'Skorun: {score}', True, (255, 255, 255))
-        self.screen.blit(sub, (self.WINDOW_WIDTH // 2 - sub.get_width() // 2, self.WINDOW_HEIGHT // 2 - 80))
-        btn_color, hover_color = (178, 34, 34), (255, 69, 0)
-        is_hover = cursor_pos is not None and self.restart_button.collidepoint(cursor_pos)
-        pygame.draw.rect(self.screen, hover_color if is_hover else btn_color, self.restart_button, border_radius=12)
-        label = self.font.render('YENİDEN OYNA', True, (255, 255, 255))
-        self.screen.blit(label, (self.restart_button.centerx - label.get_width() // 2,
-                                 self.restart_button.centery - label.get_height() // 2))
-
-    def _draw_camera_and_cursor(self, hand_data):
-        frame = hand_data.get('frame')
-        cursor_pos = hand_data.get('cursor_pos')
-        pinch_strength = hand_data.get('pinch_strength')
-
-        if frame is not None:
-            try:
-                small = cv2.resize(frame, (self.cam_w, self.cam_h))
-                small_rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
-                cam_surf = pygame.image.frombuffer(small_rgb.tobytes(), small_rgb.shape[1::-1], 'RGB')
+                view.cooldown_widget.set(round(cooldown_remaining, 1))
+                self._push(view, view.cooldown_widget.draw(surf, (12, 92)))
+
+    def _draw_start_screen(self, view, cursor_pos):
+        is_hover = cursor_pos is not None and view.start_button.collidepoint(cursor_pos)
+        self._push(view, view.surface.blit(self.start_button_surfs[is_hover], view.start_local))
+
+    def _draw_game_over_screen(self, view, score, cursor_pos):
+        surf = view.surface
+        over = self.game_over_title
+        self._push(view, surf.blit(over, (view.width // 2 - over.get_width() // 2, view.height // 2 - 140)))
+        sub = view.final_score_widget.set(score)
+        self._push(view, surf.blit(sub, (view.width // 2 - sub.get_width() // 2, view.height // 2 - 80)))
+        is_hover = cursor_pos is not None and view.restart_button.collidepoint(cursor_pos)
+        self._push(view, surf.blit(self.restart_button_surfs[is_hover], view.restart_local))
+
+    def _draw_camera_and_cursor(self, hand_data, views):
+        preview = self.preview
+        if preview.enabled:
+            preview.update(hand_data.get('frame'), hand_data.get('landmarks'), hand_data.get('frame_time_ms'),
+                           pygame.time.get_ticks())
+            if preview.has_frame:
                 border_rect = pygame.Rect(self.cam_pos[0] - 4, self.cam_pos[1] - 4, self.cam_w + 8, self.cam_h + 8)
-                pygame.draw.rect(self.screen, (30, 30, 30), border_rect, border_radius=8)
-                self.screen.blit(cam_surf, self.cam_pos)
-            except Exception:
-                pass
+                self._rects.append(pygame.draw.rect(self.screen, (30, 30, 30), border_rect, border_radius=8))
+                self.screen.blit(preview.surface, self.cam_pos)
 
-        if cursor_pos is not None:
-            pygame.draw.circle(self.screen, (255, 255, 255), cursor_pos, 10, 3)
+        # Cursors are in window coordinates and drawn over every view
+        for i, player_data in enumerate(views):
+            cursor_pos = player_data.get('cursor_pos')
+            if cursor_pos is None:
+                continue
+            color = PLAYER_COLORS[i % len(PLAYER_COLORS)]
+            self._rects.append(pygame.draw.circle(self.screen, color, cursor_pos, 10, 3))
             arc_radius = 22
-            pygame.draw.circle(self.screen, (0, 200, 0), cursor_pos, int(arc_radius * pinch_strength), 2)
\ No newline at end of file
+            self._rects.append(pygame.draw.circle(self.screen, (0, 200, 0), cursor_pos,
+                                                  int(arc_radius * player_data.get('pinch_strength')), 2))
+
+    def _draw_profiler_overlay(self, refresh_ms=500):
+        # Percentiles over the ring buffer are recomputed twice a second, not every frame
+        now = pygame.time.get_ticks()
+        if self._profile_surf is None or now - self._profile_refresh_ms >= refresh_ms:
+            self._profile_refresh_ms = now
+            rows = [("stage", "p50", "p95", "p99 ms")]
+            if self.quality_name:
+                rows.insert(0, (f"quality: {self.quality_name}", "", "", ""))
+            for name, (count, p50, p95, p99) in self.profiler.summary().items():
+                rows.append((name, f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}"))
+            # Proportional font: stage names left-aligned, numbers right-aligned per column
+            line_h = self.small_font.get_linesize()
+            surf = pygame.Surface((300, line_h * len(rows) + 12), pygame.SRCALPHA)
+            surf.fill((0, 0, 0, 170))
+            for i, row in enumerate(rows):
+                y = 6 + i * line_h
+                surf.blit(self.small_font.render(row[0], True, (230, 230, 230)), (8, y))
+                for right, text in zip((180, 235, 292), row[1:]):
+                    label = self.small_font.render(text, True, (230, 230, 230))
+                    surf.blit(label, (right - label.get_width(), y))
+            self._profile_surf = surf
+        pos = (12, self.WINDOW_HEIGHT - self._profile_surf.get_height() - 12)
+        self._rects.append(self.screen.blit(self._profile_surf, pos))
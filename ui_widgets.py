@@ -0,0 +1,58 @@
+# ui_widgets.py
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    # Bounded LRU of rendered strings, shared by every font and widget.
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+
+class TextWidget:
+    # Retained text: re-rendered only when the bound value changes.
+    def __init__(self, cache, font, color, fmt="{}"):
+        self.cache = cache
+        self.font = font
+        self.color = color
+        self.fmt = fmt
+        self._value = object()
+        self.surface = None
+
+    def set(self, value):
+        if value != self._value:
+            self._value = value
+            self.surface = self.cache.render(self.font, self.fmt.format(value), self.color)
+        return self.surface
+
+    def draw(self, screen, pos):
+        return screen.blit(self.surface, pos)
+
+    def draw_centered(self, screen, center):
+        return screen.blit(self.surface, self.surface.get_rect(center=center))
+
+
+def make_button(rect, color, label, border_radius=12):
+    # Pre-composited button: rounded rect with its label, blitted in one call.
+    surf = pygame.Surface(rect.size, pygame.SRCALPHA)
+    pygame.draw.rect(surf, color, surf.get_rect(), border_radius=border_radius)
+    surf.blit(label, (rect.width // 2 - label.get_width() // 2, rect.height // 2 - label.get_height() // 2))
+    return surf
@@ -0,0 +1,160 @@
+# video_recorder.py
+# Oyun görüntüsünü arka plandaki bir iş parçacığında cv2.VideoWriter ile kodlar.
+# Ana döngü yalnızca değişen bölgeleri önceden ayrılmış bir yakalama yüzeyine blit eder (tam kare de
+# tek blit, bellek ayırma yok); piksel dönüşümü ve kodlama iş parçacığında yapılır. Boş yüzey yoksa kare
+# hiç yakalanmadan düşürülür (drop) ya da kısa bir süre beklenir (block), oyun asla takılmaz.
+import queue
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+POLICIES = ("drop", "block")
+# Bekleyen kirli bölge sayısı bunu aşarsa bir sonraki yakalama tam kare olur (tek blit)
+MAX_PENDING_RECTS = 64
+THROUGHPUT_ALPHA = 0.1
+
+
+class VideoRecorder:
+    # fps: videonun kare hızı; oyun daha hızlı dönüyorsa aradaki kareler atlanır.
+    # policy="drop": boş yakalama yüzeyi yoksa kare kaydedilmez; "block": en fazla block_ms beklenir, sonra
+    # düşürülür. queue_size: aynı anda yolda olabilecek kare (ve yakalama yüzeyi) sayısı.
+    # Düşen ya da atlanan karelerin kirli bölgeleri biriktirilir ve bir sonraki yakalamada kopyalanır,
+    # böylece kodlayıcıdaki tuval hiçbir zaman eksik güncellenmez.
+    def __init__(self, path, size, fps=30, codec="mp4v", queue_size=8, policy="drop", block_ms=4):
+        if policy not in POLICIES:
+            raise ValueError(f"Bilinmeyen kayıt politikası: {policy}")
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.policy = policy
+        self.block_s = block_ms / 1000
+        self._interval_ms = 1000 / fps
+        self._next_ms = None
+        self._pending_rects = None  # None: tam kare gerekli
+        # Yakalama yüzeyleri havuzu: en fazla queue_size kare aynı anda yolda olur (kuyrukta ya da
+        # kodlanırken). Yüzeyler burada bir kez ayrılır; kodlayıcı işi bitince havuza geri döner.
+        self._queue = queue.Queue()
+        self._free = queue.Queue()
+        for _ in range(queue_size):
+            self._free.put(pygame.Surface(size, 0, 32))
+        # 32 bit yakalama yüzeyinde R, G, B baytlarının yeri; kodlayıcı BGR'ye bu sırayla çevirir
+        shifts = pygame.Surface((1, 1), 0, 32).get_shifts()[:3]
+        rgb = [s // 8 if sys.byteorder == "little" else 3 - s // 8 for s in shifts]
+        self._bgr_order = rgb[::-1]
+
+        self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, size)
+        if not self._writer.isOpened():
+            raise OSError(f"Video dosyası açılamadı: {path}")
+
+        # Sayaçlar (ana döngü tarafı / kodlayıcı tarafı)
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.bytes_captured = 0
+        self.capture_ms = 0.0
+        self.frames_written = 0
+        self.encode_ms = 0.0
+        self.encode_fps = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="video-recorder", daemon=True)
+        self._thread.start()
+
+    def submit(self, surface, rects, now_ms):
+        # rects: bu karede değişen bölgeler (pencere koordinatında), None: tüm yüzey değişti
+        if rects is None or self._pending_rects is None or len(self._pending_rects) + len(rects) > MAX_PENDING_RECTS:
+            self._pending_rects = None
+        else:
+            self._pending_rects.extend(rects)
+
+        if self._next_ms is not None and now_ms < self._next_ms:
+            return False
+        # Kare hızı sabit tutulur; geride kalınırsa araya yeni kare eklenmez
+        self._next_ms = max(now_ms, (self._next_ms or now_ms) + self._interval_ms)
+
+        slot = self._acquire_slot()
+        if slot is None:
+            # Kopya alınmadı; kirli bölgeler birikmeye devam eder ve bir sonraki yakalamada kopyalanır
+            self.frames_dropped += 1
+            return False
+
+        start = time.perf_counter()
+        self._queue.put((slot, self._capture(surface, slot)))
+        self.capture_ms += THROUGHPUT_ALPHA * ((time.perf_counter() - start) * 1000 - self.capture_ms)
+        self.frames_submitted += 1
+        self._pending_rects = []
+        return True
+
+    def _acquire_slot(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        if self.policy == "block":
+            try:
+                return self._free.get(timeout=self.block_s)
+            except queue.Empty:
+                pass
+        return None
+
+    def _capture(self, surface, slot):
+        # Değişen bölgeler yakalama yüzeyine aynı konuma blit edilir; ekran yüzeyinin sahibi ana döngüdür
+        bounds = surface.get_rect().clip(slot.get_rect())
+        if self._pending_rects is None:
+            rects = [bounds]
+        else:
+            rects = [r.clip(bounds) for r in self._pending_rects]
+        rects = [r for r in rects if r.w and r.h]
+        for r in rects:
+            slot.blit(surface, r, r)
+            self.bytes_captured += r.w * r.h * 3
+        return rects
+
+    def _run(self):
+        w, h = self.size
+        canvas = np.zeros((h, w, 4), dtype=np.uint8)
+        bgr = np.empty((h, w, 3), dtype=np.uint8)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            slot, rects = item
+            start = time.perf_counter()
+            # Ham piksel görünümü yüzeyi kilitler; bölgeler kopyalanınca bırakılır ve yüzey havuza döner
+            raw = np.frombuffer(slot.get_buffer(), dtype=np.uint8).reshape(h, slot.get_pitch())
+            pixels = raw[:, :w * 4].reshape(h, w, 4)
+            for r in rects:
+                canvas[r.top:r.bottom, r.left:r.right] = pixels[r.top:r.bottom, r.left:r.right]
+            del raw, pixels
+            self._free.put(slot)
+            if self._bgr_order == [0, 1, 2]:
+                cv2.cvtColor(canvas, cv2.COLOR_BGRA2BGR, dst=bgr)
+            else:
+                np.take(canvas, self._bgr_order, axis=2, out=bgr)
+            self._writer.write(bgr)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.encode_ms += THROUGHPUT_ALPHA * (elapsed_ms - self.encode_ms)
+            self.encode_fps = 1000 / self.encode_ms if self.encode_ms > 0 else 0.0
+            self.frames_written += 1
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "policy": self.policy,
+            "queue_depth": self._queue.qsize(),
+            "frames_submitted": self.frames_submitted,
+            "frames_written": self.frames_written,
+            "frames_dropped": self.frames_dropped,
+            "capture_ms": round(self.capture_ms, 2),
+            "encode_ms": round(self.encode_ms, 2),
+            "encode_fps": round(self.encode_fps, 1),
+            "captured_mb": round(self.bytes_captured / 1e6, 1),
+        }
+
+    def close(self):
+        # Kuyruktaki kareler yazılıp dosya kapatılır
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.release()